@@ -1,11 +1,11 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import sqlite3
 import requests
 import os
 from datetime import datetime, date
 from dotenv import load_dotenv
 from stats_analyzer import StatsAnalyzer
+from migrations import migrate
 
 load_dotenv()
 
@@ -16,36 +16,7 @@ API_KEY = os.getenv('FOOTBALL_API_KEY', 'your_api_key_here')
 API_BASE_URL = 'https://api.football-data.org/v4'
 
 def init_db():
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS games (
-            id INTEGER PRIMARY KEY,
-            home_team TEXT,
-            away_team TEXT,
-            date TEXT,
-            home_goals INTEGER,
-            away_goals INTEGER,
-            competition TEXT
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS team_stats (
-            id INTEGER PRIMARY KEY,
-            team_name TEXT,
-            goals_scored REAL,
-            goals_conceded REAL,
-            wins INTEGER,
-            draws INTEGER,
-            losses INTEGER,
-            last_updated TEXT
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    migrate()
 
 @app.route('/')
 def home():
@@ -68,10 +39,14 @@ def get_predictions():
     
     predictions = []
     
-    for home_team, away_team in sample_matches:
+    # Todas as partidas calculadas em lote; em caso de falha cai na previsão padrão
+    try:
+        all_probs = analyzer.calculate_match_probabilities_batch(sample_matches)
+    except:
+        all_probs = [None] * len(sample_matches)
+    
+    for (home_team, away_team), probs in zip(sample_matches, all_probs):
         try:
-            probs = analyzer.calculate_match_probabilities(home_team, away_team)
-            
             best_bet = 'Over 2.5 gols' if probs['over_2_5_prob'] > 0.6 else 'Under 2.5 gols'
             best_prob = probs['over_2_5_prob'] if probs['over_2_5_prob'] > 0.6 else (1 - probs['over_2_5_prob'])
             
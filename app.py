@@ -1,12 +1,13 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import sqlite3
 import requests
 import os
 from datetime import datetime, date
 from dotenv import load_dotenv
 from stats_analyzer import StatsAnalyzer
 from ensemble_predictor import EnsemblePredictor
+from migrations import migrate
+from db_pool import get_pool
 
 load_dotenv()
 
@@ -18,51 +19,8 @@ API_KEY = os.getenv('FOOTBALL_API_KEY', 'f9c2bbc9a86c4c0b8a843cf67c364a0e')
 API_BASE_URL = 'https://api.football-data.org/v4'
 
 def init_db():
-    """Inicializa o banco de dados"""
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    
-    # Tabela de jogos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS games (
-            id INTEGER PRIMARY KEY,
-            home_team TEXT,
-            away_team TEXT,
-            date TEXT,
-            home_goals INTEGER,
-            away_goals INTEGER,
-            competition TEXT,
-            league_code TEXT
-        )
-    ''')
-    
-    # Tabela de estatísticas
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS team_stats (
-            id INTEGER PRIMARY KEY,
-            team_name TEXT,
-            goals_scored REAL,
-            goals_conceded REAL,
-            wins INTEGER,
-            draws INTEGER,
-            losses INTEGER,
-            last_updated TEXT
-        )
-    ''')
-    
-    # Tabela de previsões
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS predictions (
-            id INTEGER PRIMARY KEY,
-            game_id INTEGER,
-            prediction_type TEXT,
-            probability REAL,
-            created_at TEXT
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    """Inicializa o banco de dados (aplica migrações pendentes)"""
+    migrate()
 
 @app.route('/games', methods=['GET'])
 def get_games():
@@ -89,18 +47,43 @@ def get_games():
     except Exception as e:
         return jsonify({'error': f'Erro ao buscar jogos: {str(e)}'}), 500
 
+@app.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Retorna contadores do cache de partidas"""
+    from data_collector import get_fixture_cache
+    return jsonify(get_fixture_cache().stats())
+
+@app.route('/db/stats', methods=['GET'])
+def get_db_stats():
+    """Retorna contadores do pool de conexões SQLite"""
+    return jsonify(get_pool().stats())
+
+@app.route('/models/stats', methods=['GET'])
+def get_model_stats():
+    """Retorna tempo de carga e tamanho dos modelos carregados neste processo"""
+    from model_registry import get_registry
+    return jsonify(get_registry().stats())
+
+@app.route('/ready', methods=['GET'])
+def get_ready():
+    """Prontidão: 200 só depois do aquecimento de modelos, índice e caches"""
+    from warmup import readiness
+    status = readiness()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/memory', methods=['GET'])
+def get_memory():
+    """Memória do worker que atendeu (USS = páginas só dele; o resto é compartilhado)"""
+    from warmup import memory_usage
+    return jsonify(dict(pid=os.getpid(), **(memory_usage() or {})))
+
 @app.route('/stats/<team_name>', methods=['GET'])
 def get_team_stats(team_name):
     """Retorna estatísticas de um time"""
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM team_stats WHERE team_name = ?
-    ''', (team_name,))
-    
-    result = cursor.fetchone()
-    conn.close()
+    with get_pool().reader() as conn:
+        result = conn.execute('''
+            SELECT * FROM team_stats WHERE team_name = ?
+        ''', (team_name,)).fetchone()
     
     if result:
         return jsonify({
@@ -152,8 +135,12 @@ def get_predictions():
                 ('Boca Juniors', 'River Plate', 'Liga Argentina')
             ]
             
-            for home_team, away_team, league in sample_matches:
-                probs = analyzer.calculate_match_probabilities(home_team, away_team)
+            # Todas as partidas calculadas em lote
+            all_probs = analyzer.calculate_match_probabilities_batch(
+                [(home_team, away_team) for home_team, away_team, _ in sample_matches]
+            )
+            
+            for (home_team, away_team, league), probs in zip(sample_matches, all_probs):
                 
                 # Melhor aposta baseada nas probabilidades
                 best_bet = 'Over 2.5 gols' if probs['over_2_5_prob'] > 0.6 else 'Under 2.5 gols'
@@ -180,8 +167,12 @@ def get_predictions():
                 })
         else:
             # Usa jogos reais de hoje
-            for game in today_games[:5]:  # Limita a 5 jogos
-                probs = analyzer.calculate_match_probabilities(game['homeTeam'], game['awayTeam'])
+            selected_games = today_games[:5]  # Limita a 5 jogos
+            all_probs = analyzer.calculate_match_probabilities_batch(
+                [(game['homeTeam'], game['awayTeam']) for game in selected_games]
+            )
+            
+            for game, probs in zip(selected_games, all_probs):
                 
                 best_bet = 'Over 2.5 gols' if probs['over_2_5_prob'] > 0.6 else 'Under 2.5 gols'
                 best_prob = probs['over_2_5_prob'] if probs['over_2_5_prob'] > 0.6 else (1 - probs['over_2_5_prob'])
@@ -267,6 +258,27 @@ def analyze_match(home_team, away_team):
     except Exception as e:
         return jsonify({'error': f'Erro na análise: {str(e)}'}), 500
 
+@app.route('/simulate/<league_code>', methods=['GET'])
+def simulate_season(league_code):
+    """Chances de título, G4 e rebaixamento simulando o restante da temporada"""
+    from season_simulator import DEFAULT_SEASONS, simulate_league
+    seasons = request.args.get('seasons', DEFAULT_SEASONS, type=int)
+    if seasons < 1:
+        return jsonify({'error': 'seasons deve ser pelo menos 1'}), 400
+    seasons = min(seasons, 100000)
+    
+    try:
+        # No próprio processo: um pool por requisição dentro do worker web sobrecarrega a máquina
+        outlook = simulate_league(league_code, seasons, since=request.args.get('since'), workers=1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': f'Erro na simulação: {str(e)}'}), 500
+    
+    if not outlook:
+        return jsonify({'error': 'Liga sem partidas na temporada'}), 404
+    return jsonify({'league': league_code, 'seasons': seasons, 'teams': outlook})
+
 @app.route('/')
 def home():
     return jsonify({
@@ -289,9 +301,7 @@ def get_best_combo():
     best_bets = []
     total_prob = 1.0
     
-    for home_team, away_team in matches:
-        probs = analyzer.calculate_match_probabilities(home_team, away_team)
-        
+    for (home_team, away_team), probs in zip(matches, analyzer.calculate_match_probabilities_batch(matches)):
         # Seleciona aposta com maior probabilidade e confiança
         bets = [
             ('Over 2.5 gols', probs['over_2_5_prob'], 1.75),
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Backfill de várias temporadas, em intervalos, com retomada após falhas
+
+Divide o período em janelas de poucos dias por liga, busca as janelas em
+paralelo (respeitando o limite de taxa do agendador) e registra cada janela
+concluída em backfill_chunks; uma nova execução pula o que já terminou.
+No fim, a marca d'água de sync_state avança até onde as janelas concluídas
+cobrem o período sem buracos.
+
+Uso: python backfill.py --seasons 3
+     python backfill.py --from 2022-07-01 --to 2025-06-30 --leagues PL,PD --workers 4
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from data_collector import DataCollector
+from db_pool import get_pool
+from migrations import migrate
+from request_scheduler import PRIORITY_LOW
+
+def date_chunks(date_from, date_to, chunk_days):
+    """Janelas [início, fim] consecutivas de até chunk_days dias"""
+    start = datetime.strptime(date_from, '%Y-%m-%d')
+    end = datetime.strptime(date_to, '%Y-%m-%d')
+    chunks = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=chunk_days - 1))
+        chunks.append((start.strftime('%Y-%m-%d'), stop.strftime('%Y-%m-%d')))
+        start = stop + timedelta(days=1)
+    return chunks
+
+def _next_day(date):
+    return (datetime.strptime(date[:10], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+class Backfill:
+    def __init__(self, collector=None, chunk_days=10, workers=4):
+        self.collector = collector or DataCollector()
+        self.chunk_days = chunk_days
+        self.workers = workers
+
+        # Escritor único do pool; as threads só disputam a gravação
+        self.pool = get_pool(self.collector.db_path)
+        with self.pool.writer() as conn:
+            migrate(conn)
+
+    def pending_chunks(self, league_codes, date_from, date_to):
+        """Janelas ainda não concluídas, por liga"""
+        with self.pool.reader() as conn:
+            done = set(conn.execute('SELECT league_code, date_from, date_to FROM backfill_chunks'))
+        return [
+            (league_code, chunk_from, chunk_to)
+            for league_code in league_codes
+            for chunk_from, chunk_to in date_chunks(date_from, date_to, self.chunk_days)
+            if (league_code, chunk_from, chunk_to) not in done
+        ]
+
+    def _run_chunk(self, league_name, league_code, date_from, date_to):
+        matches = self.collector._fetch_matches(league_code, date_from, date_to, priority=PRIORITY_LOW)
+
+        with self.pool.writer() as conn:
+            # Janelas terminam fora de ordem: a marca d'água só avança no fim de run()
+            fetched, written = self.collector._ingest_matches(
+                conn, league_name, league_code, date_from, date_to, matches, update_sync=False
+            )
+            # Checkpoint após a gravação: se cair antes dele, a janela é refeita sem duplicar
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO backfill_chunks
+                    (league_code, date_from, date_to, matches, finished_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (league_code, date_from, date_to, fetched, datetime.now().isoformat()))
+
+        return fetched, written
+
+    def covered_through(self, conn, league_code, date_from):
+        """Último dia coberto sem buracos pelas janelas concluídas desde date_from"""
+        reached = None
+        for chunk_from, chunk_to in conn.execute('''
+            SELECT date_from, date_to FROM backfill_chunks
+            WHERE league_code = ? AND date_to >= ?
+            ORDER BY date_from
+        ''', (league_code, date_from)):
+            next_day = date_from if reached is None else _next_day(reached)
+            if chunk_from > next_day:
+                break
+            reached = max(reached or chunk_to, chunk_to)
+        return reached
+
+    def advance_sync_state(self, league_codes, date_from):
+        """Avança a marca d'água de cada liga até onde o backfill cobre sem buracos"""
+        with self.pool.writer() as conn:
+            with conn:
+                for league_code in league_codes:
+                    reached = self.covered_through(conn, league_code, date_from)
+                    if reached is None:
+                        continue
+                    # Partidas pendentes já gravadas seguram a marca, como na coleta incremental
+                    stored = conn.execute('''
+                        SELECT date, status FROM games
+                        WHERE league_code = ? AND date >= ? AND date < ?
+                    ''', (league_code, date_from, _next_day(reached)))
+                    matches = [{'utcDate': date, 'status': status} for date, status in stored]
+                    self.collector._update_sync_state(
+                        conn, league_code, date_from, reached,
+                        self.collector._synced_through(matches, reached), None
+                    )
+
+    def run(self, date_from, date_to, league_codes=None):
+        """Executa (ou retoma) o backfill do período"""
+        names = {code: name for name, code in self.collector.leagues.items()}
+        league_codes = league_codes or list(names)
+
+        total_chunks = len(league_codes) * len(date_chunks(date_from, date_to, self.chunk_days))
+        pending = self.pending_chunks(league_codes, date_from, date_to)
+        print(f"Backfill {date_from} a {date_to}: {len(pending)} de {total_chunks} janelas pendentes "
+              f"({len(league_codes)} ligas, {self.chunk_days} dias por janela)")
+
+        done = rows = failed = 0
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as executor:
+            futures = {
+                executor.submit(self._run_chunk, names.get(code, code), code, chunk_from, chunk_to):
+                    (code, chunk_from, chunk_to)
+                for code, chunk_from, chunk_to in pending
+            }
+
+            for future in as_completed(futures):
+                code, chunk_from, chunk_to = futures[future]
+                try:
+                    fetched, _ = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Erro em {code} {chunk_from}..{chunk_to}: {e}")
+                    continue
+
+                done += 1
+                rows += fetched
+                elapsed = time.perf_counter() - start
+                remaining = len(pending) - done - failed
+                eta = elapsed / done * remaining
+                print(f"[{done + failed}/{len(pending)}] {code} {chunk_from}..{chunk_to}: {fetched} partidas | "
+                      f"{rows / elapsed:,.0f} linhas/s | restante ~{eta / 60:.1f} min")
+
+        elapsed = time.perf_counter() - start
+        print(f"Backfill: {done} janelas concluídas, {failed} com erro, {rows} partidas em {elapsed:.1f}s")
+        if done:
+            self.collector.refresh_features()
+        if failed:
+            print("Execute novamente para retomar as janelas com erro")
+
+        self.advance_sync_state(league_codes, date_from)
+
+        self.collector.update_team_stats(teams=self.collector.touched_teams)
+        self.collector.touched_teams.clear()
+        return done, failed
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill de temporadas da football-data.org')
+    parser.add_argument('--from', dest='date_from', help='data inicial (AAAA-MM-DD)')
+    parser.add_argument('--to', dest='date_to', help='data final (AAAA-MM-DD, padrão: hoje)')
+    parser.add_argument('--seasons', type=int, default=1, help='temporadas para trás quando --from não é informado')
+    parser.add_argument('--leagues', help='códigos separados por vírgula (padrão: todas)')
+    parser.add_argument('--chunk-days', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    date_to = args.date_to or datetime.now().strftime('%Y-%m-%d')
+    date_from = args.date_from or (datetime.now() - timedelta(days=365 * args.seasons)).strftime('%Y-%m-%d')
+    league_codes = args.leagues.split(',') if args.leagues else None
+
+    Backfill(chunk_days=args.chunk_days, workers=args.workers).run(date_from, date_to, league_codes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inferência em lote: custo por partida de predict_match em laço
+vs predict_matches com lotes de tamanhos crescentes
+
+Roda em uma pasta temporária (banco, feature store e modelos próprios). A
+rede neural só entra se o TensorFlow estiver instalado.
+
+Uso: python bench_batch.py [--seasons 2] [--sizes 1,5,10,20,50,100,200]
+"""
+
+import os
+import tempfile
+
+# Banco, feature store e modelos da medição ficam fora do diretório do projeto
+WORKDIR = tempfile.mkdtemp(prefix='bench_batch_')
+os.environ['FOOTBALL_DB'] = os.path.join(WORKDIR, 'bench.db')
+os.environ['FEATURE_STORE'] = os.path.join(WORKDIR, 'feature_store')
+
+import argparse
+import random
+import shutil
+import sqlite3
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from data_collector import DataCollector
+from db_pool import get_pool
+from elo import replay_ratings
+from feature_store import get_feature_store
+from form_table import refresh_form
+from migrations import migrate
+from ml_predictor import FootballPredictor
+from sample_data import generate_api_matches
+
+def build_database(seasons):
+    collector = DataCollector()
+    end = datetime.now() - timedelta(days=1)
+    start = (end - timedelta(days=365 * seasons)).strftime('%Y-%m-%d')
+
+    rows = []
+    for league_name, league_code in collector.leagues.items():
+        matches = generate_api_matches(league_code, start, end.strftime('%Y-%m-%d'))['matches']
+        rows.extend(collector._match_rows(matches, league_name, league_code))
+
+    conn = sqlite3.connect(os.environ['FOOTBALL_DB'])
+    migrate(conn)
+    with conn:
+        collector._store_matches(conn, rows)
+        refresh_form(conn)
+        replay_ratings(conn)
+    conn.close()
+    get_feature_store().refresh()
+
+    # Confrontos entre times da mesma liga, como numa rodada
+    teams = {}
+    for row in rows:
+        teams.setdefault(row[7], set()).update((row[1], row[2]))
+    return [sorted(group) for group in teams.values()]
+
+def fixtures(groups, n, rng):
+    pairs = []
+    while len(pairs) < n:
+        pairs.append(tuple(rng.sample(rng.choice(groups), 2)))
+    return pairs
+
+def measure(name, predictor, groups, sizes):
+    rng = random.Random(0)
+    predictor.predict_matches(fixtures(groups, 2, rng))  # Carrega os modelos antes de medir
+
+    print(f"\n{name}")
+    print(f"{'Lote':>6} {'laço (ms/partida)':>18} {'lote (ms/partida)':>18} {'Ganho':>7}")
+    for size in sizes:
+        pairs = fixtures(groups, size, rng)
+
+        start = time.perf_counter()
+        looped = [predictor.predict_match(home, away) for home, away in pairs]
+        loop_time = (time.perf_counter() - start) / size * 1000
+
+        start = time.perf_counter()
+        batched = predictor.predict_matches(pairs)
+        batch_time = (time.perf_counter() - start) / size * 1000
+
+        assert all(abs(a['home_win_prob'] - b['home_win_prob']) < 1e-5 for a, b in zip(looped, batched))
+        print(f"{size:>6} {loop_time:>18.2f} {batch_time:>18.2f} {loop_time / batch_time:>6.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Inferência em lote dos modelos')
+    parser.add_argument('--seasons', type=int, default=2)
+    parser.add_argument('--sizes', default='1,5,10,20,50,100,200')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    cwd = os.getcwd()
+    os.chdir(WORKDIR)  # Modelos são gravados com caminhos relativos
+    try:
+        groups = build_database(args.seasons)
+        with get_pool().reader() as conn:
+            print(f"{conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]} partidas em {WORKDIR}")
+
+        forest = FootballPredictor()
+        with redirect_stdout(StringIO()):
+            forest.train_models()
+        measure('Random Forest (2 x 100 árvores)', forest, groups, sizes)
+
+        from neural_predictor import NeuralPredictor
+        network = NeuralPredictor()
+        try:
+            network.train_models()  # TensorFlow só é importado aqui
+        except ImportError as e:
+            print(f"\nRede neural ignorada: {e}")
+        else:
+            measure('Rede neural (128-64-32)', network, groups, sizes)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
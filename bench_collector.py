@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de jogos de hoje contra um servidor local simulado
+"""
+
+import time
+
+import requests
+
+from data_collector import DataCollector
+from request_scheduler import RequestScheduler
+from stub_server import StubServer
+
+LATENCY = 0.15  # Latência simulada por requisição (s)
+LEAGUE_COUNTS = [1, 2, 5, 10, 20]
+ROUNDS = 3
+
+def sequential_fetch(collector):
+    """Comportamento anterior: uma liga por vez, conexão nova a cada requisição"""
+    today = time.strftime('%Y-%m-%d')
+    matches = []
+    for league_code in collector.leagues.values():
+        response = requests.get(
+            f'{collector.base_url}/competitions/{league_code}/matches',
+            headers=collector.headers,
+            params={'dateFrom': today, 'dateTo': today}
+        )
+        matches.extend(response.json().get('matches', []))
+    return matches
+
+def timed(func, *args):
+    """Retorna o melhor tempo (ms) de algumas execuções"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    server = StubServer(latency=LATENCY).start()
+    collector = DataCollector()
+    collector.base_url = server.base_url
+    collector.archive = None
+    collector.today_deadline = 30
+    # Sem cache nem limite de taxa: mede apenas a busca na API
+    collector.scheduler = RequestScheduler(collector.session, rate=100000, workers=16)
+    collector.fixture_cache.ttl = collector.fixture_cache.stale_ttl = 0
+
+    print(f"Latência simulada: {LATENCY * 1000:.0f} ms por requisição")
+    print(f"{'Ligas':>6} {'Sequencial (ms)':>16} {'Paralelo (ms)':>14} {'Ganho':>7}")
+
+    for count in LEAGUE_COUNTS:
+        collector.leagues = {f'Liga {i}': f'L{i:02d}' for i in range(count)}
+
+        seq = timed(sequential_fetch, collector)
+        par = timed(collector.get_today_matches)
+
+        print(f"{count:>6} {seq:>16.1f} {par:>14.1f} {seq / par:>6.1f}x")
+
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ingestão (linhas/s) a partir de respostas gravadas da API
+
+Uso: python bench_ingest.py [pasta_com_respostas_json | pasta_do_archive]
+Sem pasta, gera 90 dias de respostas simuladas para cada liga.
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from data_collector import DataCollector
+from db_pool import get_pool
+from migrations import migrate
+from response_archive import ResponseArchive
+from sample_data import generate_api_matches
+
+def load_payloads(folder=None):
+    """Carrega respostas gravadas (uma por arquivo) ou gera respostas simuladas"""
+    if folder and glob.glob(os.path.join(folder, '*', '*.jsonl.gz')):
+        archive = ResponseArchive(folder)
+        return [
+            (league_code, record['payload'].get('matches', []))
+            for league_code in archive.leagues()
+            for record in archive.records(league_code)
+        ]
+
+    if folder:
+        payloads = []
+        for path in sorted(glob.glob(os.path.join(folder, '*.json'))):
+            with open(path) as f:
+                payload = json.load(f)
+            league_code = payload.get('competition', {}).get('code', os.path.basename(path).split('_')[0])
+            payloads.append((league_code, payload.get('matches', [])))
+        return payloads
+
+    end = datetime.now()
+    start = (end - timedelta(days=90)).strftime('%Y-%m-%d')
+    collector = DataCollector()
+    return [
+        (code, generate_api_matches(code, start, end.strftime('%Y-%m-%d'), matches_per_day=10)['matches'])
+        for code in collector.leagues.values()
+    ]
+
+def legacy_ingest(db_path, collector, payloads):
+    """Caminho anterior: um INSERT por partida, journal padrão"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for league_code, matches in payloads:
+        for row in collector._match_rows(matches, league_code, league_code):
+            cursor.execute('''
+                INSERT OR REPLACE INTO games 
+                (id, home_team, away_team, date, home_goals, away_goals, competition, league_code)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', row[:8])
+        conn.commit()
+    conn.close()
+
+def batch_ingest(db_path, collector, payloads):
+    """Caminho atual: executemany em lotes, uma transação por liga, WAL"""
+    collector.db_path = db_path
+    pool = get_pool(db_path)
+    for league_code, matches in payloads:
+        with pool.writer() as conn:
+            collector._store_matches(conn, collector._match_rows(matches, league_code, league_code))
+    pool.close()
+
+def run(name, ingest, collector, payloads):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        conn = sqlite3.connect(db_path)
+        migrate(conn)
+        conn.close()
+
+        rows = sum(len(matches) for _, matches in payloads)
+        start = time.perf_counter()
+        ingest(db_path, collector, payloads)
+        elapsed = time.perf_counter() - start
+
+    print(f"{name:<28} {rows:>8} linhas {elapsed * 1000:>9.1f} ms {rows / elapsed:>12,.0f} linhas/s")
+    return rows / elapsed
+
+def main():
+    payloads = load_payloads(sys.argv[1] if len(sys.argv) > 1 else None)
+    collector = DataCollector()
+
+    legacy = run('INSERT por linha', legacy_ingest, collector, payloads)
+    batch = run('executemany + WAL', batch_ingest, collector, payloads)
+    print(f"Ganho: {batch / legacy:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Teste de carga sem rede: vazão do coletor e latência de cauda das rotas Flask
+contra o servidor simulado (stub_server.py)
+
+Uso: python bench_load.py [--app app.py] [--clients 16] [--duration 10] [--latency 0.1]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def bench_collector(stub, leagues, days_back):
+    """Coleta completa de várias ligas contra o servidor simulado"""
+    from data_collector import DataCollector
+
+    collector = DataCollector()
+    collector.base_url = stub.base_url
+    collector.archive = None
+    collector.leagues = {f'Liga {i}': f'L{i:02d}' for i in range(leagues)}
+
+    start = time.perf_counter()
+    collector.collect_matches_by_leagues(days_back=days_back)
+    elapsed = time.perf_counter() - start
+
+    with collector._reader() as conn:
+        rows = conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    print(f"\nColetor: {leagues} ligas x {days_back} dias em {elapsed:.2f}s "
+          f"({rows / elapsed:,.0f} partidas/s, {leagues / elapsed:.1f} requisições/s)")
+
+def load_app(path):
+    spec = importlib.util.spec_from_file_location('bench_app', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def bench_app(app_path, endpoints, clients, duration):
+    """Dispara clientes concorrentes contra o app e mede a latência por rota"""
+    from werkzeug.serving import make_server
+
+    module = load_app(app_path)
+    module.init_db()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    latencies = {endpoint: [] for endpoint in endpoints}
+    failures = {endpoint: 0 for endpoint in endpoints}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        session = requests.Session()
+        i = offset
+        while time.monotonic() < stop_at:
+            endpoint = endpoints[i % len(endpoints)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(base + endpoint, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies[endpoint].append(elapsed)
+                if not ok:
+                    failures[endpoint] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.shutdown()
+
+    print(f"\nApp {os.path.basename(app_path)}: {clients} clientes por {duration}s")
+    print(f"{'Rota':<16} {'Req':>6} {'Falhas':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'Média':>8}")
+    for endpoint, values in latencies.items():
+        if not values:
+            continue
+        print(f"{endpoint:<16} {len(values):>6} {failures[endpoint]:>7} {percentile(values, 50):>9.1f} "
+              f"{percentile(values, 95):>9.1f} {percentile(values, 99):>9.1f} {statistics.mean(values):>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga com a API simulada')
+    parser.add_argument('--app', default='app.py', help='arquivo do app Flask')
+    parser.add_argument('--endpoints', default='/games,/predictions')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--latency', type=float, default=0.1, help='latência da API simulada (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--leagues', type=int, default=20)
+    parser.add_argument('--days-back', type=int, default=90)
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+
+    tmp = tempfile.mkdtemp()
+
+    # Configuração lida na importação dos módulos do projeto
+    os.environ['FOOTBALL_DB'] = os.path.join(tmp, 'football.db')
+    os.environ['FEATURE_STORE'] = os.path.join(tmp, 'feature_store')
+    os.environ['FOOTBALL_API_RATE_LIMIT'] = '100000'
+    os.environ['FOOTBALL_ARCHIVE'] = '0'
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from migrations import migrate
+    from sample_data import create_sample_data
+    from stub_server import StubServer
+
+    migrate()
+    stub = StubServer(latency=args.latency, jitter=args.latency / 2, error_rate=args.error_rate).start()
+    os.environ['FOOTBALL_API_URL'] = stub.base_url
+
+    bench_collector(stub, args.leagues, args.days_back)
+
+    os.chdir(tmp)
+    create_sample_data()
+    bench_app(app_path, args.endpoints.split(','), args.clients, args.duration)
+
+    print(f"\nServidor simulado: {stub.stats}")
+    stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark da carga de modelos na previsão: unpickle dos dois Random Forests
+a cada chamada vs registro de modelos (carga única e recarga por mtime)
+
+Uso: python bench_models.py [--calls 50] [--samples 5000]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from model_registry import ModelRegistry, save_pickle
+
+def train_artifacts(directory, samples, seed=0):
+    """Dois Random Forests de 100 árvores sobre features sintéticas, como em ml_predictor.py"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(samples, 6))
+    y_goals = (X[:, 0] + X[:, 3] + rng.normal(size=samples) > 0).astype(int)
+    y_result = np.digitize(X[:, 0] - X[:, 3] + rng.normal(size=samples), [-0.5, 0.5])
+
+    paths = (os.path.join(directory, 'model_goals.pkl'), os.path.join(directory, 'model_result.pkl'))
+    for path, y in zip(paths, (y_goals, y_result)):
+        save_pickle(RandomForestClassifier(n_estimators=100, random_state=seed).fit(X, y), path)
+    return paths, X[:1]
+
+def per_call(paths, features):
+    """Caminho anterior de predict_match: abre os dois pickles a cada previsão"""
+    with open(paths[0], 'rb') as f:
+        model_goals = pickle.load(f)
+    with open(paths[1], 'rb') as f:
+        model_result = pickle.load(f)
+    return model_goals.predict_proba(features), model_result.predict_proba(features)
+
+def registered(registry, paths, features):
+    model_goals, model_result = registry.load('random_forest', paths)
+    return model_goals.predict_proba(features), model_result.predict_proba(features)
+
+def measure(label, calls, fn):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<24} {statistics.median(latencies):>10.2f} {max(latencies):>10.2f} {sum(latencies):>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga de modelos por previsão')
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, features = train_artifacts(tmp, args.samples)
+        registry = ModelRegistry()
+        print(f"{args.calls} previsões, modelos com {sum(os.path.getsize(p) for p in paths) / 1e6:.1f} MB em disco")
+        print(f"{'Modo':<24} {'p50 (ms)':>10} {'máx (ms)':>10} {'total (ms)':>10}")
+        measure('unpickle por chamada', args.calls, lambda: per_call(paths, features))
+        measure('registro de modelos', args.calls, lambda: registered(registry, paths, features))
+
+        # Retreino: arquivos trocados no lugar, próxima chamada recarrega sem reiniciar
+        time.sleep(0.01)
+        train_artifacts(tmp, args.samples, seed=1)
+        measure('registro após retreino', args.calls, lambda: registered(registry, paths, features))
+
+        for name, stats in registry.stats().items():
+            print(f"\n{name}: carga {stats['load_ms']} ms, {stats['memory_bytes'] / 1e6:.1f} MB em memória, "
+                  f"{stats['file_bytes'] / 1e6:.1f} MB em disco, {stats['loads']} cargas")
+
+if __name__ == "__main__":
+    main()
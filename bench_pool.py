@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência do acesso ao SQLite: conexão nova por chamada
+vs pool de leitores somente leitura, com um escritor gravando ao mesmo tempo
+
+Uso: python bench_pool.py [--threads 16] [--duration 5] [--seasons 2]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from data_collector import DataCollector
+from db_pool import ConnectionPool
+from migrations import migrate
+from sample_data import generate_api_matches
+
+# Leitura típica de uma rota: estatísticas de dois times e forma recente
+READ_QUERY = '''
+    SELECT home_team, away_team, home_goals, away_goals FROM games
+    WHERE (home_team = ? OR away_team = ?) AND home_goals IS NOT NULL
+    ORDER BY date DESC LIMIT 5
+'''
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def build_database(db_path, seasons):
+    collector = DataCollector()
+    end = datetime.now() - timedelta(days=1)
+    start = (end - timedelta(days=365 * seasons)).strftime('%Y-%m-%d')
+
+    rows = []
+    for league_name, league_code in collector.leagues.items():
+        matches = generate_api_matches(league_code, start, end.strftime('%Y-%m-%d'))['matches']
+        rows.extend(collector._match_rows(matches, league_name, league_code))
+
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    with conn:
+        collector._store_matches(conn, rows)
+    conn.close()
+
+    teams = sorted({row[1] for row in rows})
+    return collector, rows, teams
+
+def read_once(conn, team):
+    conn.execute('SELECT * FROM team_stats WHERE team_name = ?', (team,)).fetchall()
+    conn.execute(READ_QUERY, (team, team)).fetchall()
+
+def run(label, db_path, teams, rows, collector, threads, duration, reader):
+    """Leitores concorrentes por duration segundos, com um escritor regravando partidas"""
+    pool = ConnectionPool(db_path)
+    latencies, errors, writes = [], [0], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def read_loop(seed):
+        rng = random.Random(seed)
+        local = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                reader(pool, rng.choice(teams))
+            except sqlite3.Error:
+                with lock:
+                    errors[0] += 1
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    def write_loop():
+        rng = random.Random(0)
+        while time.monotonic() < stop_at:
+            batch = rng.sample(rows, 200)
+            with pool.writer() as conn:
+                collector._store_matches(conn, batch)
+            writes[0] += 1
+
+    workers = [threading.Thread(target=read_loop, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=write_loop))
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    stats = pool.stats()
+    pool.close()
+
+    print(f"{label:<22} {len(latencies) / duration:>10,.0f} {percentile(latencies, 50):>9.2f} "
+          f"{percentile(latencies, 99):>9.2f} {statistics.mean(latencies):>8.2f} {errors[0]:>6} {writes[0]:>7}")
+    return stats
+
+def per_call_reader(pool, team):
+    """Caminho anterior: abre e fecha uma conexão a cada chamada"""
+    conn = sqlite3.connect(pool.db_path)
+    try:
+        read_once(conn, team)
+    finally:
+        conn.close()
+
+def pooled_reader(pool, team):
+    with pool.reader() as conn:
+        read_once(conn, team)
+
+def main():
+    parser = argparse.ArgumentParser(description='Concorrência de leitura no SQLite')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--seasons', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        collector, rows, teams = build_database(db_path, args.seasons)
+        collector.db_path = db_path
+
+        print(f"{len(rows)} partidas, {len(teams)} times, {args.threads} leitores + 1 escritor, {args.duration}s")
+        print(f"{'Modo':<22} {'Leituras/s':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Média':>8} {'Erros':>6} {'Lotes':>7}")
+        run('conexão por chamada', db_path, teams, rows, collector, args.threads, args.duration, per_call_reader)
+        stats = run('pool somente leitura', db_path, teams, rows, collector, args.threads, args.duration, pooled_reader)
+
+    print(f"\nPool: {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Memória por worker do gunicorn: cada worker carregando tudo sozinho vs
+preload no mestre com compartilhamento por copy-on-write
+
+Sobe o gunicorn com gunicorn.conf.py nos dois modos, espera /ready, faz
+algumas previsões e lê /proc/<pid>/smaps_rollup de cada worker. USS é a
+memória só do worker; PSS divide as páginas compartilhadas entre os processos.
+
+Uso: python bench_preload.py [--workers 4] [--requests 20]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from warmup import memory_usage
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROUTES = ['/predictions', '/analyze/Manchester%20City/Liverpool', '/predictions/neural']
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def get(url, timeout=30):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+    except OSError:
+        return None, b''
+
+def worker_pids(master):
+    with open(f'/proc/{master}/task/{master}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+def run(preload, workers, requests):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), GUNICORN_PRELOAD='1' if preload else '0')
+    start = time.perf_counter()
+    master = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--chdir', HERE, '-c', os.path.join(HERE, 'gunicorn.conf.py'), 'wsgi:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f'http://127.0.0.1:{port}'
+    try:
+        # Prontos quando todos os workers responderem 200 em /ready
+        ready_pids = set()
+        while len(ready_pids) < workers:
+            if master.poll() is not None:
+                raise RuntimeError('gunicorn encerrou antes de ficar pronto')
+            status, body = get(f'{base}/ready', timeout=5)
+            if status == 200:
+                status, body = get(f'{base}/memory')
+                ready_pids.add(json.loads(body)['pid'])
+            else:
+                time.sleep(0.2)
+        ready_time = time.perf_counter() - start
+
+        for i in range(requests):
+            get(base + ROUTES[i % len(ROUTES)])
+
+        rows = [(pid, memory_usage(pid)) for pid in worker_pids(master.pid)]
+        return ready_time, memory_usage(master.pid), rows
+    finally:
+        master.terminate()
+        master.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description='Memória por worker com e sem preload')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=20)
+    args = parser.parse_args()
+
+    for label, preload in (('carga por worker', False), ('preload no mestre', True)):
+        ready_time, master, rows = run(preload, args.workers, args.requests)
+        print(f"\n{label}: pronto em {ready_time:.1f}s, mestre RSS {master['rss_mb']:.0f} MB")
+        print(f"{'Worker':>8} {'RSS (MB)':>9} {'PSS (MB)':>9} {'USS (MB)':>9} {'Compart.':>9}")
+        for pid, memory in rows:
+            print(f"{pid:>8} {memory['rss_mb']:>9.1f} {memory['pss_mb']:>9.1f} "
+                  f"{memory['uss_mb']:>9.1f} {memory['shared_mb']:>9.1f}")
+        print(f"{'soma':>8} {sum(m['rss_mb'] for _, m in rows):>9.1f} {sum(m['pss_mb'] for _, m in rows):>9.1f} "
+              f"{sum(m['uss_mb'] for _, m in rows):>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark das consultas de forma, confronto direto e estatísticas
+
+Antes: uma consulta SQL por chamada, no esquema sem índices e com team_stats
+duplicado. Depois: banco migrado, StatsAnalyzer com pool de conexões e
+índice de histórico em memória.
+
+Uso: python bench_queries.py [temporadas]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from data_collector import DataCollector
+from db_pool import get_pool
+from migrations import migrate, LATEST_VERSION
+from sample_data import generate_api_matches
+from stats_analyzer import StatsAnalyzer
+
+BASELINE_VERSION = 2  # Esquema antes dos índices e do team_name único
+DAILY_RUNS = 5        # Execuções de update_team_stats simuladas
+LOOKUPS = 300
+
+def build_database(db_path, seasons):
+    """Popula o banco com partidas simuladas de várias temporadas"""
+    conn = sqlite3.connect(db_path)
+    migrate(conn, target=BASELINE_VERSION)
+
+    collector = DataCollector()
+    collector.db_path = db_path
+    end = datetime.now() - timedelta(days=1)
+    start = (end - timedelta(days=365 * seasons)).strftime('%Y-%m-%d')
+
+    rows = []
+    for league_name, league_code in collector.leagues.items():
+        matches = generate_api_matches(league_code, start, end.strftime('%Y-%m-%d'))['matches']
+        rows.extend(collector._match_rows(matches, league_name, league_code))
+    # INSERT nas colunas do esquema base (o de _store_matches pede migrações posteriores)
+    with conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO games
+            (id, home_team, away_team, date, home_goals, away_goals, competition, league_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [row[:8] for row in rows])
+    conn.close()
+
+    # Cada atualização diária acumulava linhas repetidas em team_stats
+    for _ in range(DAILY_RUNS):
+        collector.update_team_stats()
+
+    return len(rows)
+
+def legacy_form(conn, team, last_n=5):
+    """Consulta de forma usada antes do índice em memória"""
+    return conn.execute('''
+        SELECT home_goals, away_goals, CASE WHEN home_team = ? THEN 'home' ELSE 'away' END
+        FROM games WHERE (home_team = ? OR away_team = ?) AND home_goals IS NOT NULL
+        ORDER BY date DESC LIMIT ?
+    ''', (team, team, team, last_n)).fetchall()
+
+def legacy_h2h(conn, team1, team2, last_n=5):
+    """Consulta de confronto direto usada antes do índice em memória"""
+    return conn.execute('''
+        SELECT home_team, away_team, home_goals, away_goals FROM games
+        WHERE ((home_team = ? AND away_team = ?) OR (home_team = ? AND away_team = ?))
+        AND home_goals IS NOT NULL
+        ORDER BY date DESC LIMIT ?
+    ''', (team1, team2, team2, team1, last_n)).fetchall()
+
+def legacy_probabilities(conn, home, away):
+    """Consultas de um cálculo de probabilidades no caminho antigo"""
+    for team in (home, away):
+        conn.execute('SELECT * FROM team_stats WHERE team_name = ?', (team,)).fetchall()
+        legacy_form(conn, team)
+    legacy_h2h(conn, home, away)
+
+def timed(pairs, funcs):
+    """Tempo médio (ms) por par de cada função"""
+    results = {}
+    for name, func in funcs:
+        start = time.perf_counter()
+        for home, away in pairs:
+            func(home, away)
+        results[name] = (time.perf_counter() - start) * 1000 / len(pairs)
+    return results
+
+def measure_legacy(db_path, pairs):
+    conn = sqlite3.connect(db_path)
+    results = timed(pairs, [
+        ('get_team_form', lambda h, a: legacy_form(conn, h)),
+        ('head_to_head', lambda h, a: legacy_h2h(conn, h, a)),
+        ('calculate_match_probabilities', lambda h, a: legacy_probabilities(conn, h, a)),
+    ])
+    conn.close()
+    return results
+
+def measure(db_path, pairs):
+    """Tempo médio (ms) de cada consulta do StatsAnalyzer"""
+    analyzer = StatsAnalyzer(db_path)
+    analyzer.index.refresh()  # Carga inicial do índice fica fora da medição
+    results = timed(pairs, [
+        ('get_team_form', lambda h, a: analyzer.get_team_form(h)),
+        ('head_to_head', lambda h, a: analyzer.head_to_head(h, a)),
+        ('calculate_match_probabilities', analyzer.calculate_match_probabilities),
+    ])
+    get_pool(db_path).close()
+    return results
+
+def main():
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        total = build_database(db_path, seasons)
+
+        conn = sqlite3.connect(db_path)
+        teams = [row[0] for row in conn.execute('SELECT DISTINCT home_team FROM games')]
+        stats_rows = conn.execute('SELECT COUNT(*) FROM team_stats').fetchone()[0]
+        conn.close()
+
+        rng = random.Random(42)
+        pairs = [tuple(rng.sample(teams, 2)) for _ in range(LOOKUPS)]
+
+        print(f"{total} partidas, {len(teams)} times, {stats_rows} linhas em team_stats")
+        before = measure_legacy(db_path, pairs)
+
+        conn = sqlite3.connect(db_path)
+        migrate(conn)
+        stats_rows = conn.execute('SELECT COUNT(*) FROM team_stats').fetchone()[0]
+        conn.close()
+        print(f"Migrado para versão {LATEST_VERSION}: {stats_rows} linhas em team_stats")
+        after = measure(db_path, pairs)
+
+    print(f"{'Consulta':<32} {'Antes (ms)':>11} {'Depois (ms)':>12} {'Ganho':>7}")
+    for name in before:
+        print(f"{name:<32} {before[name]:>11.3f} {after[name]:>12.3f} {before[name] / after[name]:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
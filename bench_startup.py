@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de partida a frio do app leve: tempo de importação e memória (RSS)
+por processo, com e sem pandas carregado
+
+Cada medição roda em um processo novo. O modo "com pandas" importa pandas
+antes do app, reproduzindo o custo do stats_analyzer antigo.
+
+Uso: python bench_startup.py [--app app-light.py] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Executado em um processo novo; imprime uma linha JSON com as medições
+CHILD = r'''
+import importlib.util, json, os, sys, time
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+sys.path.insert(0, os.path.dirname(os.environ['BENCH_APP']))
+baseline = rss_mb()
+start = time.perf_counter()
+if os.environ['BENCH_PRELOAD']:
+    import pandas
+spec = importlib.util.spec_from_file_location('bench_app', os.environ['BENCH_APP'])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+import_time = time.perf_counter() - start
+import_rss = rss_mb()
+
+module.init_db()
+client = module.app.test_client()
+start = time.perf_counter()
+status = client.get('/predictions').status_code
+first_request = time.perf_counter() - start
+
+print(json.dumps({
+    'import_ms': import_time * 1000,
+    'first_request_ms': first_request * 1000,
+    'rss_base_mb': baseline,
+    'rss_import_mb': import_rss,
+    'rss_request_mb': rss_mb(),
+    'status': status,
+    'pandas': 'pandas' in sys.modules
+}))
+'''
+
+def measure(app_path, workdir, preload, runs):
+    env = dict(os.environ, BENCH_APP=app_path, BENCH_PRELOAD='1' if preload else '',
+               FOOTBALL_DB=os.path.join(workdir, 'football.db'))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', CHILD], cwd=workdir, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de importação e RSS do app leve')
+    parser.add_argument('--app', default='app-light.py', help='arquivo do app Flask')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ, FOOTBALL_DB=os.path.join(workdir, 'football.db'))
+    subprocess.run([sys.executable, os.path.join(here, 'sample_data.py')], cwd=workdir, env=env,
+                   check=True, capture_output=True)
+
+    print(f"{os.path.basename(app_path)}: mediana de {args.runs} processos novos")
+    print(f"{'Modo':<14} {'Import (ms)':>12} {'1ª req (ms)':>12} {'RSS import (MB)':>16} "
+          f"{'RSS req (MB)':>13} {'pandas':>7}")
+
+    for label, preload in (('com pandas', True), ('sem pandas', False)):
+        samples = measure(app_path, workdir, preload, args.runs)
+        median = lambda key: statistics.median(s[key] for s in samples)
+        print(f"{label:<14} {median('import_ms'):>12.0f} {median('first_request_ms'):>12.1f} "
+              f"{median('rss_import_mb'):>16.1f} {median('rss_request_mb'):>13.1f} "
+              f"{'sim' if samples[0]['pandas'] else 'não':>7}")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,103 @@
 import requests
-import sqlite3
 import schedule
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import os
+import sys
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from fixture_cache import FixtureCache
+from migrations import migrate, DB_PATH
+from db_pool import get_pool
+from elo import update_ratings
+from feature_store import get_feature_store
+from form_table import refresh_form
+from h2h_matrix import refresh_h2h
+from response_archive import ResponseArchive
+from season_calendar import season_end
+from request_scheduler import RequestScheduler, PRIORITY_HIGH, PRIORITY_NORMAL
 
 load_dotenv()
 
+# Sessão HTTP e pool de threads compartilhados por todo o processo
+_session = None
+_executor = None
+_fixture_cache = None
+_scheduler = None
+_shared_lock = threading.Lock()
+
+def get_session():
+    """Retorna sessão HTTP keep-alive compartilhada"""
+    global _session
+    with _shared_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+def get_executor():
+    """Retorna pool de threads usado nas buscas por liga"""
+    global _executor
+    with _shared_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='league-fetch')
+        return _executor
+
+def get_fixture_cache():
+    """Retorna cache de partidas por (liga, data) compartilhado"""
+    global _fixture_cache
+    with _shared_lock:
+        if _fixture_cache is None:
+            _fixture_cache = FixtureCache(
+                ttl=float(os.getenv('FIXTURE_CACHE_TTL', 300)),
+                stale_ttl=float(os.getenv('FIXTURE_CACHE_STALE_TTL', 1800))
+            )
+        return _fixture_cache
+
+def get_scheduler():
+    """Retorna o agendador único de requisições à API (limite do plano)"""
+    global _scheduler
+    session = get_session()
+    with _shared_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                session,
+                rate=int(os.getenv('FOOTBALL_API_RATE_LIMIT', 10)),
+                per=60.0,
+                workers=int(os.getenv('FOOTBALL_API_WORKERS', 8)),
+                default_deadline=float(os.getenv('FOOTBALL_API_DEADLINE', 300))
+            )
+        return _scheduler
+
+# Situações em que a partida não muda mais
+FINAL_STATUSES = {'FINISHED', 'AWARDED', 'CANCELLED', 'POSTPONED', 'SUSPENDED'}
+
+# Partidas pendentes mais antigas que isso (dias) não seguram a marca d'água
+PENDING_LOOKBACK_DAYS = int(os.getenv('FOOTBALL_PENDING_LOOKBACK', 14))
+
 class DataCollector:
     def __init__(self):
         self.api_key = os.getenv('FOOTBALL_API_KEY', 'f9c2bbc9a86c4c0b8a843cf67c364a0e')
-        self.base_url = 'https://api.football-data.org/v4'
+        self.base_url = os.getenv('FOOTBALL_API_URL', 'https://api.football-data.org/v4')
         self.headers = {'X-Auth-Token': self.api_key}
+        self.session = get_session()
+        self.fixture_cache = get_fixture_cache()
+        self.scheduler = get_scheduler()
+        
+        # Respostas brutas guardadas para reconstruir o banco sem rede
+        self.archive = ResponseArchive() if os.getenv('FOOTBALL_ARCHIVE', '1') != '0' else None
+        
+        # Tempo máximo (s) de cada requisição e do conjunto de jogos de hoje
+        self.request_timeout = float(os.getenv('FOOTBALL_API_TIMEOUT', 10))
+        self.today_deadline = float(os.getenv('FOOTBALL_TODAY_DEADLINE', 5))
+        
+        self.db_path = DB_PATH
+        self.batch_size = 500  # Linhas por executemany na ingestão
+        self.touched_teams = set()  # Times com partidas alteradas desde a última atualização
         
         # IDs das ligas específicas
         self.leagues = {
@@ -23,11 +108,190 @@ class DataCollector:
             'Liga Argentina': 'PPL'
         }
     
+    def _fetch_matches(self, league_code, date_from, date_to, timeout=None,
+                       priority=PRIORITY_NORMAL, deadline=None):
+        """Busca partidas de uma liga no intervalo informado (via agendador)"""
+        response = self.scheduler.request(
+            f'{self.base_url}/competitions/{league_code}/matches',
+            headers=self.headers,
+            params={
+                'dateFrom': date_from,
+                'dateTo': date_to
+            },
+            priority=priority,
+            timeout=timeout or self.request_timeout,
+            deadline=deadline
+        )
+        response.raise_for_status()
+        payload = response.json()
+        
+        if self.archive:
+            try:
+                self.archive.append(league_code, date_from, date_to, payload)
+            except OSError as e:
+                print(f"Erro ao arquivar resposta da {league_code}: {e}")
+        
+        return payload.get('matches', [])
+    
+    def _cached_matches(self, league_code, date, timeout):
+        """Partidas de uma liga em uma data, servidas pelo cache compartilhado"""
+        return self.fixture_cache.get(
+            (league_code, date),
+            lambda: self._fetch_matches(league_code, date, date, timeout, PRIORITY_HIGH, timeout),
+            timeout=timeout
+        )
+    
+    def _writer(self):
+        """Conexão única de escrita do processo, em WAL (leitores não são bloqueados)"""
+        return get_pool(self.db_path).writer()
+    
+    def _reader(self):
+        """Conexão somente leitura emprestada do pool"""
+        return get_pool(self.db_path).reader()
+    
+    def _match_rows(self, matches, league_name, league_code):
+        """Converte partidas da API em linhas da tabela games"""
+        rows = []
+        for match in matches:
+            finished = match['status'] == 'FINISHED'
+            rows.append((
+                match['id'],
+                match['homeTeam']['name'],
+                match['awayTeam']['name'],
+                match['utcDate'],
+                match['score']['fullTime']['home'] if finished else None,
+                match['score']['fullTime']['away'] if finished else None,
+                league_name,
+                league_code,
+                match['status']
+            ))
+        return rows
+    
+    def _changed_rows(self, conn, rows):
+        """Filtra as linhas que diferem do que já está gravado"""
+        existing = set()
+        for i in range(0, len(rows), self.batch_size):
+            ids = [row[0] for row in rows[i:i + self.batch_size]]
+            existing.update(conn.execute(f'''
+                SELECT id, home_team, away_team, date, home_goals, away_goals, competition, league_code, status
+                FROM games WHERE id IN ({','.join('?' * len(ids))})
+            ''', ids))
+        return [row for row in rows if row not in existing]
+    
+    def _stored_matches(self, conn, ids):
+        """(mandante, visitante, data) já gravados para as partidas informadas"""
+        stored = []
+        for i in range(0, len(ids), self.batch_size):
+            batch = ids[i:i + self.batch_size]
+            stored.extend(conn.execute(
+                f'SELECT home_team, away_team, date FROM games WHERE id IN ({",".join("?" * len(batch))})', batch
+            ))
+        return stored
+    
+    def _store_matches(self, conn, rows):
+        """Grava linhas em lotes (a transação fica a cargo de quem chama)"""
+        # change_seq numerado aqui evita o gatilho de uma linha por vez
+        seq = conn.execute('SELECT IFNULL(MAX(change_seq), 0) FROM games').fetchone()[0]
+        for i in range(0, len(rows), self.batch_size):
+            conn.executemany('''
+                INSERT OR REPLACE INTO games 
+                (id, home_team, away_team, date, home_goals, away_goals, competition, league_code, status, change_seq)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [row + (seq + i + k + 1,) for k, row in enumerate(rows[i:i + self.batch_size])])
+    
+    def _synced_through(self, matches, date_to, today=None):
+        """Último dia do intervalo em que todas as partidas já estão encerradas"""
+        # Pendência antiga (ex.: jogo sem data nova) não prende a marca para sempre
+        today = today or datetime.now().date()
+        oldest = (today - timedelta(days=PENDING_LOOKBACK_DAYS)).isoformat()
+        pending = [
+            m['utcDate'][:10] for m in matches
+            if m['status'] not in FINAL_STATUSES and m['utcDate'][:10] >= oldest
+        ]
+        if not pending:
+            return date_to
+        first_pending = datetime.strptime(min(pending), '%Y-%m-%d')
+        return min(date_to, (first_pending - timedelta(days=1)).strftime('%Y-%m-%d'))
+    
+    def _update_sync_state(self, conn, league_code, date_from, date_to, synced_through, last_changed):
+        """Avança a marca d'água da liga quando o intervalo coletado é contínuo"""
+        row = conn.execute(
+            'SELECT last_synced_date, last_changed FROM sync_state WHERE league_code = ?',
+            (league_code,)
+        ).fetchone()
+        old_mark, old_changed = row if row else (None, None)
+        
+        if old_mark is None:
+            new_mark = synced_through
+        elif date_from > (datetime.strptime(old_mark, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d'):
+            new_mark = old_mark  # Há um buraco entre a marca e o intervalo
+        else:
+            new_mark = max(old_mark, synced_through)  # A marca nunca recua
+        
+        conn.execute('''
+            INSERT OR REPLACE INTO sync_state (league_code, last_synced_date, last_changed, updated_at)
+            VALUES (?, ?, ?, ?)
+        ''', (league_code, new_mark, max(filter(None, [old_changed, last_changed]), default=None),
+              datetime.now().isoformat()))
+    
+    def get_sync_state(self, league_code):
+        """Retorna (last_synced_date, last_changed) da liga"""
+        with self._reader() as conn:
+            row = conn.execute(
+                'SELECT last_synced_date, last_changed FROM sync_state WHERE league_code = ?',
+                (league_code,)
+            ).fetchone()
+        return row if row else (None, None)
+    
+    def _ingest_league(self, league_name, league_code, date_from, date_to):
+        """Coleta um intervalo de uma liga e grava só o que mudou; retorna (recebidas, gravadas)"""
+        matches = self._fetch_matches(league_code, date_from, date_to)
+        # O escritor só é ocupado depois da resposta da API
+        with self._writer() as conn:
+            return self._ingest_matches(conn, league_name, league_code, date_from, date_to, matches)
+    
+    def _ingest_matches(self, conn, league_name, league_code, date_from, date_to, matches, update_sync=True):
+        """Grava partidas já obtidas de um intervalo; retorna (recebidas, gravadas)
+
+        Sem update_sync a marca d'água fica como está (o backfill a avança no fim).
+        """
+        rows = self._changed_rows(conn, self._match_rows(matches, league_name, league_code))
+        
+        changed_ids = {row[0] for row in rows}
+        last_changed = max(
+            (m.get('lastUpdated') or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+             for m in matches if m['id'] in changed_ids),
+            default=None
+        )
+        
+        # Partidas, confrontos diretos, forma, ratings e marca d'água na mesma transação
+        with conn:
+            # Versões antigas também: uma correção pode trocar os times ou a data da partida
+            affected = self._stored_matches(conn, [row[0] for row in rows])
+            self._store_matches(conn, rows)
+            for row in rows:
+                self.touched_teams.update((row[1], row[2]))
+                affected.append((row[1], row[2], row[3]))
+            
+            # Forma refeita a partir da partida alterada mais antiga de cada time
+            since = {}
+            for home, away, date in affected:
+                for team in (home, away):
+                    since[team] = min(since.get(team, date), date)
+            
+            refresh_h2h(conn, {(home, away) for home, away, _ in affected})
+            refresh_form(conn, since)
+            update_ratings(conn, [row[0] for row in rows])
+            if update_sync:
+                self._update_sync_state(
+                    conn, league_code, date_from, date_to,
+                    self._synced_through(matches, date_to), last_changed
+                )
+        
+        return len(matches), len(rows)
+    
     def collect_matches_by_leagues(self, days_back=30):
         """Coleta partidas das ligas específicas"""
-        conn = sqlite3.connect('football.db')
-        cursor = conn.cursor()
-        
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
         
@@ -35,154 +299,202 @@ class DataCollector:
         
         for league_name, league_code in self.leagues.items():
             try:
-                response = requests.get(
-                    f'{self.base_url}/competitions/{league_code}/matches',
-                    headers=self.headers,
-                    params={
-                        'dateFrom': start_date.strftime('%Y-%m-%d'),
-                        'dateTo': end_date.strftime('%Y-%m-%d')
-                    }
+                # Uma transação por liga
+                fetched, written = self._ingest_league(
+                    league_name, league_code,
+                    start_date.strftime('%Y-%m-%d'),
+                    end_date.strftime('%Y-%m-%d')
                 )
                 
-                if response.status_code == 200:
-                    matches = response.json().get('matches', [])
-                    
-                    for match in matches:
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO games 
-                            (id, home_team, away_team, date, home_goals, away_goals, competition, league_code)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            match['id'],
-                            match['homeTeam']['name'],
-                            match['awayTeam']['name'],
-                            match['utcDate'],
-                            match['score']['fullTime']['home'] if match['status'] == 'FINISHED' else None,
-                            match['score']['fullTime']['away'] if match['status'] == 'FINISHED' else None,
-                            league_name,
-                            league_code
-                        ))
-                    
-                    total_matches += len(matches)
-                    print(f"Coletadas {len(matches)} partidas da {league_name}")
-                else:
-                    print(f"Erro na API para {league_name}: {response.status_code}")
+                total_matches += fetched
+                print(f"Coletadas {fetched} partidas da {league_name} ({written} alteradas)")
                     
             except Exception as e:
                 print(f"Erro ao coletar {league_name}: {e}")
         
-        conn.commit()
-        conn.close()
         print(f"Total: {total_matches} partidas coletadas")
+        self.refresh_features()
     
-    def get_today_matches(self):
-        """Busca jogos de hoje das ligas específicas"""
+    def collect_incremental(self, days_back=90, overlap_days=3):
+        """Coleta apenas o intervalo desde a última marca d'água de cada liga"""
         today = datetime.now().strftime('%Y-%m-%d')
-        all_matches = []
+        total_matches = total_written = 0
         
         for league_name, league_code in self.leagues.items():
+            last_synced, _ = self.get_sync_state(league_code)
+            
+            # Sem marca: coleta inicial; com marca: pequena sobreposição para correções de placar
+            if last_synced:
+                start = datetime.strptime(last_synced, '%Y-%m-%d') - timedelta(days=overlap_days)
+            else:
+                start = datetime.now() - timedelta(days=days_back)
+            date_from = min(start.strftime('%Y-%m-%d'), today)
+            
             try:
-                response = requests.get(
-                    f'{self.base_url}/competitions/{league_code}/matches',
-                    headers=self.headers,
-                    params={
-                        'dateFrom': today,
-                        'dateTo': today
-                    }
-                )
-                
-                if response.status_code == 200:
-                    matches = response.json().get('matches', [])
-                    for match in matches:
-                        all_matches.append({
-                            'id': match['id'],
-                            'homeTeam': match['homeTeam']['name'],
-                            'awayTeam': match['awayTeam']['name'],
-                            'date': match['utcDate'],
-                            'competition': league_name,
-                            'league_code': league_code,
-                            'status': match['status']
-                        })
-                        
+                fetched, written = self._ingest_league(league_name, league_code, date_from, today)
+                total_matches += fetched
+                total_written += written
+                print(f"{league_name}: {fetched} partidas desde {date_from} ({written} alteradas)")
             except Exception as e:
-                print(f"Erro ao buscar jogos de hoje da {league_name}: {e}")
+                print(f"Erro ao coletar {league_name}: {e}")
         
-        return all_matches
+        print(f"Total: {total_matches} partidas coletadas, {total_written} gravadas")
+        self.sync_fixtures()
+        self.refresh_features()
     
-    def update_team_stats(self):
-        """Atualiza estatísticas dos times"""
-        conn = sqlite3.connect('football.db')
-        cursor = conn.cursor()
+    def sync_fixtures(self, today=None):
+        """Grava as partidas agendadas de hoje até o fim da temporada de cada liga"""
+        today = today or datetime.now().date()
+        date_from = today.isoformat()
+        total_matches = 0
         
-        # Busca todos os times únicos
-        cursor.execute('''
-            SELECT DISTINCT home_team FROM games
-            UNION
-            SELECT DISTINCT away_team FROM games
-        ''')
+        for league_name, league_code in self.leagues.items():
+            date_to = season_end(league_code, today)
+            try:
+                matches = self._fetch_matches(league_code, date_from, date_to)
+                # Calendário, não resultados: a marca d'água não se mexe
+                with self._writer() as conn:
+                    fetched, written = self._ingest_matches(
+                        conn, league_name, league_code, date_from, date_to, matches, update_sync=False
+                    )
+                total_matches += fetched
+                print(f"{league_name}: {fetched} partidas até {date_to} ({written} alteradas)")
+            except Exception as e:
+                print(f"Erro ao sincronizar o calendário da {league_name}: {e}")
         
-        teams = [row[0] for row in cursor.fetchall()]
+        print(f"Calendário: {total_matches} partidas até o fim da temporada")
+    
+    def replay_archive(self, archive=None):
+        """Reconstrói o banco a partir do arquivo de respostas, sem acessar a API"""
+        archive = archive or self.archive or ResponseArchive()
+        names = {code: name for name, code in self.leagues.items()}
+        total_records = total_written = 0
+        start = time.perf_counter()
         
-        for team in teams:
-            # Estatísticas como mandante
-            cursor.execute('''
-                SELECT 
-                    AVG(home_goals) as avg_goals_scored,
-                    AVG(away_goals) as avg_goals_conceded,
-                    SUM(CASE WHEN home_goals > away_goals THEN 1 ELSE 0 END) as wins,
-                    SUM(CASE WHEN home_goals = away_goals THEN 1 ELSE 0 END) as draws,
-                    SUM(CASE WHEN home_goals < away_goals THEN 1 ELSE 0 END) as losses
-                FROM games 
-                WHERE home_team = ? AND home_goals IS NOT NULL
-            ''', (team,))
+        for league_code in archive.leagues():
+            league_name = names.get(league_code, league_code)
+            records = written = 0
             
-            home_stats = cursor.fetchone()
+            # Respostas aplicadas na ordem em que foram coletadas
+            with self._writer() as conn:
+                for record in archive.records(league_code):
+                    _, count = self._ingest_matches(
+                        conn, league_name, league_code,
+                        record['date_from'], record['date_to'],
+                        record['payload'].get('matches', [])
+                    )
+                    records += 1
+                    written += count
             
-            # Estatísticas como visitante
-            cursor.execute('''
-                SELECT 
-                    AVG(away_goals) as avg_goals_scored,
-                    AVG(home_goals) as avg_goals_conceded,
-                    SUM(CASE WHEN away_goals > home_goals THEN 1 ELSE 0 END) as wins,
-                    SUM(CASE WHEN away_goals = home_goals THEN 1 ELSE 0 END) as draws,
-                    SUM(CASE WHEN away_goals < home_goals THEN 1 ELSE 0 END) as losses
-                FROM games 
-                WHERE away_team = ? AND away_goals IS NOT NULL
-            ''', (team,))
+            total_records += records
+            total_written += written
+            print(f"{league_name}: {records} respostas reaplicadas ({written} linhas gravadas)")
+        
+        print(f"Replay: {total_records} respostas, {total_written} linhas em {time.perf_counter() - start:.1f}s")
+        self.refresh_features()
+    
+    def get_today_matches(self, deadline=None):
+        """Busca jogos de hoje das ligas específicas em paralelo"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        deadline = self.today_deadline if deadline is None else deadline
+        all_matches = []
+        
+        # Uma consulta por liga, todas ao mesmo tempo; o cache só vai à API quando expira
+        executor = get_executor()
+        futures = {
+            league_code: executor.submit(self._cached_matches, league_code, today, deadline)
+            for league_code in self.leagues.values()
+        }
+        
+        # Ligas que não respondem dentro do prazo são ignoradas
+        done, pending = wait(futures.values(), timeout=deadline)
+        
+        for league_name, league_code in self.leagues.items():
+            future = futures[league_code]
             
-            away_stats = cursor.fetchone()
+            if future in pending:
+                future.cancel()
+                print(f"Tempo esgotado ao buscar jogos de hoje da {league_name}")
+                continue
             
-            # Combina estatísticas
-            if home_stats[0] and away_stats[0]:
-                avg_goals_scored = (home_stats[0] + away_stats[0]) / 2
-                avg_goals_conceded = (home_stats[1] + away_stats[1]) / 2
-                total_wins = (home_stats[2] or 0) + (away_stats[2] or 0)
-                total_draws = (home_stats[3] or 0) + (away_stats[3] or 0)
-                total_losses = (home_stats[4] or 0) + (away_stats[4] or 0)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO team_stats 
-                    (team_name, goals_scored, goals_conceded, wins, draws, losses, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    team, avg_goals_scored, avg_goals_conceded,
-                    total_wins, total_draws, total_losses,
-                    datetime.now().isoformat()
-                ))
-        
-        conn.commit()
-        conn.close()
+            try:
+                matches = future.result()
+            except Exception as e:
+                print(f"Erro ao buscar jogos de hoje da {league_name}: {e}")
+                continue
+            
+            for match in matches:
+                all_matches.append({
+                    'id': match['id'],
+                    'homeTeam': match['homeTeam']['name'],
+                    'awayTeam': match['awayTeam']['name'],
+                    'date': match['utcDate'],
+                    'competition': league_name,
+                    'league_code': league_code,
+                    'status': match['status']
+                })
+        
+        return all_matches
+    
+    def refresh_features(self):
+        """Gera nova versão do feature store se alguma partida mudou"""
+        try:
+            get_feature_store(self.db_path).refresh()
+        except Exception as e:
+            print(f"Erro ao atualizar o feature store: {e}")
+    
+    def update_team_stats(self, teams=None):
+        """Atualiza estatísticas dos times (todos, ou só os informados em teams)"""
+        if teams is not None and not teams:
+            print("Nenhum time alterado; estatísticas mantidas")
+            return
+        
+        with self._writer() as conn:
+            team_filter = ''
+            if teams is not None:
+                # Modo incremental: apenas os times tocados pela última ingestão
+                conn.execute('CREATE TEMP TABLE IF NOT EXISTS touched_teams (name TEXT PRIMARY KEY)')
+                conn.execute('DELETE FROM touched_teams')
+                conn.executemany('INSERT OR IGNORE INTO touched_teams VALUES (?)', [(t,) for t in teams])
+                team_filter = 'AND {column} IN (SELECT name FROM touched_teams)'
+            
+            # Uma única agregação sobre mandantes e visitantes; média casa/fora como antes
+            conn.execute(f'''
+                INSERT OR REPLACE INTO team_stats 
+                (team_name, goals_scored, goals_conceded, wins, draws, losses, last_updated)
+                SELECT 
+                    team,
+                    (AVG(CASE WHEN is_home THEN gf END) + AVG(CASE WHEN NOT is_home THEN gf END)) / 2,
+                    (AVG(CASE WHEN is_home THEN ga END) + AVG(CASE WHEN NOT is_home THEN ga END)) / 2,
+                    SUM(gf > ga),
+                    SUM(gf = ga),
+                    SUM(gf < ga),
+                    ?
+                FROM (
+                    SELECT home_team AS team, 1 AS is_home, home_goals AS gf, away_goals AS ga
+                    FROM games WHERE home_goals IS NOT NULL {team_filter.format(column='home_team')}
+                    UNION ALL
+                    SELECT away_team AS team, 0 AS is_home, away_goals AS gf, home_goals AS ga
+                    FROM games WHERE away_goals IS NOT NULL {team_filter.format(column='away_team')}
+                )
+                GROUP BY team
+                HAVING AVG(CASE WHEN is_home THEN gf END) IS NOT NULL
+                   AND AVG(CASE WHEN NOT is_home THEN gf END) IS NOT NULL
+            ''', (datetime.now().isoformat(),))
+        
         print("Estatísticas dos times atualizadas")
     
     def daily_update(self):
         """Atualização diária automática"""
         print(f"Iniciando atualização diária - {datetime.now()}")
-        self.collect_matches_by_leagues(days_back=7)  # Últimos 7 dias
-        self.update_team_stats()
+        self.collect_incremental()  # Só o que mudou desde a última coleta
+        self.update_team_stats(teams=self.touched_teams)
+        self.touched_teams.clear()
         print("Atualização concluída")
 
 def run_scheduler():
     """Executa o agendador"""
+    migrate()
     collector = DataCollector()
     
     # Agenda atualização diária às 6h
@@ -195,11 +507,18 @@ def run_scheduler():
         time.sleep(60)
 
 if __name__ == "__main__":
+    migrate()
     collector = DataCollector()
     
+    # Modo offline: python data_collector.py --replay
+    if '--replay' in sys.argv:
+        collector.replay_archive()
+        collector.update_team_stats()
+        sys.exit(0)
+    
     # Primeira coleta
     print("Fazendo coleta inicial das ligas específicas...")
-    collector.collect_matches_by_leagues(days_back=90)
+    collector.collect_incremental(days_back=90)
     collector.update_team_stats()
     
     # Inicia agendador
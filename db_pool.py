@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from migrations import DB_PATH
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path=None):
+    """Retorna o pool compartilhado pelo processo para o banco informado"""
+    db_path = db_path or DB_PATH
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = ConnectionPool(db_path)
+        return _pools[db_path]
+
+class ConnectionPool:
+    """Conexões SQLite reaproveitadas: várias de leitura e uma única de escrita
+
+    Leitores abrem o banco em modo somente leitura (URI mode=ro) e voltam ao
+    pool ao sair do bloco; cada conexão é usada por uma thread de cada vez.
+    O escritor é único por processo e serializado por um lock, como o SQLite
+    já exige; em WAL os leitores não esperam por ele.
+    """
+
+    def __init__(self, db_path=None, max_idle_readers=16, timeout=30.0,
+                 mmap_size=256 * 1024 * 1024, cache_kb=16 * 1024):
+        self.db_path = db_path or DB_PATH
+        self.max_idle_readers = max_idle_readers
+        self.timeout = timeout        # Espera (s) por locks do SQLite (busy_timeout)
+        self.mmap_size = mmap_size    # Bytes do arquivo lidos via mmap
+        self.cache_kb = cache_kb      # Cache de páginas por conexão (KiB)
+
+        self._idle = []               # Leitores livres (LIFO: o mais quente primeiro)
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_lock = threading.RLock()
+        self._writer_depth = 0        # Blocos writer() aninhados na mesma thread
+
+        self.metrics = {
+            'readers_opened': 0,
+            'reader_checkouts': 0,
+            'readers_in_use': 0,
+            'readers_peak': 0,
+            'writer_checkouts': 0,
+            'writer_wait_ms': 0.0,
+            'writer_wait_max_ms': 0.0,
+            'writer_hold_ms': 0.0
+        }
+
+    def _tune(self, conn):
+        conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+        conn.execute(f'PRAGMA cache_size = -{int(self.cache_kb)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+
+    def open_reader(self):
+        """Nova conexão somente leitura, fora do pool (ex.: leitores de longa duração)"""
+        uri = f'file:{quote(os.path.abspath(self.db_path))}?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        self._tune(conn)
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _open_writer(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        self._tune(conn)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Conexão de leitura emprestada do pool durante o bloco"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self.metrics['reader_checkouts'] += 1
+            self.metrics['readers_in_use'] += 1
+            self.metrics['readers_peak'] = max(self.metrics['readers_peak'], self.metrics['readers_in_use'])
+
+        try:
+            if conn is None:
+                conn = self.open_reader()
+                with self._lock:
+                    self.metrics['readers_opened'] += 1
+            yield conn
+        finally:
+            # Não devolve snapshot de leitura aberto para a próxima thread
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self.metrics['readers_in_use'] -= 1
+                if conn is not None and len(self._idle) < self.max_idle_readers:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    @contextmanager
+    def writer(self):
+        """Conexão única de escrita; confirma ao sair do bloco externo ou desfaz em caso de erro"""
+        start = time.perf_counter()
+        with self._writer_lock:
+            acquired = time.perf_counter()
+            if self._writer is None:
+                self._writer = self._open_writer()
+            conn = self._writer
+
+            wait_ms = (acquired - start) * 1000
+            with self._lock:
+                self.metrics['writer_checkouts'] += 1
+                self.metrics['writer_wait_ms'] += wait_ms
+                self.metrics['writer_wait_max_ms'] = max(self.metrics['writer_wait_max_ms'], wait_ms)
+
+            self._writer_depth += 1
+            try:
+                yield conn
+                if self._writer_depth == 1:
+                    conn.commit()
+            except BaseException:
+                if self._writer_depth == 1:
+                    conn.rollback()
+                raise
+            finally:
+                self._writer_depth -= 1
+                with self._lock:
+                    self.metrics['writer_hold_ms'] += (time.perf_counter() - acquired) * 1000
+
+    def stats(self):
+        """Contadores do pool (tempos em ms)"""
+        with self._lock:
+            stats = dict(self.metrics, readers_idle=len(self._idle), db_path=self.db_path)
+        for key in ('writer_wait_ms', 'writer_wait_max_ms', 'writer_hold_ms'):
+            stats[key] = round(stats[key], 2)
+        return stats
+
+    def close(self):
+        """Fecha as conexões ociosas e a de escrita"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
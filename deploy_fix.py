@@ -13,18 +13,18 @@ if __name__ == "__main__":
     init_db()
     
     # Popula com dados de exemplo se necessário
-    import sqlite3
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM games')
-    game_count = cursor.fetchone()[0]
+    from db_pool import get_pool
+    with get_pool().reader() as conn:
+        game_count = conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
     
     if game_count == 0:
         print("📊 Populando dados de exemplo...")
         from sample_data import populate_sample_data
         populate_sample_data()
     
-    conn.close()
+    # Servidor já aceita conexões; /ready responde 503 até o aquecimento terminar
+    from warmup import warm_up_in_background
+    warm_up_in_background()
     
     print("✅ Sistema pronto!")
     
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Reconstrução versionada das tabelas derivadas de games (h2h, team_form, ratings)
+
+As migrações só criam as tabelas; o conteúdo depende do código que o
+calcula (janelas de forma, K do Elo...). Cada tabela tem uma versão que
+inclui esses parâmetros, gravada em derived_versions; quando a versão do
+código difere da gravada, a tabela é refeita inteira a partir de games.
+
+Uso: python derived_tables.py [--force] [h2h team_form ratings]
+"""
+
+import argparse
+import sqlite3
+from datetime import datetime
+
+from elo import ELO_VERSION, replay_ratings
+from form_table import FORM_VERSION, refresh_form
+from h2h_matrix import H2H_VERSION, refresh_h2h
+
+# (nome, versão do código, reconstrução completa)
+DERIVED_TABLES = [
+    ('h2h', H2H_VERSION, refresh_h2h),
+    ('team_form', FORM_VERSION, refresh_form),
+    ('ratings', ELO_VERSION, replay_ratings),
+]
+
+def stored_versions(conn):
+    """{tabela: versão com que foi construída}"""
+    return dict(conn.execute('SELECT name, version FROM derived_versions'))
+
+def rebuild_derived(conn, names=None, force=False, verbose=False):
+    """Refaz as tabelas desatualizadas (ou todas as de names, com force); retorna as refeitas
+
+    Cada tabela é refeita em uma transação própria, junto com a sua versão.
+    """
+    stored = stored_versions(conn)
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+
+    rebuilt = []
+    try:
+        for name, version, rebuild in DERIVED_TABLES:
+            if names is not None and name not in names:
+                continue
+            if not force and stored.get(name) == version:
+                continue
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rebuild(conn)
+                conn.execute(
+                    'INSERT OR REPLACE INTO derived_versions (name, version, rebuilt_at) VALUES (?, ?, ?)',
+                    (name, version, datetime.now().isoformat())
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+            rebuilt.append(name)
+            if verbose:
+                print(f"Tabela {name} refeita (versão {version})")
+        return rebuilt
+    finally:
+        conn.isolation_level = previous_isolation
+
+if __name__ == "__main__":
+    from migrations import DB_PATH, migrate
+
+    parser = argparse.ArgumentParser(description='Reconstrói as tabelas derivadas de games')
+    parser.add_argument('names', nargs='*', help='tabelas (padrão: todas)')
+    parser.add_argument('--force', action='store_true', help='refaz mesmo com a versão em dia')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    migrate(conn, rebuild=False)
+    rebuilt = rebuild_derived(conn, args.names or None, args.force, verbose=True)
+    print(f"{len(rebuilt)} tabela(s) refeita(s)")
+    conn.close()
@@ -0,0 +1,174 @@
+ELO_START = 1500.0  # Rating de um time sem partidas
+ELO_K = 20.0        # Peso de cada partida
+ELO_HOME = 60.0     # Vantagem de jogar em casa, em pontos de rating
+
+# Versão das tabelas de ratings: muda com a fórmula ou os parâmetros (derived_tables.py refaz)
+ELO_VERSION = f'1:start={ELO_START}:k={ELO_K}:home={ELO_HOME}'
+
+_BATCH = 1000       # Linhas por executemany ao reprocessar
+
+def expected_home(home_rating, away_rating, home_advantage=ELO_HOME):
+    """Pontuação esperada do mandante (vitória = 1, empate = 0.5)"""
+    return 1 / (1 + 10 ** ((away_rating - home_rating - home_advantage) / 400))
+
+def goal_multiplier(goal_diff):
+    """Peso extra por saldo de gols (fórmula do World Football Elo)"""
+    goal_diff = abs(goal_diff)
+    if goal_diff <= 1:
+        return 1.0
+    if goal_diff == 2:
+        return 1.5
+    return (11 + goal_diff) / 8
+
+def rate_match(home_rating, away_rating, home_goals, away_goals):
+    """(esperado do mandante, novo rating do mandante, novo rating do visitante)"""
+    expected = expected_home(home_rating, away_rating)
+    score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+    delta = ELO_K * goal_multiplier(home_goals - away_goals) * (score - expected)
+    return expected, home_rating + delta, away_rating - delta
+
+def _insert_match_ratings(conn, rows):
+    conn.executemany('''
+        INSERT OR REPLACE INTO match_ratings
+        (match_id, date, home_team, away_team, home_rating_before, away_rating_before,
+         home_rating_after, away_rating_after, expected_home)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+def _rebuild_team_ratings(conn):
+    """team_ratings a partir da última partida de cada time em match_ratings"""
+    conn.execute('DELETE FROM team_ratings')
+    conn.execute('''
+        INSERT INTO team_ratings (team, rating, games, last_date, last_match_id)
+        SELECT team, rating, games, date, match_id FROM (
+            SELECT team, rating, date, match_id,
+                   COUNT(*) OVER (PARTITION BY team) AS games,
+                   ROW_NUMBER() OVER (PARTITION BY team ORDER BY date DESC, match_id DESC) AS rn
+            FROM (
+                SELECT home_team AS team, home_rating_after AS rating, date, match_id FROM match_ratings
+                UNION ALL
+                SELECT away_team, away_rating_after, date, match_id FROM match_ratings
+            )
+        ) WHERE rn = 1
+    ''')
+
+def replay_ratings(conn, date_from=''):
+    """Reprocessa as partidas a partir de date_from em ordem de data ('' = todas); retorna quantas
+
+    Os ratings de partida são uma cadeia: corrigir um resultado muda todos os
+    seguintes, então tudo a partir da data é refeito. Não abre transação.
+    """
+    # Estado de cada time antes de date_from: rating após sua última partida anterior
+    ratings = dict(conn.execute('''
+        SELECT team, rating FROM (
+            SELECT team, rating, ROW_NUMBER() OVER (PARTITION BY team ORDER BY date DESC, match_id DESC) AS rn
+            FROM (
+                SELECT home_team AS team, home_rating_after AS rating, date, match_id
+                FROM match_ratings WHERE date < ?
+                UNION ALL
+                SELECT away_team, away_rating_after, date, match_id
+                FROM match_ratings WHERE date < ?
+            )
+        ) WHERE rn = 1
+    ''', (date_from, date_from)))
+    conn.execute('DELETE FROM match_ratings WHERE date >= ?', (date_from,))
+
+    # Uma passada em ordem de data; o cursor é lido aos poucos
+    games = conn.execute('''
+        SELECT id, date, home_team, away_team, home_goals, away_goals FROM games
+        WHERE date >= ? AND home_goals IS NOT NULL AND away_goals IS NOT NULL AND home_team <> away_team
+        ORDER BY date, id
+    ''', (date_from,))
+
+    rows, count = [], 0
+    for match_id, date, home, away, home_goals, away_goals in games:
+        count += 1
+        home_before = ratings.get(home, ELO_START)
+        away_before = ratings.get(away, ELO_START)
+        expected, ratings[home], ratings[away] = rate_match(home_before, away_before, home_goals, away_goals)
+        rows.append((match_id, date, home, away, home_before, away_before, ratings[home], ratings[away], expected))
+        if len(rows) >= _BATCH:
+            _insert_match_ratings(conn, rows)
+            rows = []
+    _insert_match_ratings(conn, rows)
+
+    _rebuild_team_ratings(conn)
+    return count
+
+def update_ratings(conn, match_ids):
+    """Atualiza os ratings após gravar as partidas informadas
+
+    Partida nova, encerrada e posterior à última de cada um dos dois times é
+    aplicada em O(1). Correções de partidas já pontuadas, ou resultados que
+    chegam fora de ordem, reprocessam a partir da data mais antiga afetada.
+    """
+    current, rated = [], {}
+    for i in range(0, len(match_ids), _BATCH):
+        batch = list(match_ids[i:i + _BATCH])
+        placeholders = ','.join('?' * len(batch))
+        current.extend(conn.execute(f'''
+            SELECT id, date, home_team, away_team, home_goals, away_goals FROM games
+            WHERE id IN ({placeholders}) AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+              AND home_team <> away_team
+        ''', batch))
+        rated.update(conn.execute(
+            f'SELECT match_id, date FROM match_ratings WHERE match_id IN ({placeholders})', batch
+        ))
+    current.sort(key=lambda row: (row[1], row[0]))
+    new_dates = {row[0]: row[1] for row in current}
+
+    # Já pontuadas: resultado, data ou times mudaram (ou a partida deixou de estar encerrada)
+    replay_from = [min(date, new_dates.get(match_id, date)) for match_id, date in rated.items()]
+
+    last = {}
+    def last_key(team):
+        if team not in last:
+            row = conn.execute('SELECT last_date, last_match_id, rating FROM team_ratings WHERE team = ?',
+                               (team,)).fetchone()
+            last[team] = row if row else ('', -1, ELO_START)
+        return last[team][:2]
+
+    appendable = []
+    for row in current:
+        match_id, date, home, away = row[:4]
+        if match_id in rated:
+            continue
+        if last_key(home) < (date, match_id) and last_key(away) < (date, match_id):
+            appendable.append(row)
+            last[home] = last[away] = (date, match_id, None)  # Marca a ordem; o rating vem depois
+        else:
+            replay_from.append(date)
+
+    start = min(replay_from) if replay_from else None
+    for match_id, date, home, away, home_goals, away_goals in appendable:
+        if start is not None and date >= start:
+            continue  # Será refeita pelo reprocessamento
+        home_before, away_before = _current_rating(conn, home), _current_rating(conn, away)
+        expected, home_after, away_after = rate_match(home_before, away_before, home_goals, away_goals)
+        _insert_match_ratings(conn, [(match_id, date, home, away, home_before, away_before,
+                                      home_after, away_after, expected)])
+        for team, rating in ((home, home_after), (away, away_after)):
+            conn.execute('''
+                INSERT INTO team_ratings (team, rating, games, last_date, last_match_id)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT (team) DO UPDATE SET
+                    rating = excluded.rating, games = games + 1,
+                    last_date = excluded.last_date, last_match_id = excluded.last_match_id
+            ''', (team, rating, date, match_id))
+
+    if start is not None:
+        replay_ratings(conn, start)
+
+def _current_rating(conn, team):
+    row = conn.execute('SELECT rating FROM team_ratings WHERE team = ?', (team,)).fetchone()
+    return row[0] if row else ELO_START
+
+def team_ratings(conn, teams):
+    """{time: rating atual}; times sem partidas ficam com ELO_START"""
+    teams = list(teams)
+    if not teams:
+        return {}
+    ratings = dict(conn.execute(
+        f'SELECT team, rating FROM team_ratings WHERE team IN ({",".join("?" * len(teams))})', teams
+    ))
+    return {team: ratings.get(team, ELO_START) for team in teams}
@@ -11,44 +11,44 @@ class EnsemblePredictor:
         
     def predict_match_ensemble(self, home_team, away_team):
         """Combina previsões de múltiplos modelos"""
-        predictions = {}
-        weights = {}
-        
-        # Análise estatística (peso: 0.3)
-        try:
-            stats_pred = self.stats_analyzer.calculate_match_probabilities(home_team, away_team)
-            predictions['stats'] = stats_pred
-            weights['stats'] = 0.3
-        except:
-            pass
-        
-        # Rede Neural (peso: 0.4)
-        try:
-            neural_pred = self.neural_predictor.predict_match(home_team, away_team)
-            if neural_pred:
-                predictions['neural'] = neural_pred
-                weights['neural'] = 0.4
-        except:
-            pass
-        
-        # Random Forest (peso: 0.3)
-        try:
-            ml_pred = self.ml_predictor.predict_match(home_team, away_team)
-            if ml_pred:
-                predictions['ml'] = ml_pred
-                weights['ml'] = 0.3
-        except:
-            pass
-        
-        if not predictions:
-            return self._default_prediction()
-        
-        # Combina previsões
-        ensemble_result = self._combine_predictions(predictions, weights)
-        ensemble_result['models_used'] = list(predictions.keys())
-        ensemble_result['ensemble_confidence'] = self._calculate_ensemble_confidence(predictions)
-        
-        return ensemble_result
+        return self.predict_matches_ensemble([(home_team, away_team)])[0]
+    
+    def predict_matches_ensemble(self, pairs):
+        """Combina previsões de múltiplos modelos para vários confrontos (um lote por modelo)"""
+        pairs = list(pairs)
+        model_predictions = {}
+        
+        # Análise estatística (peso: 0.3), Rede Neural (peso: 0.4), Random Forest (peso: 0.3)
+        for name, weight, predict in (
+            ('stats', 0.3, self.stats_analyzer.calculate_match_probabilities_batch),
+            ('neural', 0.4, self.neural_predictor.predict_matches),
+            ('ml', 0.3, self.ml_predictor.predict_matches),
+        ):
+            try:
+                model_predictions[name] = (weight, predict(pairs))
+            except:
+                pass
+        
+        results = []
+        for i in range(len(pairs)):
+            predictions = {}
+            weights = {}
+            for name, (weight, batch) in model_predictions.items():
+                if batch[i]:
+                    predictions[name] = batch[i]
+                    weights[name] = weight
+            
+            if not predictions:
+                results.append(self._default_prediction())
+                continue
+            
+            # Combina previsões
+            ensemble_result = self._combine_predictions(predictions, weights)
+            ensemble_result['models_used'] = list(predictions.keys())
+            ensemble_result['ensemble_confidence'] = self._calculate_ensemble_confidence(predictions)
+            results.append(ensemble_result)
+        
+        return results
     
     def _combine_predictions(self, predictions, weights):
         """Combina previsões usando média ponderada"""
@@ -121,9 +121,7 @@ class EnsemblePredictor:
         
         best_predictions = []
         
-        for home_team, away_team in matches:
-            pred = self.predict_match_ensemble(home_team, away_team)
-            
+        for (home_team, away_team), pred in zip(matches, self.predict_matches_ensemble(matches)):
             if pred:
                 # Determina melhor aposta
                 best_bet = self._determine_best_bet(pred)
@@ -0,0 +1,321 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+from db_pool import get_pool
+from elo import ELO_START, ELO_VERSION
+from form_table import FORM_VERSION
+from migrations import DB_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+FEATURE_STORE = os.getenv('FEATURE_STORE')  # Padrão: pasta feature_store ao lado do banco
+FORM_WINDOW = 5  # Janela de team_form usada nas features (uma de FORM_WINDOWS)
+KEEP_VERSIONS = 2  # Versões mantidas em disco; a anterior nunca é apagada (leitores ainda a usam)
+
+# Estado de um time antes de cada partida; a linha de uma partida é mandante + visitante
+TEAM_FEATURES = [
+    'avg_goals', 'avg_conceded', 'wins',
+    'form_points', 'form_goals_for', 'form_goals_against',
+    'elo',
+]
+FEATURE_NAMES = [f'{side}_{name}' for side in ('home', 'away') for name in TEAM_FEATURES]
+
+def store_path(db_path=None):
+    """Pasta do feature store de um banco: FEATURE_STORE ou <pasta do banco>/feature_store"""
+    if FEATURE_STORE:
+        return FEATURE_STORE
+    return os.path.join(os.path.dirname(os.path.abspath(db_path or DB_PATH)), 'feature_store')
+
+class _TeamState:
+    """Acumuladores de um time: médias casa/fora, vitórias, forma e rating após a última partida"""
+    __slots__ = ('home_gf', 'home_ga', 'home_n', 'away_gf', 'away_ga', 'away_n', 'wins', 'form', 'elo')
+
+    def __init__(self):
+        self.home_gf = self.home_ga = self.home_n = 0
+        self.away_gf = self.away_ga = self.away_n = 0
+        self.wins = 0
+        self.form = (0, 0, 0)
+        self.elo = None
+
+    def features(self, elo_default):
+        # Mesma média de team_stats: (média em casa + média fora) / 2, só com o que já houver
+        averages = [(gf / n, ga / n) for gf, ga, n in
+                    ((self.home_gf, self.home_ga, self.home_n), (self.away_gf, self.away_ga, self.away_n)) if n]
+        avg_goals = sum(a for a, _ in averages) / len(averages) if averages else 0.0
+        avg_conceded = sum(c for _, c in averages) / len(averages) if averages else 0.0
+        return (avg_goals, avg_conceded, self.wins) + self.form + (
+                self.elo if self.elo is not None else elo_default,)
+
+    def add(self, is_home, gf, ga, form_after, elo_after):
+        if is_home:
+            self.home_gf, self.home_ga, self.home_n = self.home_gf + gf, self.home_ga + ga, self.home_n + 1
+        else:
+            self.away_gf, self.away_ga, self.away_n = self.away_gf + gf, self.away_ga + ga, self.away_n + 1
+        self.wins += gf > ga
+        if form_after[0] is not None:
+            self.form = form_after
+        if elo_after is not None:
+            self.elo = elo_after
+
+def _source_version(conn):
+    """Marca da tabela games: muda a cada partida gravada"""
+    return conn.execute('SELECT COALESCE(MAX(change_seq), 0), COUNT(*) FROM games').fetchone()
+
+def _is_current(manifest, source, db_path):
+    """A versão ativa foi gerada deste banco, neste estado de games e com as mesmas tabelas derivadas"""
+    return (manifest['source'] == source
+            and manifest.get('source_db') == os.path.abspath(db_path)
+            and manifest.get('form_version') == FORM_VERSION
+            and manifest.get('elo_version') == ELO_VERSION)
+
+def build_features(conn):
+    """Uma passada em ordem de data: features de cada partida encerrada antes do apito inicial
+
+    Retorna (colunas, times); team_state tem o estado de cada time após sua
+    última partida, para montar confrontos futuros. Forma e Elo vêm de
+    team_form e match_ratings (valores após cada partida, que valem para a
+    seguinte do time). Nada depois da data da partida entra na sua linha.
+    """
+    games = conn.execute('''
+        SELECT g.id, g.date, g.home_team, g.away_team, g.home_goals, g.away_goals,
+               hf.points, hf.goals_for, hf.goals_against,
+               af.points, af.goals_for, af.goals_against,
+               mr.home_rating_after, mr.away_rating_after
+        FROM games g
+        LEFT JOIN team_form hf ON hf.team = g.home_team AND hf.window_size = ?
+                              AND hf.date = g.date AND hf.match_id = g.id
+        LEFT JOIN team_form af ON af.team = g.away_team AND af.window_size = ?
+                              AND af.date = g.date AND af.match_id = g.id
+        LEFT JOIN match_ratings mr ON mr.match_id = g.id
+        WHERE g.home_goals IS NOT NULL AND g.away_goals IS NOT NULL AND g.home_team <> g.away_team
+        ORDER BY g.date, g.id
+    ''', (FORM_WINDOW, FORM_WINDOW)).fetchall()
+
+    states = defaultdict(_TeamState)
+    rows, match_ids, dates, home_goals, away_goals = [], [], [], [], []
+    for match_id, date, home, away, hg, ag, *form, home_elo, away_elo in games:
+        home_state, away_state = states[home], states[away]
+        rows.append(home_state.features(ELO_START) + away_state.features(ELO_START))
+        match_ids.append(match_id)
+        dates.append(date[:10])
+        home_goals.append(hg)
+        away_goals.append(ag)
+        home_state.add(True, hg, ag, tuple(form[:3]), home_elo)
+        away_state.add(False, ag, hg, tuple(form[3:]), away_elo)
+
+    teams = sorted(states)
+    columns = {
+        'features': np.array(rows, dtype=np.float64).reshape(-1, len(FEATURE_NAMES)),
+        'match_id': np.array(match_ids, dtype=np.int64),
+        'date': np.array(dates, dtype='datetime64[D]'),
+        'home_goals': np.array(home_goals, dtype=np.int16),
+        'away_goals': np.array(away_goals, dtype=np.int16),
+        'team_state': np.array([states[team].features(ELO_START) for team in teams],
+                               dtype=np.float64).reshape(-1, len(TEAM_FEATURES)),
+    }
+    return columns, teams
+
+@contextmanager
+def _exclusive(path):
+    """Trava entre processos: uma geração de versão por vez no diretório"""
+    with open(os.path.join(path, '.lock'), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield  # Fechar o arquivo solta a trava
+
+class FeatureStore:
+    """Matrizes de features versionadas em disco (.npy mapeados em memória + manifest.json)
+
+    Um store por banco (padrão: <pasta do banco>/feature_store). Cada versão
+    fica em <path>/vNNNNNN; o arquivo CURRENT aponta para a ativa e é trocado
+    atomicamente, então leitores nunca veem uma versão pela metade. Leituras
+    são fatias dos arrays mapeados, sem cópia; CURRENT só é relido quando seu
+    stat muda.
+    """
+
+    def __init__(self, db_path=None, path=None):
+        self.db_path = db_path or DB_PATH
+        self.path = path or store_path(self.db_path)
+        self._lock = threading.Lock()
+        self._loaded = None  # (stat de CURRENT, manifest, arrays)
+
+    def _pointer(self):
+        """(mtime_ns, inode) de CURRENT, que muda a cada troca de versão; None sem versão"""
+        try:
+            st = os.stat(os.path.join(self.path, 'CURRENT'))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_ino)
+
+    def _current_name(self):
+        try:
+            with open(os.path.join(self.path, 'CURRENT')) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        """Manifest e arrays da versão ativa, remapeados só quando CURRENT muda"""
+        pointer = self._pointer()
+        loaded = self._loaded
+        if loaded is not None and loaded[0] == pointer:
+            return loaded
+        with self._lock:
+            if self._loaded is not None and self._loaded[0] == pointer:
+                return self._loaded
+            name = self._current_name() if pointer is not None else None
+            if name is None:
+                self._loaded = (pointer, None, None)
+                return self._loaded
+            if self._loaded is not None and self._loaded[1] is not None and self._loaded[1]['version'] == name:
+                self._loaded = (pointer,) + self._loaded[1:]
+                return self._loaded
+            directory = os.path.join(self.path, name)
+            with open(os.path.join(directory, 'manifest.json')) as f:
+                manifest = json.load(f)
+            arrays = {
+                column: np.load(os.path.join(directory, f'{column}.npy'), mmap_mode='r')
+                for column in manifest['columns']
+            }
+            manifest['team_index'] = {team: i for i, team in enumerate(manifest['teams'])}
+            self._loaded = (pointer, manifest, arrays)
+            return self._loaded
+
+    @property
+    def manifest(self):
+        return self._load()[1]
+
+    def available(self):
+        return self.manifest is not None
+
+    def refresh(self, force=False):
+        """Gera uma versão nova se não há nenhuma ou se está defasada; retorna o manifest ativo
+
+        Defasada: games mudou, as versões de team_form/Elo mudaram ou a versão
+        veio de outro banco. Processos que ingerem ao mesmo tempo se revezam na
+        trava do diretório; quem chega depois vê a versão nova e não gera outra igual.
+        """
+        current = self.manifest
+        if not force and current is not None:
+            with get_pool(self.db_path).reader() as conn:
+                if _is_current(current, list(_source_version(conn)), self.db_path):
+                    return current
+
+        os.makedirs(self.path, exist_ok=True)
+        with _exclusive(self.path):
+            with get_pool(self.db_path).reader() as conn:
+                source = list(_source_version(conn))
+                current = self.manifest
+                if not force and current is not None and _is_current(current, source, self.db_path):
+                    return current
+                columns, teams = build_features(conn)
+
+            versions = sorted(d for d in os.listdir(self.path) if d.startswith('v'))
+            name = f'v{int(versions[-1][1:]) + 1 if versions else 1:06d}'
+
+            # Escrita em pasta temporária; a versão só aparece com o nome final, completa
+            building = tempfile.mkdtemp(prefix='.building-', dir=self.path)
+            os.chmod(building, 0o755)  # mkdtemp cria só para o dono
+            for column, values in columns.items():
+                np.save(os.path.join(building, f'{column}.npy'), values)
+            manifest = {
+                'version': name,
+                'created_at': datetime.now().isoformat(),
+                'source': source,
+                'source_db': os.path.abspath(self.db_path),
+                'form_version': FORM_VERSION,
+                'form_window': FORM_WINDOW,
+                'elo_version': ELO_VERSION,
+                'rows': int(len(columns['match_id'])),
+                'feature_names': FEATURE_NAMES,
+                'team_features': TEAM_FEATURES,
+                'teams': teams,
+                'columns': {column: {'dtype': str(values.dtype), 'shape': list(values.shape)}
+                            for column, values in columns.items()},
+            }
+            with open(os.path.join(building, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=1)
+            os.rename(building, os.path.join(self.path, name))
+
+            # Troca atômica do ponteiro; versões antigas saem depois, menos a que estava ativa
+            previous = self._current_name()
+            pointer = os.path.join(self.path, 'CURRENT.tmp')
+            with open(pointer, 'w') as f:
+                f.write(name)
+            os.replace(pointer, os.path.join(self.path, 'CURRENT'))
+            for old in versions[:max(0, len(versions) + 1 - KEEP_VERSIONS)]:
+                if old != previous:
+                    shutil.rmtree(os.path.join(self.path, old), ignore_errors=True)
+
+        print(f"Feature store {name}: {manifest['rows']} partidas, {len(teams)} times")
+        return self.manifest
+
+    def column(self, name):
+        """Array mapeado de uma coluna (features, match_id, date, home_goals, away_goals, team_state)"""
+        return self._load()[2][name]
+
+    def arrays(self):
+        """Todas as colunas de uma mesma versão"""
+        return self._load()[2]
+
+    def training_matrix(self, feature_names=None, date_from=None, date_to=None):
+        """(X, gols do mandante, gols do visitante, datas) das partidas em [date_from, date_to)
+
+        As partidas estão em ordem de data, então o intervalo é uma fatia
+        contígua; sem feature_names (ou com todas na ordem) X é uma view do mmap.
+        """
+        arrays = self.arrays()
+        dates = arrays['date']
+        start = np.searchsorted(dates, np.datetime64(date_from, 'D')) if date_from else 0
+        stop = np.searchsorted(dates, np.datetime64(date_to, 'D')) if date_to else len(dates)
+        X = arrays['features'][start:stop]
+        if feature_names is not None and list(feature_names) != FEATURE_NAMES:
+            X = X[:, [FEATURE_NAMES.index(name) for name in feature_names]]
+        return X, arrays['home_goals'][start:stop], arrays['away_goals'][start:stop], dates[start:stop]
+
+    def matches_features(self, pairs, feature_names=None):
+        """(matriz, índices) dos confrontos futuros com os dois times no store, na ordem de pairs
+
+        Cada linha junta o estado atual do mandante e do visitante; índices diz
+        a posição em pairs de cada linha (confrontos com time desconhecido ficam de fora).
+        """
+        _, manifest, arrays = self._load()
+        width = len(feature_names) if feature_names is not None else len(FEATURE_NAMES)
+        if manifest is None:
+            return np.empty((0, width)), []
+        index = manifest['team_index']
+        found = [i for i, (home, away) in enumerate(pairs) if home in index and away in index]
+        state = arrays['team_state']
+        home_rows = state[[index[pairs[i][0]] for i in found]]
+        away_rows = state[[index[pairs[i][1]] for i in found]]
+        matrix = np.hstack((home_rows, away_rows)).reshape(len(found), len(FEATURE_NAMES))
+        if feature_names is not None:
+            matrix = matrix[:, [FEATURE_NAMES.index(name) for name in feature_names]]
+        return matrix, found
+
+    def match_features(self, home_team, away_team, feature_names=None):
+        """Linha de features de um confronto futuro com o estado atual dos times (None se faltar um time)"""
+        matrix, found = self.matches_features([(home_team, away_team)], feature_names)
+        return matrix if found else None
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_feature_store(db_path=None):
+    """FeatureStore compartilhado do processo para o banco informado"""
+    db_path = db_path or DB_PATH
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = FeatureStore(db_path)
+        return _stores[db_path]
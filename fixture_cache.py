@@ -0,0 +1,99 @@
+import threading
+import time
+
+class FixtureCache:
+    """Cache com TTL para respostas da API, compartilhado entre requisições"""
+
+    def __init__(self, ttl=300, stale_ttl=1800):
+        self.ttl = ttl              # Tempo (s) em que a entrada é considerada fresca
+        self.stale_ttl = stale_ttl  # Tempo extra (s) em que a entrada velha ainda é servida
+
+        self._entries = {}   # chave -> (valor, momento da carga)
+        self._inflight = {}  # chave -> threading.Event da carga em andamento
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def get(self, key, loader, timeout=None):
+        """Retorna valor da chave, carregando com loader() quando necessário"""
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry[1] if entry else None
+
+            # Entrada fresca
+            if entry and age < self.ttl:
+                self.hits += 1
+                return entry[0]
+
+            # Entrada velha: serve imediatamente e atualiza em segundo plano
+            if entry and age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._inflight[key] = threading.Event()
+                    threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+                return entry[0]
+
+            self.misses += 1
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        # Apenas uma thread recarrega; as demais aguardam o resultado.
+        # Se a carga falhar, a entrada expirada (se houver) ainda é servida
+        if leader:
+            self._refresh(key, loader, raise_errors=entry is None)
+        elif not event.wait(timeout):
+            raise TimeoutError(f'Tempo esgotado aguardando carga de {key}')
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise LookupError(f'Falha ao carregar {key}')
+        return entry[0]
+
+    def _refresh(self, key, loader, raise_errors=False):
+        """Executa loader() e publica o resultado para quem estiver aguardando"""
+        try:
+            value = loader()
+            with self._lock:
+                self._entries[key] = (value, time.monotonic())
+                self.refreshes += 1
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            if raise_errors:
+                raise
+        finally:
+            with self._lock:
+                event = self._inflight.pop(key, None)
+            if event:
+                event.set()
+
+    def invalidate(self, key=None):
+        """Remove uma chave (ou todas) do cache"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                'ttl': self.ttl,
+                'stale_ttl': self.stale_ttl
+            }
@@ -0,0 +1,90 @@
+from itertools import groupby
+
+import numpy as np
+
+FORM_WINDOWS = (3, 5, 10)  # Janelas (em jogos) materializadas em team_form
+
+# Versão de team_form: muda com o cálculo ou as janelas (derived_tables.py refaz)
+FORM_VERSION = '1:windows=' + ','.join(map(str, FORM_WINDOWS))
+
+# Partidas encerradas na perspectiva de cada time
+_TEAM_GAMES = '''
+    SELECT home_team AS team, id, date, home_goals AS gf, away_goals AS ga
+    FROM games WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL {home_filter}
+    UNION ALL
+    SELECT away_team AS team, id, date, away_goals AS gf, home_goals AS ga
+    FROM games WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL {away_filter}
+'''
+
+def _rolling_rows(team, matches, skip=0):
+    """Linhas de team_form para matches [(id, data, gp, gc)] em ordem; as skip primeiras só servem de base"""
+    if len(matches) <= skip:
+        return []
+    gf = np.array([m[2] for m in matches], dtype=np.int64)
+    ga = np.array([m[3] for m in matches], dtype=np.int64)
+    points = 3 * (gf > ga) + (gf == ga)
+
+    # Somas acumuladas: janela [i - w + 1, i] = c[i + 1] - c[max(0, i + 1 - w)]
+    cum = {name: np.concatenate(([0], np.cumsum(values)))
+           for name, values in (('points', points), ('gf', gf), ('ga', ga))}
+    end = np.arange(1, len(matches) + 1)
+
+    rows = []
+    for window in FORM_WINDOWS:
+        start = np.maximum(0, end - window)
+        sums = {name: (c[end] - c[start]).tolist() for name, c in cum.items()}
+        games = (end - start).tolist()
+        for i in range(skip, len(matches)):
+            match_id, date = matches[i][0], matches[i][1]
+            rows.append((team, window, date, match_id,
+                         sums['points'][i], sums['gf'][i], sums['ga'][i], games[i]))
+    return rows
+
+def _insert(conn, rows):
+    conn.executemany('''
+        INSERT OR REPLACE INTO team_form
+        (team, window_size, date, match_id, points, goals_for, goals_against, games)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+def refresh_form(conn, since=None):
+    """Recalcula team_form a partir de games
+
+    since: {time: data} com a partida alterada mais antiga de cada time; só as
+    linhas a partir dessa data são refeitas. None refaz a tabela inteira. Não
+    abre transação: quem chama grava partidas e forma juntas.
+    """
+    if since is None:
+        conn.execute('DELETE FROM team_form')
+        games = conn.execute(_TEAM_GAMES.format(home_filter='', away_filter='') + ' ORDER BY team, date, id')
+        for team, matches in groupby(games, key=lambda g: g[0]):
+            _insert(conn, _rolling_rows(team, [m[1:] for m in matches]))
+        return
+
+    seed = max(FORM_WINDOWS) - 1
+    for team, date in since.items():
+        # Jogos anteriores que ainda entram nas janelas das linhas refeitas
+        before = conn.execute(
+            _TEAM_GAMES.format(home_filter='AND home_team = ? AND date < ?', away_filter='AND away_team = ? AND date < ?')
+            + ' ORDER BY date DESC, id DESC LIMIT ?',
+            (team, date, team, date, seed)
+        ).fetchall()[::-1]
+        after = conn.execute(
+            _TEAM_GAMES.format(home_filter='AND home_team = ? AND date >= ?', away_filter='AND away_team = ? AND date >= ?')
+            + ' ORDER BY date, id',
+            (team, date, team, date)
+        ).fetchall()
+
+        conn.execute('DELETE FROM team_form WHERE team = ? AND date >= ?', (team, date))
+        matches = [m[1:] for m in before + after]
+        _insert(conn, _rolling_rows(team, matches, skip=len(before)))
+
+def form_as_of(conn, team, window=5, before=None):
+    """(pontos, gols pró, gols contra, jogos) nas últimas window partidas antes de before (ou as mais recentes)"""
+    date_filter = 'AND date < ?' if before is not None else ''
+    params = (team, window, before) if before is not None else (team, window)
+    return conn.execute(f'''
+        SELECT points, goals_for, goals_against, games FROM team_form
+        WHERE team = ? AND window_size = ? {date_filter}
+        ORDER BY date DESC, match_id DESC LIMIT 1
+    ''', params).fetchone()
@@ -0,0 +1,20 @@
+# Configuração do gunicorn: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Com preload_app o mestre importa wsgi.py (que aquece modelos, índice e
+# caches), só então abre o socket e cria os workers, que compartilham essa
+# memória por copy-on-write. GUNICORN_PRELOAD=0 volta ao modo em que cada
+# worker carrega tudo sozinho: aceita conexões logo e aquece em segundo
+# plano, com /ready em 503 até terminar.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 120
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+# Lido por wsgi.py (warmup.start_warm_up) no mestre ou em cada worker
+os.environ['WARMUP_MODE'] = 'preload' if preload_app else 'background'
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} criado ({'preload' if preload_app else 'carga própria'})")
@@ -0,0 +1,76 @@
+import json
+from itertools import groupby
+
+H2H_LAST_N = 10  # Resultados guardados por confronto em last_results
+
+# Versão de h2h: muda com o cálculo ou H2H_LAST_N (derived_tables.py refaz)
+H2H_VERSION = f'1:last_n={H2H_LAST_N}'
+
+def ordered_pair(team1, team2):
+    """Chave do confronto: (time menor, time maior) em ordem alfabética"""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+def refresh_h2h(conn, pairs=None):
+    """Recalcula as linhas de h2h dos pares informados (ou de todos) a partir de games
+
+    Não abre transação: quem chama decide, para que partidas e confrontos
+    sejam gravados juntos.
+    """
+    team_filter = ''
+    if pairs is not None:
+        pairs = {ordered_pair(*pair) for pair in pairs}
+        if not pairs:
+            return 0
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS touched_pairs (low TEXT, high TEXT, PRIMARY KEY (low, high))')
+        conn.execute('DELETE FROM touched_pairs')
+        conn.executemany('INSERT INTO touched_pairs VALUES (?, ?)', pairs)
+        # Os dois mandos de cada par, para usar os índices por mandante/visitante
+        team_filter = '''AND (home_team, away_team) IN (
+            SELECT low, high FROM touched_pairs UNION ALL SELECT high, low FROM touched_pairs
+        )'''
+
+    games = conn.execute(f'''
+        SELECT
+            MIN(home_team, away_team) AS low,
+            MAX(home_team, away_team) AS high,
+            CASE WHEN home_team <= away_team THEN home_goals ELSE away_goals END,
+            CASE WHEN home_team <= away_team THEN away_goals ELSE home_goals END,
+            date
+        FROM games
+        WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL AND home_team <> away_team {team_filter}
+        ORDER BY low, high, date DESC, id DESC
+    ''')
+
+    rows = []
+    for (low, high), meetings in groupby(games, key=lambda g: (g[0], g[1])):
+        meetings = [(low_goals, high_goals, date) for _, _, low_goals, high_goals, date in meetings]
+        rows.append((
+            low, high, len(meetings),
+            sum(l > h for l, h, _ in meetings),
+            sum(l == h for l, h, _ in meetings),
+            sum(l < h for l, h, _ in meetings),
+            sum(l for l, _, _ in meetings),
+            sum(h for _, h, _ in meetings),
+            meetings[0][2],
+            json.dumps([[date, l, h] for l, h, date in meetings[:H2H_LAST_N]])
+        ))
+
+    if pairs is None:
+        conn.execute('DELETE FROM h2h')
+    else:
+        conn.execute('DELETE FROM h2h WHERE (team_low, team_high) IN (SELECT low, high FROM touched_pairs)')
+    conn.executemany('''
+        INSERT INTO h2h (team_low, team_high, games, low_wins, draws, high_wins,
+                         low_goals, high_goals, last_date, last_results)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+def h2h_results(row, team1, team2, last_n=5):
+    """Lista (gols team1, gols team2) dos confrontos mais recentes a partir de last_results"""
+    if row is None:
+        return []
+    results = json.loads(row)[:last_n]
+    if team1 <= team2:
+        return [(low, high) for _, low, high in results]
+    return [(high, low) for _, low, high in results]
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Migrações versionadas do banco football.db
+
+A versão aplicada fica em PRAGMA user_version. Cada migração roda em uma
+transação própria; bancos criados pelas versões antigas de init_db são
+adotados pela migração 1. Migrações só mudam o esquema: o conteúdo das
+tabelas derivadas (h2h, team_form, ratings) é refeito por derived_tables.py,
+com versão própria.
+
+Uso: python migrations.py [versão_alvo]
+"""
+
+import os
+import sqlite3
+import sys
+
+DB_PATH = os.getenv('FOOTBALL_DB', 'football.db')
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+def _initial_schema(conn):
+    """Tabelas games, team_stats e predictions"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            home_team TEXT,
+            away_team TEXT,
+            date TEXT,
+            home_goals INTEGER,
+            away_goals INTEGER,
+            competition TEXT,
+            league_code TEXT
+        )
+    ''')
+
+    # Bancos criados por app-light.py/sample_data.py não tinham league_code
+    if 'league_code' not in _columns(conn, 'games'):
+        conn.execute('ALTER TABLE games ADD COLUMN league_code TEXT')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS team_stats (
+            id INTEGER PRIMARY KEY,
+            team_name TEXT,
+            goals_scored REAL,
+            goals_conceded REAL,
+            wins INTEGER,
+            draws INTEGER,
+            losses INTEGER,
+            last_updated TEXT
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY,
+            game_id INTEGER,
+            prediction_type TEXT,
+            probability REAL,
+            created_at TEXT
+        )
+    ''')
+
+def _sync_state(conn):
+    """Marca d'água por liga da coleta incremental"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            league_code TEXT PRIMARY KEY,
+            last_synced_date TEXT,
+            last_changed TEXT,
+            updated_at TEXT
+        )
+    ''')
+
+def _games_indexes(conn):
+    """Índices de cobertura para forma recente, confronto direto e coleta"""
+    # Forma e H2H filtram por time e ordenam por data; demais colunas evitam ler a tabela
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_games_home_date
+        ON games (home_team, date, away_team, home_goals, away_goals)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_games_away_date
+        ON games (away_team, date, home_team, home_goals, away_goals)
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_games_league_date ON games (league_code, date)')
+
+def _unique_team_stats(conn):
+    """Remove linhas duplicadas de team_stats e impede novas"""
+    conn.execute('''
+        DELETE FROM team_stats
+        WHERE id NOT IN (SELECT MAX(id) FROM team_stats GROUP BY team_name)
+    ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_team_stats_name ON team_stats (team_name)')
+
+def _backfill_chunks(conn):
+    """Checkpoint dos intervalos já concluídos pelo backfill"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS backfill_chunks (
+            league_code TEXT,
+            date_from TEXT,
+            date_to TEXT,
+            matches INTEGER,
+            finished_at TEXT,
+            PRIMARY KEY (league_code, date_from, date_to)
+        )
+    ''')
+
+def _games_change_seq(conn):
+    """Número de alteração crescente em games, para leitores incrementais"""
+    if 'change_seq' not in _columns(conn, 'games'):
+        conn.execute('ALTER TABLE games ADD COLUMN change_seq INTEGER')
+    conn.execute('UPDATE games SET change_seq = id WHERE change_seq IS NULL')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_games_change_seq ON games (change_seq)')
+
+    # Qualquer escrita (coletor, sample_data, scripts) recebe o próximo número
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS games_change_seq_insert AFTER INSERT ON games
+        WHEN NEW.change_seq IS NULL
+        BEGIN
+            UPDATE games SET change_seq = (SELECT IFNULL(MAX(change_seq), 0) + 1 FROM games)
+            WHERE id = NEW.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS games_change_seq_update
+        AFTER UPDATE OF home_team, away_team, date, home_goals, away_goals ON games
+        BEGIN
+            UPDATE games SET change_seq = (SELECT IFNULL(MAX(change_seq), 0) + 1 FROM games)
+            WHERE id = NEW.id;
+        END
+    ''')
+
+def _h2h_table(conn):
+    """Confrontos diretos materializados por par ordenado de times"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS h2h (
+            team_low TEXT,
+            team_high TEXT,
+            games INTEGER,
+            low_wins INTEGER,
+            draws INTEGER,
+            high_wins INTEGER,
+            low_goals INTEGER,
+            high_goals INTEGER,
+            last_date TEXT,
+            last_results TEXT,
+            PRIMARY KEY (team_low, team_high)
+        ) WITHOUT ROWID
+    ''')
+
+def _team_form_table(conn):
+    """Forma acumulada de cada time após cada partida, por janela de jogos"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS team_form (
+            team TEXT,
+            window_size INTEGER,
+            date TEXT,
+            match_id INTEGER,
+            points INTEGER,
+            goals_for INTEGER,
+            goals_against INTEGER,
+            games INTEGER,
+            PRIMARY KEY (team, window_size, date, match_id)
+        ) WITHOUT ROWID
+    ''')
+
+def _elo_ratings(conn):
+    """Ratings Elo atuais por time e antes/depois de cada partida"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS team_ratings (
+            team TEXT PRIMARY KEY,
+            rating REAL,
+            games INTEGER,
+            last_date TEXT,
+            last_match_id INTEGER
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS match_ratings (
+            match_id INTEGER PRIMARY KEY,
+            date TEXT,
+            home_team TEXT,
+            away_team TEXT,
+            home_rating_before REAL,
+            away_rating_before REAL,
+            home_rating_after REAL,
+            away_rating_after REAL,
+            expected_home REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_match_ratings_date ON match_ratings (date)')
+
+def _derived_versions(conn):
+    """Versão com que cada tabela derivada foi construída (derived_tables.py)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS derived_versions (
+            name TEXT PRIMARY KEY,
+            version TEXT,
+            rebuilt_at TEXT
+        )
+    ''')
+
+def _games_status(conn):
+    """Situação da partida na API (SCHEDULED, TIMED, FINISHED, POSTPONED...)"""
+    if 'status' not in _columns(conn, 'games'):
+        conn.execute('ALTER TABLE games ADD COLUMN status TEXT')
+    # Linhas antigas: só o placar decide; a próxima coleta corrige as que ainda não valem
+    conn.execute('''
+        UPDATE games SET status = CASE
+            WHEN home_goals IS NOT NULL AND away_goals IS NOT NULL THEN 'FINISHED'
+            ELSE 'SCHEDULED'
+        END
+        WHERE status IS NULL
+    ''')
+
+# (versão, descrição, função) em ordem crescente; nunca altere uma migração já publicada
+MIGRATIONS = [
+    (1, 'esquema inicial', _initial_schema),
+    (2, 'tabela sync_state', _sync_state),
+    (3, 'índices de games', _games_indexes),
+    (4, 'team_name único em team_stats', _unique_team_stats),
+    (5, 'tabela backfill_chunks', _backfill_chunks),
+    (6, 'change_seq em games', _games_change_seq),
+    (7, 'tabela h2h', _h2h_table),
+    (8, 'tabela team_form', _team_form_table),
+    (9, 'ratings Elo', _elo_ratings),
+    (10, 'tabela derived_versions', _derived_versions),
+    (11, 'status em games', _games_status),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+DERIVED_VERSIONS_MIGRATION = 10
+
+def current_version(conn):
+    """Versão do esquema aplicada ao banco"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn=None, target=None, verbose=False, rebuild=True):
+    """Aplica as migrações pendentes até target (padrão: a mais recente)
+
+    Com rebuild, em seguida refaz as tabelas derivadas cuja versão mudou.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(DB_PATH)
+
+    target = LATEST_VERSION if target is None else target
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Transações controladas manualmente (DDL incluso)
+
+    try:
+        version = current_version(conn)
+        for number, description, apply in MIGRATIONS:
+            if number <= version or number > target:
+                continue
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                apply(conn)
+                conn.execute(f'PRAGMA user_version = {number}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+            version = number
+            if verbose:
+                print(f"Migração {number} aplicada: {description}")
+
+        if rebuild and version >= DERIVED_VERSIONS_MIGRATION:
+            from derived_tables import rebuild_derived
+            rebuild_derived(conn, verbose=verbose)
+        return version
+    finally:
+        conn.isolation_level = previous_isolation
+        if own_conn:
+            conn.close()
+
+if __name__ == "__main__":
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    conn = sqlite3.connect(DB_PATH)
+    print(f"Versão atual: {current_version(conn)}")
+    print(f"Versão final: {migrate(conn, target, verbose=True)}")
+    conn.close()
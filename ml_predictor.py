@@ -1,133 +1,118 @@
-import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
-import sqlite3
-import pickle
-from datetime import datetime
+from feature_store import get_feature_store
+from model_registry import get_registry, save_pickle
+
+# Médias e vitórias de cada time antes da partida (feature store)
+RF_FEATURES = ['home_avg_goals', 'home_avg_conceded', 'home_wins',
+               'away_avg_goals', 'away_avg_conceded', 'away_wins']
+MODEL_PATHS = ('model_goals.pkl', 'model_result.pkl')
+DEFAULT_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+def training_targets(home_goals, away_goals):
+    """(over 2.5, resultado 0=away 1=draw 2=home) de cada partida"""
+    home_goals = np.asarray(home_goals, dtype=int)
+    away_goals = np.asarray(away_goals, dtype=int)
+    y_goals = (home_goals + away_goals > 2.5).astype(int)
+    y_result = np.where(home_goals > away_goals, 2, np.where(home_goals < away_goals, 0, 1))
+    return y_goals, y_result
+
+def chronological_split(dates, test_size=0.2):
+    """Primeira linha do teste: as últimas test_size partidas, sem dividir um mesmo dia"""
+    split = int(len(dates) * (1 - test_size))
+    if 0 < split < len(dates):
+        split = int(np.searchsorted(dates, dates[split]))
+    return split
+
+def class_probabilities(model, probs, label, default):
+    """Coluna de predict_proba da classe label (via model.classes_); default se o treino não a viu"""
+    classes = list(model.classes_)
+    if label not in classes:
+        return np.full(len(probs), default)
+    return probs[:, classes.index(label)]
 
 class FootballPredictor:
-    def __init__(self):
-        self.model_goals = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model_result = RandomForestClassifier(n_estimators=100, random_state=42)
+    def __init__(self, goals_params=None, result_params=None):
+        # Hiperparâmetros escolhidos por model_search.py podem ser passados aqui
+        self.model_goals = RandomForestClassifier(**dict(DEFAULT_PARAMS, n_jobs=-1, **(goals_params or {})))
+        self.model_result = RandomForestClassifier(**dict(DEFAULT_PARAMS, n_jobs=-1, **(result_params or {})))
         
     def prepare_features(self, home_team, away_team):
-        """Prepara features para previsão"""
-        conn = sqlite3.connect('football.db')
-        
-        # Busca estatísticas dos times
-        home_stats = pd.read_sql('''
-            SELECT * FROM team_stats WHERE team_name = ?
-        ''', conn, params=(home_team,))
-        
-        away_stats = pd.read_sql('''
-            SELECT * FROM team_stats WHERE team_name = ?
-        ''', conn, params=(away_team,))
-        
-        conn.close()
-        
-        if home_stats.empty or away_stats.empty:
-            return None
-            
-        # Cria features
-        features = [
-            home_stats['goals_scored'].iloc[0],
-            home_stats['goals_conceded'].iloc[0],
-            home_stats['wins'].iloc[0],
-            away_stats['goals_scored'].iloc[0],
-            away_stats['goals_conceded'].iloc[0],
-            away_stats['wins'].iloc[0]
-        ]
-        
-        return np.array(features).reshape(1, -1)
+        """Prepara features para previsão (estado atual dos times no feature store)"""
+        return get_feature_store().match_features(home_team, away_team, RF_FEATURES)
     
     def train_models(self):
         """Treina os modelos com dados históricos"""
-        conn = sqlite3.connect('football.db')
+        # Features de cada partida como eram antes do jogo (feature store, sem vazamento)
+        store = get_feature_store()
+        store.refresh()
+        X, home_goals, away_goals, dates = store.training_matrix(RF_FEATURES)
         
-        # Busca dados históricos
-        games_df = pd.read_sql('''
-            SELECT g.*, 
-                   hs.goals_scored as home_avg_goals,
-                   hs.goals_conceded as home_avg_conceded,
-                   hs.wins as home_wins,
-                   as_.goals_scored as away_avg_goals,
-                   as_.goals_conceded as away_avg_conceded,
-                   as_.wins as away_wins
-            FROM games g
-            JOIN team_stats hs ON g.home_team = hs.team_name
-            JOIN team_stats as_ ON g.away_team = as_.team_name
-            WHERE g.home_goals IS NOT NULL
-        ''', conn)
-        
-        conn.close()
-        
-        if games_df.empty:
+        if len(X) == 0:
             print("Não há dados suficientes para treinar")
             return
         
-        # Prepara features
-        X = games_df[['home_avg_goals', 'home_avg_conceded', 'home_wins', 
-                     'away_avg_goals', 'away_avg_conceded', 'away_wins']]
-        
-        # Target para gols (over/under 2.5)
-        y_goals = (games_df['home_goals'] + games_df['away_goals'] > 2.5).astype(int)
-        
-        # Target para resultado (0=away, 1=draw, 2=home)
-        y_result = np.where(games_df['home_goals'] > games_df['away_goals'], 2,
-                           np.where(games_df['home_goals'] < games_df['away_goals'], 0, 1))
+        y_goals, y_result = training_targets(home_goals, away_goals)
         
         # Treina modelos
         if len(X) > 10:  # Mínimo de dados
-            X_train, X_test, y_goals_train, y_goals_test = train_test_split(X, y_goals, test_size=0.2)
-            X_train, X_test, y_result_train, y_result_test = train_test_split(X, y_result, test_size=0.2)
+            # Mesmo corte temporal para os dois modelos: treina no passado, avalia nas partidas seguintes
+            split = chronological_split(dates)
+            X_train, X_test = X[:split], X[split:]
             
-            self.model_goals.fit(X_train, y_goals_train)
-            self.model_result.fit(X_train, y_result_train)
+            self.model_goals.fit(X_train, y_goals[:split])
+            self.model_result.fit(X_train, y_result[:split])
             
             # Avalia modelos
-            goals_acc = accuracy_score(y_goals_test, self.model_goals.predict(X_test))
-            result_acc = accuracy_score(y_result_test, self.model_result.predict(X_test))
+            goals_acc = accuracy_score(y_goals[split:], self.model_goals.predict(X_test))
+            result_acc = accuracy_score(y_result[split:], self.model_result.predict(X_test))
             
             print(f"Acurácia Over/Under: {goals_acc:.2f}")
             print(f"Acurácia Resultado: {result_acc:.2f}")
             
-            # Salva modelos
-            with open('model_goals.pkl', 'wb') as f:
-                pickle.dump(self.model_goals, f)
-            with open('model_result.pkl', 'wb') as f:
-                pickle.dump(self.model_result, f)
+            # Salva modelos; na previsão (poucas linhas) uma thread só é mais rápida
+            for model in (self.model_goals, self.model_result):
+                model.n_jobs = None
+            save_pickle(self.model_goals, MODEL_PATHS[0])
+            save_pickle(self.model_result, MODEL_PATHS[1])
     
     def predict_match(self, home_team, away_team):
         """Faz previsão para uma partida"""
-        features = self.prepare_features(home_team, away_team)
-        
-        if features is None:
-            return None
+        return self.predict_matches([(home_team, away_team)])[0]
+    
+    def predict_matches(self, pairs):
+        """Previsões de vários confrontos com uma chamada por modelo; None onde faltam dados"""
+        pairs = list(pairs)
+        features, found = get_feature_store().matches_features(pairs, RF_FEATURES)
+        results = [None] * len(pairs)
+        if not found:
+            return results
         
         try:
-            # Carrega modelos se existirem
-            with open('model_goals.pkl', 'rb') as f:
-                self.model_goals = pickle.load(f)
-            with open('model_result.pkl', 'rb') as f:
-                self.model_result = pickle.load(f)
+            # Carregados uma vez por processo; recarregados quando os arquivos mudam
+            self.model_goals, self.model_result = get_registry().load('random_forest', MODEL_PATHS)
         except FileNotFoundError:
             print("Modelos não encontrados. Treine primeiro.")
-            return None
-        
-        # Previsões
-        goals_prob = self.model_goals.predict_proba(features)[0]
-        result_prob = self.model_result.predict_proba(features)[0]
-        
-        predictions = {
-            'over_2_5_prob': goals_prob[1] if len(goals_prob) > 1 else 0.5,
-            'home_win_prob': result_prob[2] if len(result_prob) > 2 else 0.33,
-            'draw_prob': result_prob[1] if len(result_prob) > 1 else 0.33,
-            'away_win_prob': result_prob[0] if len(result_prob) > 0 else 0.33
-        }
-        
-        return predictions
+            return results
+        
+        # Previsões de todas as partidas de uma vez; colunas pela classe, não pela posição
+        goals_probs = self.model_goals.predict_proba(features)
+        result_probs = self.model_result.predict_proba(features)
+        over = class_probabilities(self.model_goals, goals_probs, 1, 0.5)
+        home_win = class_probabilities(self.model_result, result_probs, 2, 0.33)
+        draw = class_probabilities(self.model_result, result_probs, 1, 0.33)
+        away_win = class_probabilities(self.model_result, result_probs, 0, 0.33)
+        
+        for k, i in enumerate(found):
+            results[i] = {
+                'over_2_5_prob': float(over[k]),
+                'home_win_prob': float(home_win[k]),
+                'draw_prob': float(draw[k]),
+                'away_win_prob': float(away_win[k])
+            }
+        
+        return results
 
 if __name__ == "__main__":
     predictor = FootballPredictor()
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+
+NEURAL_EXPORT_PATH = 'neural_models.npz'
+
+def _relu(x):
+    return np.maximum(x, 0)
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'sigmoid': _sigmoid,
+    'softmax': _softmax,
+    'linear': lambda x: x,
+}
+
+class NumpyMLP:
+    """Rede densa exportada do Keras: (pesos, vieses, ativação) por camada; Dropout some na inferência"""
+
+    def __init__(self, kernels, biases, activations):
+        self.kernels = kernels
+        self.biases = biases
+        self.activations = [ACTIVATIONS[name] for name in activations]
+        self.activation_names = list(activations)
+
+    def predict(self, X, batch_size=None, verbose=0):
+        """Mesma assinatura de keras.Model.predict; a rede inteira roda em um produto por camada"""
+        out = np.asarray(X, dtype=np.float32)
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            out = activation(out @ kernel + bias)
+        return out
+
+    @property
+    def nbytes(self):
+        return sum(k.nbytes + b.nbytes for k, b in zip(self.kernels, self.biases))
+
+class NumpyScaler:
+    """Parâmetros de um StandardScaler treinado, sem depender do scikit-learn"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.n_features_in_ = len(mean)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+    @property
+    def nbytes(self):
+        return self.mean_.nbytes + self.scale_.nbytes
+
+def export_keras(models, scaler, path=NEURAL_EXPORT_PATH):
+    """Grava as camadas densas dos modelos Keras {nome: modelo} e o scaler em um .npz compacto"""
+    arrays = {
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64),
+    }
+    for name, model in models.items():
+        activations = []
+        for layer in model.layers:
+            weights = layer.get_weights()
+            if not weights:
+                continue  # Dropout e afins não têm pesos nem efeito na inferência
+            kernel, bias = weights
+            arrays[f'{name}_kernel_{len(activations)}'] = kernel.astype(np.float32)
+            arrays[f'{name}_bias_{len(activations)}'] = bias.astype(np.float32)
+            activations.append(layer.get_config()['activation'])
+        arrays[f'{name}_activations'] = np.array(activations)
+
+    tmp = f'{path}.tmp.npz'
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, path)
+
+def load_exported(paths, names=('goals', 'result')):
+    """(modelo de cada nome..., scaler) do .npz exportado; formato do registro de modelos"""
+    with np.load(paths[0]) as data:
+        models = []
+        for name in names:
+            activations = [str(a) for a in data[f'{name}_activations']]
+            kernels = [data[f'{name}_kernel_{i}'] for i in range(len(activations))]
+            biases = [data[f'{name}_bias_{i}'] for i in range(len(activations))]
+            models.append(NumpyMLP(kernels, biases, activations))
+        scaler = NumpyScaler(data['scaler_mean'], data['scaler_scale'])
+    return (*models, scaler)
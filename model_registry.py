@@ -0,0 +1,116 @@
+import os
+import pickle
+import threading
+import time
+
+class _Entry:
+    """Artefato carregado: valor, versão dos arquivos e métricas da carga"""
+    __slots__ = ('value', 'version', 'load_seconds', 'memory_bytes', 'loads', 'loaded_at')
+
+    def __init__(self, value, version, load_seconds, memory_bytes, loads):
+        self.value = value
+        self.version = version
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.loads = loads
+        self.loaded_at = time.time()
+
+def _file_version(paths):
+    """(mtime_ns, tamanho) de cada arquivo; FileNotFoundError se faltar algum"""
+    return tuple((st.st_mtime_ns, st.st_size) for st in (os.stat(path) for path in paths))
+
+def memory_size(value):
+    """Tamanho aproximado em memória: pesos de modelos Keras, arrays, ou o pickle do objeto"""
+    if isinstance(value, (tuple, list)):
+        return sum(memory_size(item) for item in value)
+    if hasattr(value, 'get_weights'):
+        return int(sum(w.nbytes for w in value.get_weights()))
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+def load_pickles(paths):
+    """Carregador padrão: um objeto por arquivo .pkl"""
+    values = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            values.append(pickle.load(f))
+    return tuple(values)
+
+def save_pickle(value, path):
+    """Grava em arquivo temporário e troca de uma vez, para o registro nunca ler pela metade"""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(value, f)
+    os.replace(tmp, path)
+
+class ModelRegistry:
+    """Modelos carregados uma vez por processo e compartilhados entre threads
+
+    Cada artefato é um conjunto de arquivos carregados juntos (ex.: modelo de
+    gols, de resultado e scaler). A cada uso a versão (mtime e tamanho) dos
+    arquivos é conferida; se mudou, uma thread recarrega enquanto as demais
+    seguem com o modelo anterior, e a troca é uma única atribuição.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _entry_lock(self, name):
+        with self._lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def load(self, name, paths, loader=load_pickles):
+        """Valor do artefato name, recarregado se algum dos arquivos mudou"""
+        paths = tuple(paths)
+        version = _file_version(paths)
+        entry = self._entries.get(name)
+        if entry is not None and entry.version == version:
+            return entry.value
+
+        with self._entry_lock(name):
+            entry = self._entries.get(name)
+            version = _file_version(paths)
+            if entry is not None and entry.version == version:
+                return entry.value
+
+            start = time.perf_counter()
+            value = loader(paths)
+            elapsed = time.perf_counter() - start
+            loads = entry.loads + 1 if entry else 1
+            self._entries[name] = _Entry(value, version, elapsed, memory_size(value), loads)
+            print(f"Modelo {name} {'recarregado' if entry else 'carregado'} em {elapsed * 1000:.0f} ms")
+            return value
+
+    def stats(self):
+        """Tempo de carga, tamanho em memória e em disco de cada artefato carregado"""
+        return {
+            name: {
+                'load_ms': round(entry.load_seconds * 1000, 1),
+                'memory_bytes': entry.memory_bytes,
+                'file_bytes': sum(size for _, size in entry.version),
+                'loads': entry.loads,
+                'loaded_at': entry.loaded_at,
+            }
+            for name, entry in list(self._entries.items())
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """ModelRegistry compartilhado do processo"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Validação cruzada walk-forward e busca de hiperparâmetros dos Random Forests
+
+Cada configuração é treinada em janelas crescentes do passado e avaliada no
+bloco de partidas seguinte, nunca em partidas anteriores ao treino. As
+configurações rodam em paralelo (um processo por núcleo); a matriz de
+features vem do feature store mapeado em memória, lida uma vez por processo
+e compartilhada por todas as janelas.
+
+Uso: python model_search.py [--folds 5] [--jobs N] [--target goals|result|both] [--save-best]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, log_loss
+
+from feature_store import get_feature_store
+from ml_predictor import RF_FEATURES, FootballPredictor, training_targets
+
+PARAM_GRID = {
+    'n_estimators': [100, 300],
+    'max_depth': [None, 6, 12],
+    'min_samples_leaf': [1, 10, 50],
+    'max_features': ['sqrt', None],
+}
+LEADERBOARD_PATH = 'model_search.json'
+
+def param_grid(grid=PARAM_GRID):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+def walk_forward_folds(dates, n_folds=5, min_train=0.4):
+    """[(fim do treino, fim do teste)]: treino = linhas [0, fim do treino), teste o bloco seguinte
+
+    Os últimos (1 - min_train) das partidas viram n_folds blocos consecutivos;
+    os cortes caem em troca de data, para um mesmo dia não ficar dos dois lados.
+    """
+    n = len(dates)
+    bounds = np.linspace(int(n * min_train), n, n_folds + 1).astype(int)
+    bounds = [int(np.searchsorted(dates, dates[b])) if b < n else n for b in bounds]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop and start > 0]
+
+# Matriz de cada processo: os .npy mapeados são abertos uma vez e servem a todas as tarefas
+_data = None
+
+def _load_data(db_path=None):
+    global _data
+    if _data is None:
+        store = get_feature_store(db_path)
+        X, home_goals, away_goals, dates = store.training_matrix(RF_FEATURES)
+        y_goals, y_result = training_targets(home_goals, away_goals)
+        _data = {'X': X, 'goals': y_goals, 'result': y_result, 'dates': dates}
+    return _data
+
+def evaluate(target, params, folds, db_path=None):
+    """Métricas médias de uma configuração nas janelas walk-forward"""
+    data = _load_data(db_path)
+    X, y = data['X'], data[target]
+    labels = np.unique(y)
+    scores, accuracies, fit_times = [], [], []
+    for train_end, test_end in folds:
+        model = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(X[:train_end], y[:train_end])
+        fit_times.append(time.perf_counter() - start)
+
+        # Classe ausente no treino (ex.: nenhum empate) recebe probabilidade zero
+        probs = np.zeros((test_end - train_end, len(labels)))
+        probs[:, np.searchsorted(labels, model.classes_)] = model.predict_proba(X[train_end:test_end])
+        y_test = y[train_end:test_end]
+        scores.append(log_loss(y_test, probs, labels=labels))
+        accuracies.append(accuracy_score(y_test, labels[probs.argmax(axis=1)]))
+
+    return {
+        'target': target,
+        'params': params,
+        'log_loss': float(np.mean(scores)),
+        'log_loss_std': float(np.std(scores)),
+        'accuracy': float(np.mean(accuracies)),
+        'fit_seconds': float(np.mean(fit_times)),
+    }
+
+def search(targets=('goals', 'result'), n_folds=5, jobs=None, grid=PARAM_GRID, db_path=None):
+    """Leaderboard de cada alvo, ordenado por log loss médio (menor é melhor)"""
+    store = get_feature_store(db_path)
+    store.refresh()
+    data = _load_data(db_path)
+    folds = walk_forward_folds(data['dates'], n_folds)
+    if not folds:
+        raise ValueError('Partidas insuficientes para a validação walk-forward')
+
+    configs = param_grid(grid)
+    tasks = [(target, params) for target in targets for params in configs]
+    print(f"{len(data['X'])} partidas, {len(folds)} janelas, {len(tasks)} treinos de configuração, "
+          f"{jobs or os.cpu_count()} processos")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(evaluate, target, params, folds, db_path) for target, params in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            results.append(future.result())
+            print(f"\r{done}/{len(tasks)} configurações avaliadas", end='', flush=True)
+    print()
+
+    return {
+        target: sorted((r for r in results if r['target'] == target), key=lambda r: r['log_loss'])
+        for target in targets
+    }
+
+def print_leaderboard(leaderboard, top=10):
+    for target, rows in leaderboard.items():
+        print(f"\nAlvo: {target}")
+        print(f"{'#':>3} {'log loss':>9} {'± desvio':>9} {'acurácia':>9} {'fit (s)':>8}  parâmetros")
+        for rank, row in enumerate(rows[:top], 1):
+            params = ', '.join(f'{k}={v}' for k, v in row['params'].items())
+            print(f"{rank:>3} {row['log_loss']:>9.4f} {row['log_loss_std']:>9.4f} {row['accuracy']:>9.3f} "
+                  f"{row['fit_seconds']:>8.2f}  {params}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Busca de hiperparâmetros com validação walk-forward')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=None, help='processos (padrão: todos os núcleos)')
+    parser.add_argument('--target', choices=['goals', 'result', 'both'], default='both')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--save-best', action='store_true', help='treina e salva os modelos com a melhor configuração')
+    args = parser.parse_args()
+
+    targets = ('goals', 'result') if args.target == 'both' else (args.target,)
+    start = time.perf_counter()
+    leaderboard = search(targets, args.folds, args.jobs)
+    print_leaderboard(leaderboard, args.top)
+    print(f"\nBusca concluída em {time.perf_counter() - start:.1f}s")
+
+    with open(LEADERBOARD_PATH, 'w') as f:
+        json.dump(leaderboard, f, indent=1)
+    print(f"Leaderboard salvo em {LEADERBOARD_PATH}")
+
+    if args.save_best:
+        best = {target: rows[0]['params'] for target, rows in leaderboard.items()}
+        FootballPredictor(goals_params=best.get('goals'), result_params=best.get('result')).train_models()
+
+if __name__ == "__main__":
+    main()
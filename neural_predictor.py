@@ -1,86 +1,96 @@
 import numpy as np
-import pandas as pd
-import sqlite3
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras import layers
 import pickle
 import os
-from datetime import datetime
+import sys
+from feature_store import FEATURE_NAMES, get_feature_store
+from mlp_runtime import NEURAL_EXPORT_PATH, export_keras, load_exported
+from model_registry import get_registry, save_pickle
+
+MODEL_PATHS = ('neural_model_goals.h5', 'neural_model_result.h5', 'scaler.pkl')
+_COLUMNS = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+def _keras():
+    """TensorFlow só é importado para treinar (ou ler os .h5); a previsão usa o .npz exportado"""
+    from tensorflow import keras
+    return keras
+
+def _load_artifacts(paths):
+    """(modelo de gols, modelo de resultado, scaler) para o registro de modelos"""
+    keras = _keras()
+    with open(paths[2], 'rb') as f:
+        scaler = pickle.load(f)
+    return keras.models.load_model(paths[0]), keras.models.load_model(paths[1]), scaler
+
+def _save_model(model, path):
+    """Grava o .h5 em arquivo temporário e troca de uma vez"""
+    tmp = path.replace('.h5', '.tmp.h5')
+    model.save(tmp)
+    os.replace(tmp, path)
 
 class NeuralPredictor:
     def __init__(self):
-        self.scaler = StandardScaler()
+        self.scaler = None  # StandardScaler no treino; NumpyScaler quando carregado do .npz
         self.model_goals = None
         self.model_result = None
-        self.feature_names = [
-            'home_avg_goals', 'home_avg_conceded', 'home_wins', 'home_form_points',
-            'away_avg_goals', 'away_avg_conceded', 'away_wins', 'away_form_points',
-            'h2h_home_wins', 'h2h_draws', 'h2h_away_wins', 'h2h_avg_goals',
-            'home_strength', 'away_strength', 'strength_diff'
-        ]
     
     def create_advanced_features(self):
         """Cria features avançadas para a rede neural"""
-        conn = sqlite3.connect('football.db')
+        # Features de cada partida como eram antes do jogo (feature store, sem vazamento)
+        store = get_feature_store()
+        store.refresh()
+        X, home_goals, away_goals, _ = store.training_matrix()
         
-        # Query complexa para extrair features
-        query = '''
-        SELECT 
-            g.id,
-            g.home_team,
-            g.away_team,
-            g.home_goals,
-            g.away_goals,
-            hs.goals_scored as home_avg_goals,
-            hs.goals_conceded as home_avg_conceded,
-            hs.wins as home_wins,
-            as_.goals_scored as away_avg_goals,
-            as_.goals_conceded as away_avg_conceded,
-            as_.wins as away_wins
-        FROM games g
-        JOIN team_stats hs ON g.home_team = hs.team_name
-        JOIN team_stats as_ ON g.away_team = as_.team_name
-        WHERE g.home_goals IS NOT NULL
-        '''
-        
-        df = pd.read_sql(query, conn)
-        conn.close()
-        
-        if df.empty:
+        if len(X) == 0:
             return None, None, None, None
         
-        # Features básicas
-        features = df[['home_avg_goals', 'home_avg_conceded', 'home_wins',
-                      'away_avg_goals', 'away_avg_conceded', 'away_wins']].copy()
-        
-        # Features derivadas
-        features['home_goal_diff'] = features['home_avg_goals'] - features['home_avg_conceded']
-        features['away_goal_diff'] = features['away_avg_goals'] - features['away_avg_conceded']
-        features['goal_diff_advantage'] = features['home_goal_diff'] - features['away_goal_diff']
-        
-        # Força dos times (normalizada)
-        features['home_strength'] = (features['home_wins'] * 3 + features['home_goal_diff']) / 10
-        features['away_strength'] = (features['away_wins'] * 3 + features['away_goal_diff']) / 10
-        features['strength_diff'] = features['home_strength'] - features['away_strength']
-        
-        # Vantagem de casa
-        features['home_advantage'] = 1
+        features = self._feature_matrix(X)
         
         # Targets
-        total_goals = df['home_goals'] + df['away_goals']
+        home_goals = np.asarray(home_goals, dtype=int)
+        away_goals = np.asarray(away_goals, dtype=int)
+        total_goals = home_goals + away_goals
         y_goals = (total_goals > 2.5).astype(int)
         
         # Resultado: 0=away win, 1=draw, 2=home win
-        y_result = np.where(df['home_goals'] > df['away_goals'], 2,
-                           np.where(df['home_goals'] < df['away_goals'], 0, 1))
+        y_result = np.where(home_goals > away_goals, 2, np.where(home_goals < away_goals, 0, 1))
+        
+        return features, y_goals, y_result, total_goals
+    
+    def _feature_matrix(self, X):
+        """Features da rede a partir das colunas do feature store (mesma ordem no treino e na previsão)
+
+        X tem as colunas de FEATURE_NAMES; o resultado, as 22 colunas abaixo, nesta ordem.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        column = lambda name: X[:, _COLUMNS[name]]
         
-        return features.values, y_goals.values, y_result, total_goals.values
+        # Features derivadas
+        home_goal_diff = column('home_avg_goals') - column('home_avg_conceded')
+        away_goal_diff = column('away_avg_goals') - column('away_avg_conceded')
+        
+        # Força dos times (normalizada)
+        home_strength = (column('home_wins') * 3 + home_goal_diff) / 10
+        away_strength = (column('away_wins') * 3 + away_goal_diff) / 10
+        
+        return np.column_stack([
+            # Features básicas
+            column('home_avg_goals'), column('home_avg_conceded'), column('home_wins'),
+            column('away_avg_goals'), column('away_avg_conceded'), column('away_wins'),
+            home_goal_diff, away_goal_diff, home_goal_diff - away_goal_diff,
+            home_strength, away_strength, home_strength - away_strength,
+            # Vantagem de casa
+            np.ones(len(X)),
+            # Forma nos 5 jogos anteriores
+            column('home_form_points'), column('home_form_goals_for'), column('home_form_goals_against'),
+            column('away_form_points'), column('away_form_goals_for'), column('away_form_goals_against'),
+            # Rating Elo antes da partida
+            column('home_elo'), column('away_elo'), column('home_elo') - column('away_elo'),
+        ])
     
     def build_neural_network(self, input_dim, output_dim, task_type='classification'):
         """Constrói rede neural otimizada"""
+        keras = _keras()
+        layers = keras.layers
         model = keras.Sequential([
             layers.Dense(128, activation='relu', input_shape=(input_dim,)),
             layers.Dropout(0.3),
@@ -105,6 +115,10 @@ class NeuralPredictor:
     
     def train_models(self):
         """Treina os modelos de rede neural"""
+        # Só o treino usa scikit-learn; a previsão roda em NumPy
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         print("Criando features avançadas...")
         X, y_goals, y_result, y_total_goals = self.create_advanced_features()
         
@@ -115,6 +129,7 @@ class NeuralPredictor:
         print(f"Treinando com {len(X)} amostras...")
         
         # Normaliza features
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         # Divide dados
@@ -129,7 +144,7 @@ class NeuralPredictor:
         print("Treinando modelo Over/Under...")
         self.model_goals = self.build_neural_network(X.shape[1], 1, 'classification')
         
-        early_stopping = keras.callbacks.EarlyStopping(patience=10, restore_best_weights=True)
+        early_stopping = _keras().callbacks.EarlyStopping(patience=10, restore_best_weights=True)
         
         self.model_goals.fit(
             X_train, y_goals_train,
@@ -161,98 +176,105 @@ class NeuralPredictor:
         print(f"Acurácia Resultado: {result_acc:.3f}")
         
         # Salva modelos
-        self.model_goals.save('neural_model_goals.h5')
-        self.model_result.save('neural_model_result.h5')
-        
-        with open('scaler.pkl', 'wb') as f:
-            pickle.dump(self.scaler, f)
+        _save_model(self.model_goals, MODEL_PATHS[0])
+        _save_model(self.model_result, MODEL_PATHS[1])
+        save_pickle(self.scaler, MODEL_PATHS[2])
+        self.export_numpy()
         
         print("Modelos salvos com sucesso!")
     
+    def export_numpy(self, path=NEURAL_EXPORT_PATH):
+        """Exporta pesos, ativações e scaler para o .npz usado na previsão sem TensorFlow"""
+        if self.model_goals is None:
+            self.model_goals, self.model_result, self.scaler = _load_artifacts(MODEL_PATHS)
+        export_keras({'goals': self.model_goals, 'result': self.model_result}, self.scaler, path)
+        
+        # Confere a exportação contra o Keras nas partidas do feature store
+        X = self.create_advanced_features()[0]
+        if X is not None:
+            X = X[-1000:]
+            goals, result, scaler = load_exported((path,))
+            exported, original = scaler.transform(X), self.scaler.transform(X)
+            diff = max(
+                np.abs(goals.predict(exported) - self.model_goals.predict(original, verbose=0)).max(),
+                np.abs(result.predict(exported) - self.model_result.predict(original, verbose=0)).max()
+            )
+            print(f"Diferença máxima NumPy x Keras: {diff:.2e}")
+        print(f"Modelos exportados para {path}")
+    
     def load_models(self):
-        """Carrega modelos treinados"""
+        """Carrega modelos treinados (uma vez por processo; recarrega se os arquivos mudarem)"""
         try:
-            self.model_goals = keras.models.load_model('neural_model_goals.h5')
-            self.model_result = keras.models.load_model('neural_model_result.h5')
-            
-            with open('scaler.pkl', 'rb') as f:
-                self.scaler = pickle.load(f)
-            
+            # Exportação NumPy quando existir; os .h5 (e o TensorFlow) só na falta dela
+            if os.path.exists(NEURAL_EXPORT_PATH):
+                artifact = get_registry().load('neural', (NEURAL_EXPORT_PATH,), load_exported)
+            else:
+                artifact = get_registry().load('neural_keras', MODEL_PATHS, _load_artifacts)
+            self.model_goals, self.model_result, self.scaler = artifact
             return True
         except:
             return False
     
     def prepare_match_features(self, home_team, away_team):
         """Prepara features para uma partida específica"""
-        conn = sqlite3.connect('football.db')
-        
-        # Busca estatísticas dos times
-        home_query = "SELECT * FROM team_stats WHERE team_name = ?"
-        away_query = "SELECT * FROM team_stats WHERE team_name = ?"
-        
-        home_stats = pd.read_sql(home_query, conn, params=(home_team,))
-        away_stats = pd.read_sql(away_query, conn, params=(away_team,))
-        
-        conn.close()
-        
-        if home_stats.empty or away_stats.empty:
-            return None
-        
-        # Cria features
-        features = [
-            home_stats['goals_scored'].iloc[0],
-            home_stats['goals_conceded'].iloc[0],
-            home_stats['wins'].iloc[0],
-            away_stats['goals_scored'].iloc[0],
-            away_stats['goals_conceded'].iloc[0],
-            away_stats['wins'].iloc[0]
-        ]
-        
-        # Features derivadas
-        home_goal_diff = features[0] - features[1]
-        away_goal_diff = features[3] - features[4]
-        
-        features.extend([
-            home_goal_diff,
-            away_goal_diff,
-            home_goal_diff - away_goal_diff,
-            (features[2] * 3 + home_goal_diff) / 10,  # home_strength
-            (features[5] * 3 + away_goal_diff) / 10,  # away_strength
-            ((features[2] * 3 + home_goal_diff) - (features[5] * 3 + away_goal_diff)) / 10,  # strength_diff
-            1  # home_advantage
-        ])
-        
-        return np.array(features).reshape(1, -1)
+        features, found = self.prepare_matches_features([(home_team, away_team)])
+        return features if found else None
+    
+    def prepare_matches_features(self, pairs):
+        """(matriz de features, posições em pairs) dos confrontos com os dois times no feature store"""
+        # Estado atual dos times no feature store, na ordem de FEATURE_NAMES
+        rows, found = get_feature_store().matches_features(pairs)
+        return self._feature_matrix(rows), found
     
     def predict_match(self, home_team, away_team):
         """Faz previsão usando rede neural"""
+        return self.predict_matches([(home_team, away_team)])[0]
+    
+    def predict_matches(self, pairs):
+        """Previsões de vários confrontos em um único passo por modelo; None onde faltam dados"""
+        pairs = list(pairs)
+        results = [None] * len(pairs)
         if not self.load_models():
             print("Modelos não encontrados. Treine primeiro.")
-            return None
+            return results
+        
+        features, found = self.prepare_matches_features(pairs)
+        if not found:
+            return results
         
-        features = self.prepare_match_features(home_team, away_team)
-        if features is None:
-            return None
+        # Modelos salvos antes das features de forma e Elo esperam menos colunas
+        if features.shape[1] != getattr(self.scaler, 'n_features_in_', features.shape[1]):
+            print("Modelos desatualizados para as features atuais. Treine novamente.")
+            return results
         
         # Normaliza features
         features_scaled = self.scaler.transform(features)
         
-        # Previsões
-        goals_prob = self.model_goals.predict(features_scaled, verbose=0)[0][0]
-        result_probs = self.model_result.predict(features_scaled, verbose=0)[0]
-        
-        return {
-            'over_2_5_prob': float(goals_prob),
-            'under_2_5_prob': float(1 - goals_prob),
-            'away_win_prob': float(result_probs[0]),
-            'draw_prob': float(result_probs[1]),
-            'home_win_prob': float(result_probs[2]),
-            'confidence': 'Alta' if max(result_probs) > 0.6 else 'Média' if max(result_probs) > 0.4 else 'Baixa',
-            'model_type': 'Neural Network'
-        }
+        # Previsões de todas as partidas de uma vez
+        goals_probs = self.model_goals.predict(features_scaled, batch_size=len(found), verbose=0)[:, 0]
+        result_probs = self.model_result.predict(features_scaled, batch_size=len(found), verbose=0)
+        
+        for i, goals_prob, probs in zip(found, goals_probs, result_probs):
+            results[i] = {
+                'over_2_5_prob': float(goals_prob),
+                'under_2_5_prob': float(1 - goals_prob),
+                'away_win_prob': float(probs[0]),
+                'draw_prob': float(probs[1]),
+                'home_win_prob': float(probs[2]),
+                'confidence': 'Alta' if max(probs) > 0.6 else 'Média' if max(probs) > 0.4 else 'Baixa',
+                'model_type': 'Neural Network'
+            }
+        
+        return results
 
 if __name__ == "__main__":
     predictor = NeuralPredictor()
+    
+    # Só exporta os .h5 já treinados: python neural_predictor.py --export
+    if '--export' in sys.argv:
+        predictor.export_numpy()
+        sys.exit(0)
+    
     predictor.train_models()
     
     # Teste
@@ -0,0 +1,221 @@
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import requests
+
+# Prioridades (menor valor sai primeiro da fila)
+PRIORITY_HIGH = 0     # Jogos de hoje, consultados pelas rotas
+PRIORITY_NORMAL = 5   # Coleta incremental diária
+PRIORITY_LOW = 10     # Backfill de temporadas antigas
+
+# Cabeçalhos de cota da football-data.org (v4 e versões anteriores)
+AVAILABLE_HEADERS = ('X-Requests-Available-Minute', 'X-RequestsAvailable', 'X-Requests-Available')
+RESET_HEADERS = ('X-RequestCounter-Reset', 'Retry-After')
+
+DEFAULT_DEADLINE = 300.0  # Espera máxima (s) de quem chama, da fila até a última retentativa
+
+def _header_int(response, names):
+    """Lê o primeiro cabeçalho numérico presente"""
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                pass
+    return None
+
+class TokenBucket:
+    """Balde de fichas: no máximo `rate` requisições a cada `per` segundos"""
+
+    def __init__(self, rate, per=60.0, capacity=None):
+        self.fill_rate = rate / per
+        self.capacity = capacity or rate
+        self.tokens = float(self.capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+
+    def acquire(self):
+        """Bloqueia até haver uma ficha disponível"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+    def refund(self):
+        """Devolve uma ficha não utilizada"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def block_for(self, seconds):
+        """Suspende a saída de requisições por alguns segundos"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def sync(self, available, reset_seconds=None):
+        """Ajusta o saldo à cota informada pelo servidor"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = float(min(self.capacity, max(0, available)))
+        if available <= 0 and reset_seconds:
+            self.block_for(reset_seconds)
+
+class RequestScheduler:
+    """Fila única de requisições à API com limite de taxa, prioridade e retentativas"""
+
+    def __init__(self, session=None, rate=10, per=60.0, workers=8,
+                 max_retries=4, backoff=2.0, max_backoff=60.0, default_deadline=DEFAULT_DEADLINE):
+        self.session = session or requests.Session()
+        self.bucket = TokenBucket(rate, per)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.default_deadline = default_deadline
+
+        self.stats = {'sent': 0, 'retries': 0, 'throttled': 0, 'failed': 0, 'expired': 0}
+        self._stats_lock = threading.Lock()
+
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-request')
+        threading.Thread(target=self._dispatch, name='api-scheduler', daemon=True).start()
+
+    def submit(self, url, params=None, headers=None, priority=PRIORITY_NORMAL, timeout=10, deadline=None):
+        """Enfileira um GET e retorna um Future com a resposta
+
+        Passado o prazo (deadline, padrão default_deadline) a requisição não é
+        mais enviada nem retentada e o Future recebe TimeoutError.
+        """
+        deadline = self.default_deadline if deadline is None else deadline
+        job = {
+            'url': url,
+            'params': params,
+            'headers': headers,
+            'timeout': timeout,
+            'expires': time.monotonic() + deadline,
+            'attempt': 0,
+            'future': Future()
+        }
+        self._put(priority, job)
+        return job['future']
+
+    def request(self, url, params=None, headers=None, priority=PRIORITY_NORMAL, timeout=10, deadline=None):
+        """GET síncrono através da fila; TimeoutError quando o prazo acaba"""
+        deadline = self.default_deadline if deadline is None else deadline
+        future = self.submit(url, params, headers, priority, timeout, deadline)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            # Quem chamou desistiu: ainda na fila, a requisição sai sem gastar cota
+            future.cancel()
+            raise TimeoutError(f"Prazo esgotado para {url}") from None
+
+    def _put(self, priority, job):
+        self._queue.put((priority, next(self._seq), job))
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _dispatch(self):
+        """Libera requisições conforme o balde, sempre a de maior prioridade"""
+        while True:
+            item = self._queue.get()
+            if self._drop(item[2]):
+                continue  # Cancelada ou vencida: não espera ficha por ela
+            self.bucket.acquire()
+
+            # Reavalia a fila: algo mais urgente pode ter chegado durante a espera
+            self._queue.put(item)
+            priority, _, job = self._queue.get()
+
+            if self._drop(job):
+                self.bucket.refund()
+                continue
+            if job['attempt'] == 0 and not job['future'].set_running_or_notify_cancel():
+                self.bucket.refund()
+                continue
+
+            self._pool.submit(self._send, priority, job)
+
+    def _drop(self, job):
+        """Descarta da fila a requisição cancelada por quem chamou ou com prazo vencido"""
+        future = job['future']
+        if future.cancelled():
+            return True
+        if time.monotonic() > job['expires']:
+            self._count('expired')
+            if job['attempt'] == 0 and not future.set_running_or_notify_cancel():
+                return True
+            future.set_exception(TimeoutError(f"Prazo esgotado para {job['url']}"))
+            return True
+        return False
+
+    def _send(self, priority, job):
+        try:
+            response = self.session.get(
+                job['url'], params=job['params'], headers=job['headers'], timeout=job['timeout']
+            )
+        except requests.RequestException as e:
+            self._retry(priority, job, error=e)
+            return
+
+        self._count('sent')
+
+        available = _header_int(response, AVAILABLE_HEADERS)
+        reset = _header_int(response, RESET_HEADERS)
+        if available is not None:
+            self.bucket.sync(available, reset)
+
+        if response.status_code == 429:
+            # Cota esgotada: pausa todas as requisições até o contador zerar
+            self._count('throttled')
+            wait = reset if reset is not None else self._backoff_delay(job['attempt'])
+            self.bucket.block_for(wait)
+            self._retry(priority, job, response=response, delay=0)
+        elif response.status_code >= 500:
+            self._retry(priority, job, response=response)
+        else:
+            job['future'].set_result(response)
+
+    def _backoff_delay(self, attempt):
+        """Espera exponencial com jitter"""
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _retry(self, priority, job, response=None, error=None, delay=None):
+        """Reenfileira a requisição ou entrega a última falha"""
+        if job['attempt'] >= self.max_retries:
+            self._count('failed')
+            if response is not None:
+                job['future'].set_result(response)
+            else:
+                job['future'].set_exception(error)
+            return
+
+        self._count('retries')
+        if delay is None:
+            delay = self._backoff_delay(job['attempt'])
+        job['attempt'] += 1
+
+        timer = threading.Timer(delay, self._put, (priority, job))
+        timer.daemon = True
+        timer.start()
@@ -0,0 +1,65 @@
+import glob
+import gzip
+import heapq
+import json
+import os
+import threading
+import time
+
+ARCHIVE_DIR = os.getenv('FOOTBALL_ARCHIVE_DIR', 'archive')
+
+class ResponseArchive:
+    """Arquivo somente-anexação e comprimido das respostas brutas da API
+
+    Um arquivo por liga e mês do início do intervalo
+    (archive/<liga>/<AAAA-MM>.jsonl.gz). Cada resposta vira um membro gzip
+    independente com uma linha JSON, então anexar nunca reescreve dados.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or ARCHIVE_DIR
+        self._lock = threading.Lock()
+
+    def _path(self, league_code, date_from):
+        return os.path.join(self.root, league_code, f'{date_from[:7]}.jsonl.gz')
+
+    def append(self, league_code, date_from, date_to, payload):
+        """Grava uma resposta da API para o intervalo informado"""
+        record = {
+            'league_code': league_code,
+            'date_from': date_from,
+            'date_to': date_to,
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'payload': payload
+        }
+        data = gzip.compress((json.dumps(record, separators=(',', ':')) + '\n').encode())
+
+        path = self._path(league_code, date_from)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Uma única escrita em O_APPEND: o membro gzip fica inteiro mesmo com vários processos
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def leagues(self):
+        """Códigos de liga presentes no arquivo"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def _read_file(self, path):
+        with gzip.open(path, 'rt') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def records(self, league_code):
+        """Respostas de uma liga em ordem de coleta"""
+        files = sorted(glob.glob(os.path.join(self.root, league_code, '*.jsonl.gz')))
+        # Cada arquivo já está em ordem de coleta; a junção mantém a ordem global
+        return heapq.merge(*(self._read_file(path) for path in files),
+                           key=lambda record: record['fetched_at'])
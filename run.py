@@ -20,12 +20,9 @@ def setup_system():
     init_db()
     
     # Verifica se há dados
-    import sqlite3
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM games')
-    game_count = cursor.fetchone()[0]
-    conn.close()
+    from db_pool import get_pool
+    with get_pool().reader() as conn:
+        game_count = conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
     
     if game_count == 0:
         print("📥 Coletando dados iniciais...")
@@ -53,6 +50,10 @@ if __name__ == "__main__":
     # Configuração inicial
     setup_system()
     
+    # Servidor já aceita conexões; /ready responde 503 até o aquecimento terminar
+    from warmup import warm_up_in_background
+    warm_up_in_background()
+    
     # Inicia coletor de dados em background
     collector_thread = threading.Thread(target=run_data_collector, daemon=True)
     collector_thread.start()
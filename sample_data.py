@@ -1,102 +1,127 @@
-import sqlite3
 from datetime import datetime, timedelta
 import random
+from migrations import migrate
+from db_pool import get_pool
+from feature_store import get_feature_store
+from elo import replay_ratings
+from form_table import refresh_form
+from h2h_matrix import refresh_h2h
 
-def create_sample_data():
-    """Cria dados de exemplo para testar o sistema"""
-    conn = sqlite3.connect('football.db')
-    cursor = conn.cursor()
-    
-    # Inicializa tabelas se não existirem
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS games (
-            id INTEGER PRIMARY KEY,
-            home_team TEXT,
-            away_team TEXT,
-            date TEXT,
-            home_goals INTEGER,
-            away_goals INTEGER,
-            competition TEXT
-        )
-    ''')
+def generate_api_matches(league_code, date_from, date_to, matches_per_day=4, seed=None):
+    """Gera partidas no formato da API football-data.org (v4), estáveis por dia"""
+    teams = [f'{league_code} Team {i:02d}' for i in range(1, 21)]
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS team_stats (
-            id INTEGER PRIMARY KEY,
-            team_name TEXT,
-            goals_scored REAL,
-            goals_conceded REAL,
-            wins INTEGER,
-            draws INTEGER,
-            losses INTEGER,
-            last_updated TEXT
-        )
-    ''')
+    start = datetime.strptime(date_from, '%Y-%m-%d')
+    end = datetime.strptime(date_to, '%Y-%m-%d')
+    today = datetime.now().strftime('%Y-%m-%d')
     
-    # Times de exemplo
-    teams = [
-        'Real Madrid', 'Barcelona', 'Manchester City', 'Liverpool',
-        'Bayern Munich', 'PSG', 'Chelsea', 'Arsenal',
-        'Juventus', 'AC Milan', 'Atletico Madrid', 'Tottenham'
-    ]
-    
-    # Gera jogos dos últimos 30 dias
-    for i in range(100):
-        home_team = random.choice(teams)
-        away_team = random.choice([t for t in teams if t != home_team])
-        
-        # Gols baseados em probabilidades realistas
-        home_goals = random.choices([0,1,2,3,4,5], weights=[10,25,30,20,10,5])[0]
-        away_goals = random.choices([0,1,2,3,4], weights=[15,30,25,20,10])[0]
+    matches = []
+    day = start
+    while day <= end:
+        day_str = day.strftime('%Y-%m-%d')
+        rng = random.Random(f'{seed}:{league_code}:{day_str}')
+        playing = rng.sample(teams, matches_per_day * 2)
         
-        game_date = datetime.now() - timedelta(days=random.randint(1, 30))
+        for i in range(matches_per_day):
+            finished = day_str < today
+            home_goals = rng.choices([0,1,2,3,4,5], weights=[10,25,30,20,10,5])[0]
+            away_goals = rng.choices([0,1,2,3,4], weights=[15,30,25,20,10])[0]
+            
+            matches.append({
+                'id': int(day.strftime('%Y%m%d')) * 10**7 + int(league_code, 36) * 100 + i,
+                'utcDate': f'{day_str}T{15 + i % 5:02d}:00:00Z',
+                'status': 'FINISHED' if finished else 'TIMED',
+                'lastUpdated': f'{day_str}T23:00:00Z',
+                'homeTeam': {'name': playing[2 * i]},
+                'awayTeam': {'name': playing[2 * i + 1]},
+                'score': {'fullTime': {
+                    'home': home_goals if finished else None,
+                    'away': away_goals if finished else None
+                }}
+            })
         
-        cursor.execute('''
-            INSERT OR IGNORE INTO games 
-            (id, home_team, away_team, date, home_goals, away_goals, competition)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            1000 + i, home_team, away_team, game_date.isoformat(),
-            home_goals, away_goals, 'Premier League'
-        ))
+        day += timedelta(days=1)
     
-    # Calcula estatísticas dos times
-    for team in teams:
-        # Como mandante
-        cursor.execute('''
-            SELECT AVG(home_goals), AVG(away_goals),
-                   SUM(CASE WHEN home_goals > away_goals THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN home_goals = away_goals THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN home_goals < away_goals THEN 1 ELSE 0 END)
-            FROM games WHERE home_team = ?
-        ''', (team,))
-        home_stats = cursor.fetchone()
+    return {'matches': matches, 'resultSet': {'count': len(matches)}}
+
+def create_sample_data():
+    """Cria dados de exemplo para testar o sistema"""
+    with get_pool().writer() as conn:
+        cursor = conn.cursor()
+        
+        # Inicializa tabelas se não existirem
+        migrate(conn)
         
-        # Como visitante
-        cursor.execute('''
-            SELECT AVG(away_goals), AVG(home_goals),
-                   SUM(CASE WHEN away_goals > home_goals THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN away_goals = home_goals THEN 1 ELSE 0 END),
-                   SUM(CASE WHEN away_goals < home_goals THEN 1 ELSE 0 END)
-            FROM games WHERE away_team = ?
-        ''', (team,))
-        away_stats = cursor.fetchone()
+        # Times de exemplo
+        teams = [
+            'Real Madrid', 'Barcelona', 'Manchester City', 'Liverpool',
+            'Bayern Munich', 'PSG', 'Chelsea', 'Arsenal',
+            'Juventus', 'AC Milan', 'Atletico Madrid', 'Tottenham'
+        ]
         
-        # Combina estatísticas
-        avg_goals = (home_stats[0] + away_stats[0]) / 2
-        avg_conceded = (home_stats[1] + away_stats[1]) / 2
-        wins = (home_stats[2] or 0) + (away_stats[2] or 0)
-        draws = (home_stats[3] or 0) + (away_stats[3] or 0)
-        losses = (home_stats[4] or 0) + (away_stats[4] or 0)
+        # Gera jogos dos últimos 30 dias
+        for i in range(100):
+            home_team = random.choice(teams)
+            away_team = random.choice([t for t in teams if t != home_team])
+            
+            # Gols baseados em probabilidades realistas
+            home_goals = random.choices([0,1,2,3,4,5], weights=[10,25,30,20,10,5])[0]
+            away_goals = random.choices([0,1,2,3,4], weights=[15,30,25,20,10])[0]
+            
+            game_date = datetime.now() - timedelta(days=random.randint(1, 30))
+            
+            cursor.execute('''
+                INSERT OR IGNORE INTO games 
+                (id, home_team, away_team, date, home_goals, away_goals, competition, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'FINISHED')
+            ''', (
+                1000 + i, home_team, away_team, game_date.isoformat(),
+                home_goals, away_goals, 'Premier League'
+            ))
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO team_stats 
-            (team_name, goals_scored, goals_conceded, wins, draws, losses, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (team, avg_goals, avg_conceded, wins, draws, losses, datetime.now().isoformat()))
+        # Confrontos diretos, forma e ratings dos jogos gerados
+        refresh_h2h(conn)
+        refresh_form(conn)
+        replay_ratings(conn)
+        
+        # Calcula estatísticas dos times
+        for team in teams:
+            # Como mandante
+            cursor.execute('''
+                SELECT AVG(home_goals), AVG(away_goals),
+                       SUM(CASE WHEN home_goals > away_goals THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN home_goals = away_goals THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN home_goals < away_goals THEN 1 ELSE 0 END)
+                FROM games WHERE home_team = ?
+            ''', (team,))
+            home_stats = cursor.fetchone()
+            
+            # Como visitante
+            cursor.execute('''
+                SELECT AVG(away_goals), AVG(home_goals),
+                       SUM(CASE WHEN away_goals > home_goals THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN away_goals = home_goals THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN away_goals < home_goals THEN 1 ELSE 0 END)
+                FROM games WHERE away_team = ?
+            ''', (team,))
+            away_stats = cursor.fetchone()
+            
+            # Combina estatísticas
+            avg_goals = (home_stats[0] + away_stats[0]) / 2
+            avg_conceded = (home_stats[1] + away_stats[1]) / 2
+            wins = (home_stats[2] or 0) + (away_stats[2] or 0)
+            draws = (home_stats[3] or 0) + (away_stats[3] or 0)
+            losses = (home_stats[4] or 0) + (away_stats[4] or 0)
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO team_stats 
+                (team_name, goals_scored, goals_conceded, wins, draws, losses, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (team, avg_goals, avg_conceded, wins, draws, losses, datetime.now().isoformat()))
+    
+    # Features das partidas geradas, para treinar sem esperar a primeira coleta
+    get_feature_store().refresh()
     
-    conn.commit()
-    conn.close()
     print("Dados de exemplo criados com sucesso!")
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+import numpy as np
+
+MAX_GOALS = 10                                   # Placar truncado em 0..MAX_GOALS para cada time
+TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)     # Linhas de over/under
+HANDICAP_LINES = tuple(float(line) for line in np.arange(-2.5, 2.75, 0.25))  # Handicap asiático do mandante
+
+def poisson_pmf(rate, max_goals=MAX_GOALS):
+    """P(X = k) para k = 0..max_goals, para cada taxa de rate (shape (n, max_goals + 1))"""
+    rate = np.asarray(rate, dtype=float)[:, None]
+    k = np.arange(max_goals + 1)
+    # log evita estouro de k! e rate**k
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, max_goals + 1)))))
+    return np.exp(k * np.log(np.maximum(rate, 1e-12)) - rate - log_factorial)
+
+def score_matrix(home_xg, away_xg, max_goals=MAX_GOALS, rho=None):
+    """Matrizes P(mandante = i, visitante = j), uma por partida (shape (n, G + 1, G + 1))
+
+    Gols independentes de Poisson; rho aplica a correção de Dixon-Coles aos
+    placares 0-0, 1-0, 0-1 e 1-1. Cada matriz é normalizada para somar 1.
+    """
+    home_xg = np.atleast_1d(np.asarray(home_xg, dtype=float))
+    away_xg = np.atleast_1d(np.asarray(away_xg, dtype=float))
+    matrix = poisson_pmf(home_xg, max_goals)[:, :, None] * poisson_pmf(away_xg, max_goals)[:, None, :]
+
+    if rho:
+        tau = np.ones((len(home_xg), 2, 2))
+        tau[:, 0, 0] = 1 - home_xg * away_xg * rho
+        tau[:, 0, 1] = 1 + home_xg * rho
+        tau[:, 1, 0] = 1 + away_xg * rho
+        tau[:, 1, 1] = 1 - rho
+        matrix[:, :2, :2] *= np.maximum(tau, 0)
+
+    return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+def _diagonal_masks(size):
+    """Matrizes 0/1 que somam a matriz de placar por total de gols e por saldo do mandante"""
+    i, j = np.indices((size, size))
+    k = np.arange(2 * size - 1)
+    totals = ((i + j).ravel()[:, None] == k).astype(float)
+    diffs = ((i - j).ravel()[:, None] == k - (size - 1)).astype(float)
+    return totals, diffs
+
+def _distributions(matrix):
+    """Distribuição do total de gols e do saldo do mandante (índice = saldo + G), por produto de matrizes"""
+    total_mask, diff_mask = _diagonal_masks(matrix.shape[1])
+    flat = matrix.reshape(len(matrix), -1)
+    return flat @ total_mask, flat @ diff_mask
+
+def _handicap(diffs, line):
+    """(vitória, devolução, derrota) do mandante com handicap inteiro ou de meio gol"""
+    offset = (diffs.shape[1] - 1) // 2
+    margin = np.arange(diffs.shape[1]) - offset + line
+    return (diffs[:, margin > 0].sum(axis=1),
+            diffs[:, margin == 0].sum(axis=1),
+            diffs[:, margin < 0].sum(axis=1))
+
+def asian_handicap(diffs, line):
+    """Handicap asiático do mandante; linhas de quarto dividem a aposta entre as duas vizinhas"""
+    if (line * 4) % 2:
+        low = _handicap(diffs, line - 0.25)
+        high = _handicap(diffs, line + 0.25)
+        return tuple((a + b) / 2 for a, b in zip(low, high))
+    return _handicap(diffs, line)
+
+def markets(matrix, total_lines=TOTAL_LINES, handicap_lines=HANDICAP_LINES, top_scores=5):
+    """Todos os mercados de um lote de matrizes de placar, em arrays de shape (n,)"""
+    size = matrix.shape[1]
+    totals, diffs = _distributions(matrix)
+    offset = size - 1
+
+    result = {
+        'home_win': diffs[:, offset + 1:].sum(axis=1),
+        'draw': diffs[:, offset],
+        'away_win': diffs[:, :offset].sum(axis=1),
+        'btts': matrix[:, 1:, 1:].sum(axis=(1, 2)),
+        'over': {line: totals[:, int(np.floor(line)) + 1:].sum(axis=1) for line in total_lines},
+        'asian_handicap': {line: asian_handicap(diffs, line) for line in handicap_lines},
+    }
+
+    # Placares mais prováveis: índices ordenados da matriz achatada
+    flat = matrix.reshape(len(matrix), -1)
+    best = np.argsort(-flat, axis=1)[:, :top_scores]
+    result['correct_score'] = [
+        [(f'{index // size}-{index % size}', float(flat[n, index])) for index in row]
+        for n, row in enumerate(best)
+    ]
+    return result
+
+def match_markets(home_xg, away_xg, rho=None, max_goals=MAX_GOALS):
+    """Mercados de cada partida como lista de dicionários (arredondados para a API)"""
+    home_xg = np.atleast_1d(np.asarray(home_xg, dtype=float))
+    away_xg = np.atleast_1d(np.asarray(away_xg, dtype=float))
+    m = markets(score_matrix(home_xg, away_xg, max_goals, rho))
+
+    return [{
+        'home_xg': round(float(home_xg[n]), 2),
+        'away_xg': round(float(away_xg[n]), 2),
+        'home_win_prob': round(float(m['home_win'][n]), 3),
+        'draw_prob': round(float(m['draw'][n]), 3),
+        'away_win_prob': round(float(m['away_win'][n]), 3),
+        'btts_prob': round(float(m['btts'][n]), 3),
+        'over_under': {
+            str(line): {'over': round(float(p[n]), 3), 'under': round(float(1 - p[n]), 3)}
+            for line, p in m['over'].items()
+        },
+        'asian_handicap': {
+            f'{line:+g}': {'home': round(float(w[n]), 3), 'push': round(float(p[n]), 3), 'away': round(float(l[n]), 3)}
+            for line, (w, p, l) in m['asian_handicap'].items()
+        },
+        'correct_score': [{'score': score, 'prob': round(prob, 3)} for score, prob in m['correct_score'][n]]
+    } for n in range(len(home_xg))]
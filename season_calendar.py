@@ -0,0 +1,19 @@
+from datetime import date, timedelta
+
+# Mês em que a temporada começa; as ligas europeias vão de agosto a maio
+DEFAULT_START_MONTH = 7
+SEASON_START_MONTH = {
+    'BSA': 1,  # Brasileirão segue o ano civil
+}
+
+def season_start(league_code=None, today=None):
+    """Primeiro dia da temporada em curso da liga (AAAA-MM-DD)"""
+    today = today or date.today()
+    month = SEASON_START_MONTH.get(league_code, DEFAULT_START_MONTH)
+    year = today.year if today.month >= month else today.year - 1
+    return date(year, month, 1).isoformat()
+
+def season_end(league_code=None, today=None):
+    """Último dia da temporada em curso da liga (véspera do início da próxima)"""
+    start = date.fromisoformat(season_start(league_code, today))
+    return (date(start.year + 1, start.month, 1) - timedelta(days=1)).isoformat()
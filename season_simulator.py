@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+
+from db_pool import get_pool
+from season_calendar import season_start
+from stats_analyzer import StatsAnalyzer
+
+DEFAULT_SEASONS = 10000
+_CHUNK = 5000  # Temporadas por bloco de sorteio (5000 x 380 float32 ≈ 7,6 MB)
+
+# Partidas sem resultado que ainda serão disputadas
+PENDING_STATUSES = ('SCHEDULED', 'TIMED', 'IN_PLAY', 'PAUSED')
+
+def load_season(league_code, since=None, db_path=None, today=None):
+    """(times, tabela atual, partidas restantes) de uma liga a partir de since
+
+    Tabela: {time: (pontos, saldo de gols)} das partidas encerradas.
+    Restantes: [(mandante, visitante)] das partidas agendadas (PENDING_STATUSES)
+    de hoje em diante, em ordem de data. Adiadas, canceladas e partidas
+    passadas que ficaram sem resultado não entram na simulação.
+    """
+    since = since or season_start(league_code, today)
+    today = (today or date.today()).isoformat()
+    with get_pool(db_path).reader() as conn:
+        games = conn.execute('''
+            SELECT home_team, away_team, home_goals, away_goals, status, date FROM games
+            WHERE league_code = ? AND date >= ? AND home_team <> away_team
+            ORDER BY date, id
+        ''', (league_code, since)).fetchall()
+
+    table, remaining = {}, []
+    for home, away, home_goals, away_goals, status, match_date in games:
+        for team in (home, away):
+            table.setdefault(team, (0, 0))
+        if home_goals is None or away_goals is None:
+            if status in PENDING_STATUSES and match_date >= today:
+                remaining.append((home, away))
+            continue
+        diff = home_goals - away_goals
+        home_points = 3 if diff > 0 else 1 if diff == 0 else 0
+        away_points = 3 if diff < 0 else 1 if diff == 0 else 0
+        table[home] = (table[home][0] + home_points, table[home][1] + diff)
+        table[away] = (table[away][0] + away_points, table[away][1] - diff)
+
+    return sorted(table), table, remaining
+
+def _simulate_chunk(args):
+    """Contagem (times x posições) de n temporadas simuladas, e soma dos pontos finais"""
+    seed, n, base_key, home_idx, away_idx, cum_probs, base_points = args
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_key)
+    counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    points_sum = np.zeros(n_teams)
+
+    # Matrizes partida -> time: pontos por time = pontos por partida @ incidência
+    home_map = np.zeros((len(home_idx), n_teams), dtype=np.float32)
+    away_map = np.zeros((len(away_idx), n_teams), dtype=np.float32)
+    home_map[np.arange(len(home_idx)), home_idx] = 1
+    away_map[np.arange(len(away_idx)), away_idx] = 1
+
+    for start in range(0, n, _CHUNK):
+        size = min(_CHUNK, n - start)
+        u = rng.random((size, len(home_idx)), dtype=np.float32)
+        home_win = u < cum_probs[0]
+        draw = ~home_win & (u < cum_probs[1])
+        away_win = ~home_win & ~draw
+
+        home_points = 3 * home_win.astype(np.float32) + draw
+        away_points = 3 * away_win.astype(np.float32) + draw
+        points = home_points @ home_map + away_points @ away_map
+        points_sum += points.sum(axis=0)
+
+        # Classificação: pontos, saldo atual e, no empate, sorteio
+        key = (base_key + points * 1000 + rng.random((size, n_teams))).astype(np.float64)
+        order = np.argsort(-key, axis=1)
+        for position in range(n_teams):
+            counts[:, position] += np.bincount(order[:, position], minlength=n_teams)
+
+    return counts, points_sum + n * base_points
+
+def simulate_seasons(teams, table, fixtures, probabilities, n_seasons=DEFAULT_SEASONS, workers=None, seed=None):
+    """Distribuição da posição final de cada time em n_seasons temporadas simuladas
+
+    probabilities: (vitória do mandante, empate, vitória do visitante) de cada
+    partida de fixtures. Só o resultado de cada partida restante é sorteado; o
+    saldo de gols fica o atual e desempata antes do sorteio. Os blocos de
+    temporadas são divididos entre processos (workers=None usa todos os núcleos;
+    workers=1 roda no próprio processo, sem criar um pool).
+    """
+    index = {team: i for i, team in enumerate(teams)}
+    home_idx = np.array([index[home] for home, _ in fixtures], dtype=np.int64)
+    away_idx = np.array([index[away] for _, away in fixtures], dtype=np.int64)
+    probs = np.asarray(probabilities, dtype=float).reshape(-1, 3)
+    probs = probs / probs.sum(axis=1, keepdims=True)
+    cum_probs = np.cumsum(probs, axis=1).T[:2].astype(np.float32)
+
+    base_points = np.array([table[team][0] for team in teams], dtype=float)
+    base_diff = np.array([table[team][1] for team in teams], dtype=float)
+    # Saldo em (-500, 500) cabe abaixo de 1000 por ponto; o sorteio fica abaixo de 1 gol
+    base_key = base_points * 1000 + np.clip(base_diff, -499, 499)
+
+    workers = workers or os.cpu_count() or 1
+    per_worker = -(-n_seasons // workers)
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    jobs = [
+        (seeds[w], min(per_worker, n_seasons - w * per_worker), base_key, home_idx, away_idx, cum_probs, base_points)
+        for w in range(workers) if n_seasons - w * per_worker > 0
+    ]
+
+    if len(jobs) == 1:
+        results = [_simulate_chunk(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(_simulate_chunk, jobs))
+
+    counts = sum(r[0] for r in results)
+    points = sum(r[1] for r in results)
+    return counts / n_seasons, points / n_seasons
+
+def season_outlook(teams, positions, expected_points, top=4, relegated=3):
+    """Resumo por time: probabilidade de cada posição, título, G4, rebaixamento e pontos esperados"""
+    outlook = {}
+    for i, team in enumerate(teams):
+        outlook[team] = {
+            'positions': [round(float(p), 4) for p in positions[i]],
+            'title_prob': round(float(positions[i, 0]), 4),
+            'top_prob': round(float(positions[i, :top].sum()), 4),
+            'relegation_prob': round(float(positions[i, len(teams) - relegated:].sum()), 4),
+            'expected_points': round(float(expected_points[i]), 1),
+        }
+    return dict(sorted(outlook.items(), key=lambda item: -item[1]['expected_points']))
+
+def simulate_league(league_code, n_seasons=DEFAULT_SEASONS, since=None, db_path=None, workers=None, seed=None):
+    """Simula o restante da temporada da liga com as probabilidades do StatsAnalyzer
+
+    ValueError quando a liga tem partidas na temporada mas nenhuma restante
+    (calendário ainda não sincronizado ou temporada encerrada).
+    """
+    teams, table, fixtures = load_season(league_code, since, db_path)
+    if not teams:
+        return {}
+    if not fixtures:
+        raise ValueError('Nenhuma partida restante na temporada')
+
+    predictions = StatsAnalyzer(db_path).calculate_match_probabilities_batch(fixtures)
+    probabilities = [(p['home_win_prob'], p['draw_prob'], p['away_win_prob']) for p in predictions]
+
+    positions, expected_points = simulate_seasons(teams, table, fixtures, probabilities, n_seasons, workers, seed)
+    return season_outlook(teams, positions, expected_points)
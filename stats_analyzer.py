@@ -1,188 +1,207 @@
-import sqlite3
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from db_pool import get_pool
+from elo import expected_home, team_ratings
+from form_table import FORM_WINDOWS, form_as_of
+from h2h_matrix import H2H_LAST_N, h2h_results, ordered_pair
+from scoreline import match_markets
+from team_index import get_team_index
+
+HOME_ADVANTAGE = 1.15  # Multiplicador dos gols esperados do mandante (e divisor do visitante)
 
 class StatsAnalyzer:
-    def __init__(self):
-        self.conn = sqlite3.connect('football.db')
+    def __init__(self, db_path=None, dixon_coles_rho=None):
+        self.pool = get_pool(db_path)
+        # Janelas de forma fora de team_form vêm do índice em memória compartilhado
+        self.index = get_team_index(db_path)
+        # Correção de Dixon-Coles para placares baixos (None = Poisson independente)
+        self.dixon_coles_rho = dixon_coles_rho
     
-    def get_team_form(self, team_name, last_n_games=5):
-        """Analisa forma recente do time"""
-        query = '''
-            SELECT home_goals, away_goals, 
-                   CASE WHEN home_team = ? THEN 'home' ELSE 'away' END as venue
-            FROM games 
-            WHERE (home_team = ? OR away_team = ?) 
-            AND home_goals IS NOT NULL
-            ORDER BY date DESC 
-            LIMIT ?
-        '''
-        
-        df = pd.read_sql(query, self.conn, params=(team_name, team_name, team_name, last_n_games))
-        
-        if df.empty:
-            return {'points': 0, 'goals_for': 0, 'goals_against': 0}
+    def get_team_form(self, team_name, last_n_games=5, before=None):
+        """Analisa forma recente do time (opcionalmente antes de uma data)"""
+        if last_n_games not in FORM_WINDOWS:
+            return self.index.get_team_form(team_name, last_n_games, before)
         
-        points = 0
-        goals_for = 0
-        goals_against = 0
+        with self.pool.reader() as conn:
+            row = form_as_of(conn, team_name, last_n_games, before)
         
-        for _, row in df.iterrows():
-            if row['venue'] == 'home':
-                gf, ga = row['home_goals'], row['away_goals']
-            else:
-                gf, ga = row['away_goals'], row['home_goals']
-            
-            goals_for += gf
-            goals_against += ga
-            
-            if gf > ga:
-                points += 3
-            elif gf == ga:
-                points += 1
+        if row is None:
+            return {'points': 0, 'goals_for': 0, 'goals_against': 0}
         
+        points, goals_for, goals_against, games = row
         return {
             'points': points,
             'goals_for': goals_for,
             'goals_against': goals_against,
-            'avg_goals_for': goals_for / len(df),
-            'avg_goals_against': goals_against / len(df)
+            'avg_goals_for': goals_for / games,
+            'avg_goals_against': goals_against / games
         }
     
     def head_to_head(self, team1, team2, last_n=5):
-        """Histórico de confrontos diretos"""
-        query = '''
-            SELECT home_team, away_team, home_goals, away_goals
-            FROM games 
-            WHERE ((home_team = ? AND away_team = ?) OR (home_team = ? AND away_team = ?))
-            AND home_goals IS NOT NULL
-            ORDER BY date DESC 
-            LIMIT ?
-        '''
-        
-        df = pd.read_sql(query, self.conn, params=(team1, team2, team2, team1, last_n))
-        
-        if df.empty:
+        """Histórico dos últimos last_n confrontos diretos"""
+        row = None
+        if last_n <= H2H_LAST_N:
+            with self.pool.reader() as conn:
+                row = conn.execute(
+                    'SELECT last_results FROM h2h WHERE team_low = ? AND team_high = ?',
+                    ordered_pair(team1, team2)
+                ).fetchone()
+        
+        results = self._h2h_results(row[0] if row else None, team1, team2, last_n)
+        if not results:
             return {'team1_wins': 0, 'draws': 0, 'team2_wins': 0, 'avg_goals': 2.5}
         
-        team1_wins = team2_wins = draws = total_goals = 0
-        
-        for _, row in df.iterrows():
-            hg, ag = row['home_goals'], row['away_goals']
-            total_goals += hg + ag
-            
-            if row['home_team'] == team1:
-                if hg > ag:
-                    team1_wins += 1
-                elif hg < ag:
-                    team2_wins += 1
-                else:
-                    draws += 1
-            else:
-                if ag > hg:
-                    team1_wins += 1
-                elif ag < hg:
-                    team2_wins += 1
-                else:
-                    draws += 1
-        
         return {
-            'team1_wins': team1_wins,
-            'draws': draws,
-            'team2_wins': team2_wins,
-            'avg_goals': total_goals / len(df),
-            'games_played': len(df)
+            'team1_wins': sum(g1 > g2 for g1, g2 in results),
+            'draws': sum(g1 == g2 for g1, g2 in results),
+            'team2_wins': sum(g1 < g2 for g1, g2 in results),
+            'avg_goals': sum(g1 + g2 for g1, g2 in results) / len(results),
+            'games_played': len(results)
         }
     
+    def _h2h_results(self, last_results, team1, team2, last_n):
+        """Confrontos guardados em h2h; além dos H2H_LAST_N de lá, vêm do índice em memória"""
+        if last_n > H2H_LAST_N:
+            return self.index.h2h_results(team1, team2, last_n)
+        return h2h_results(last_results, team1, team2, last_n)
+    
+    def team_history_frame(self, team_name):
+        """Histórico do time como DataFrame, para análises (pandas é importado só aqui)"""
+        import pandas as pd
+        
+        history = self.index.team_history(team_name)
+        if history is None:
+            return pd.DataFrame(columns=['match_id', 'date', 'opponent', 'venue', 'goals_for', 'goals_against'])
+        
+        return pd.DataFrame({
+            'match_id': history['match_id'],
+            'date': history['date'],
+            'opponent': [self.index.team_names[i] for i in history['opponent']],
+            'venue': np.where(history['is_home'], 'home', 'away'),
+            'goals_for': history['goals_for'],
+            'goals_against': history['goals_against']
+        })
+    
     def calculate_match_probabilities(self, home_team, away_team):
         """Calcula probabilidades baseadas em estatísticas"""
+        return self.calculate_match_probabilities_batch([(home_team, away_team)])[0]
+    
+    def _load_batch(self, pairs, last_n_form=5, last_n_h2h=5):
+        """Carrega team_stats, H2H, forma e rating Elo (tabelas materializadas) de todos os confrontos"""
+        teams = sorted({team for pair in pairs for team in pair})
+        team_values = ','.join(['(?)'] * len(teams))
+        keys = sorted({ordered_pair(home, away) for home, away in pairs})
+        key_values = ','.join(['(?, ?)'] * len(keys))
+        
+        with self.pool.reader() as conn:
+            stats = {
+                row[0]: row[1:]
+                for row in conn.execute(f'''
+                    SELECT team_name, goals_scored, goals_conceded, wins, draws, losses
+                    FROM team_stats WHERE team_name IN (SELECT column1 FROM (VALUES {team_values}))
+                ''', teams)
+            }
+            
+            # Uma linha de h2h por par ordenado, via chave primária
+            meetings = {
+                (low, high): last_results
+                for low, high, last_results in conn.execute(f'''
+                    SELECT team_low, team_high, last_results FROM h2h
+                    WHERE (team_low, team_high) IN (VALUES {key_values})
+                ''', [team for key in keys for team in key])
+            }
+            
+            # (pontos, gols pró, gols contra, jogos) após a última partida de cada time
+            form = {team: form_as_of(conn, team, last_n_form) for team in teams}
+            ratings = team_ratings(conn, teams)
+        
+        # Confrontos diretos de cada par, com gols na ordem (mandante do par, visitante do par)
+        h2h = {
+            i: self._h2h_results(meetings.get(ordered_pair(home, away)), home, away, last_n_h2h)
+            for i, (home, away) in enumerate(pairs)
+        }
         
-        # Forma recente
-        home_form = self.get_team_form(home_team)
-        away_form = self.get_team_form(away_team)
-        
-        # Confronto direto
-        h2h = self.head_to_head(home_team, away_team)
-        
-        # Estatísticas gerais
-        home_stats_query = "SELECT * FROM team_stats WHERE team_name = ?"
-        away_stats_query = "SELECT * FROM team_stats WHERE team_name = ?"
-        
-        home_stats = pd.read_sql(home_stats_query, self.conn, params=(home_team,))
-        away_stats = pd.read_sql(away_stats_query, self.conn, params=(away_team,))
-        
-        if home_stats.empty or away_stats.empty:
-            return self._default_probabilities()
+        return stats, form, h2h, ratings
+    
+    def calculate_match_probabilities_batch(self, pairs):
+        """Calcula probabilidades de vários confrontos (mandante, visitante) de uma vez"""
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        
+        stats, form, h2h, ratings = self._load_batch(pairs)
+        
+        # Só confrontos com estatísticas dos dois times seguem para o cálculo
+        valid = [i for i, (home, away) in enumerate(pairs) if home in stats and away in stats]
+        results = [self._default_probabilities() for _ in pairs]
+        if not valid:
+            return results
+        
+        def team_arrays(side):
+            names = [pairs[i][side] for i in valid]
+            team_stats = np.array([stats[name] for name in names], dtype=float)
+            points, gf, ga, n = np.array([form.get(name) or (0, 0, 0, 0) for name in names], dtype=float).T
+            # Ataque e defesa: média da temporada, combinada com a forma recente quando houver
+            attack = np.where(n > 0, (team_stats[:, 0] + gf / np.maximum(n, 1)) / 2, team_stats[:, 0])
+            defence = np.where(n > 0, (team_stats[:, 1] + ga / np.maximum(n, 1)) / 2, team_stats[:, 1])
+            return team_stats, points, attack, defence
+        
+        home_stats, home_points, home_attack, home_defence = team_arrays(0)
+        away_stats, away_points, away_attack, away_defence = team_arrays(1)
         
         # Cálculo de força dos times (0-100)
-        home_strength = self._calculate_team_strength(home_stats.iloc[0], home_form, True)
-        away_strength = self._calculate_team_strength(away_stats.iloc[0], away_form, False)
-        
-        # Probabilidades de resultado
-        strength_diff = home_strength - away_strength
-        
-        # Ajuste baseado em vantagem de casa (+10 pontos)
-        strength_diff += 10
-        
-        # Conversão para probabilidades
-        if strength_diff > 20:
-            home_win_prob = 0.65
-            draw_prob = 0.20
-            away_win_prob = 0.15
-        elif strength_diff > 10:
-            home_win_prob = 0.50
-            draw_prob = 0.30
-            away_win_prob = 0.20
-        elif strength_diff > -10:
-            home_win_prob = 0.35
-            draw_prob = 0.30
-            away_win_prob = 0.35
-        elif strength_diff > -20:
-            home_win_prob = 0.20
-            draw_prob = 0.30
-            away_win_prob = 0.50
-        else:
-            home_win_prob = 0.15
-            draw_prob = 0.20
-            away_win_prob = 0.65
-        
-        # Probabilidade de gols
-        expected_goals = (home_form['avg_goals_for'] + away_form['avg_goals_against'] + 
-                         away_form['avg_goals_for'] + home_form['avg_goals_against']) / 2
-        
-        # Ajuste com histórico H2H
-        if h2h.get('games_played', 0) > 0:
-            expected_goals = (expected_goals + h2h['avg_goals']) / 2
-        
-        over_2_5_prob = min(0.9, max(0.1, (expected_goals - 2.5) / 2 + 0.5))
-        
-        return {
-            'home_win_prob': round(home_win_prob, 3),
-            'draw_prob': round(draw_prob, 3),
-            'away_win_prob': round(away_win_prob, 3),
-            'over_2_5_prob': round(over_2_5_prob, 3),
-            'expected_goals': round(expected_goals, 2),
-            'home_strength': round(home_strength, 1),
-            'away_strength': round(away_strength, 1),
-            'confidence': self._calculate_confidence(h2h.get('games_played', 0), home_form['points'], away_form['points'])
-        }
+        home_strength = self._team_strength_array(home_stats, home_points, True)
+        away_strength = self._team_strength_array(away_stats, away_points, False)
+        
+        # Gols esperados de cada lado: ataque de um contra a defesa do outro, com vantagem de casa
+        home_xg = (home_attack + away_defence) / 2 * HOME_ADVANTAGE
+        away_xg = (away_attack + home_defence) / 2 / HOME_ADVANTAGE
+        
+        # Total ajustado pelo histórico H2H, mantendo a proporção entre os lados
+        expected_goals = home_xg + away_xg
+        h2h_games = np.array([len(h2h.get(i, [])) for i in valid], dtype=float)
+        h2h_goals = np.array([sum(a + b for a, b in h2h.get(i, [])) for i in valid], dtype=float)
+        adjusted = np.where(
+            h2h_games > 0,
+            (expected_goals + h2h_goals / np.maximum(h2h_games, 1)) / 2,
+            expected_goals
+        )
+        scale = adjusted / np.maximum(expected_goals, 1e-9)
+        home_xg = np.clip(home_xg * scale, 0.1, 6.0)
+        away_xg = np.clip(away_xg * scale, 0.1, 6.0)
+        
+        # 1X2, over/under, BTTS, placar exato e handicap asiático da mesma matriz de placares
+        markets = match_markets(home_xg, away_xg, rho=self.dixon_coles_rho)
+        
+        for k, i in enumerate(valid):
+            home, away = pairs[i]
+            results[i] = dict(
+                markets[k],
+                over_2_5_prob=markets[k]['over_under']['2.5']['over'],
+                expected_goals=round(float(home_xg[k] + away_xg[k]), 2),
+                home_strength=round(float(home_strength[k]), 1),
+                away_strength=round(float(away_strength[k]), 1),
+                home_elo=round(ratings[home], 1),
+                away_elo=round(ratings[away], 1),
+                elo_home_expectation=round(expected_home(ratings[home], ratings[away]), 3),
+                confidence=self._calculate_confidence(int(h2h_games[k]), home_points[k], away_points[k])
+            )
+        
+        return results
     
-    def _calculate_team_strength(self, stats, form, is_home):
-        """Calcula força do time (0-100)"""
-        # Estatísticas gerais (40%)
-        win_rate = stats['wins'] / max(1, stats['wins'] + stats['draws'] + stats['losses'])
-        goal_diff = stats['goals_scored'] - stats['goals_conceded']
-        
-        general_strength = (win_rate * 50) + (min(20, max(-20, goal_diff)) + 20)
-        
-        # Forma recente (40%)
-        form_strength = (form['points'] / 15) * 40  # Máximo 15 pontos em 5 jogos
-        
-        # Vantagem casa/fora (20%)
+    def _team_strength_array(self, stats, form_points, is_home):
+        """Força de cada time (0-100): 40% campanha, 40% forma recente, 20% mando
+
+        stats: linhas (gols marcados, gols sofridos, vitórias, empates, derrotas).
+        """
+        goals_scored, goals_conceded, wins, draws, losses = stats.T
+        win_rate = wins / np.maximum(1, wins + draws + losses)
+        goal_diff = goals_scored - goals_conceded
+        
+        general_strength = (win_rate * 50) + (np.clip(goal_diff, -20, 20) + 20)
+        form_strength = (form_points / 15) * 40  # Máximo 15 pontos em 5 jogos
         venue_bonus = 20 if is_home else 10
         
-        return min(100, general_strength * 0.4 + form_strength * 0.4 + venue_bonus * 0.2)
+        return np.minimum(100, general_strength * 0.4 + form_strength * 0.4 + venue_bonus * 0.2)
     
     def _calculate_confidence(self, h2h_games, home_form_points, away_form_points):
         """Calcula nível de confiança da previsão"""
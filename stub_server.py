@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a football-data.org para testes de carga e latência
+
+Serve /v4/competitions/{code}/matches a partir do archive/ gravado pelo
+coletor ou de partidas geradas, com latência, erros e 429 configuráveis.
+
+Uso: python stub_server.py --port 8080 --latency 0.1 --error-rate 0.05 --quota 10
+Depois: FOOTBALL_API_URL=http://127.0.0.1:8080/v4 python data_collector.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from response_archive import ResponseArchive
+from sample_data import generate_api_matches
+
+class RecordedFixtures:
+    """Partidas gravadas no archive, indexadas por liga (última versão de cada partida)"""
+
+    def __init__(self, archive_dir):
+        archive = ResponseArchive(archive_dir)
+        self.matches = {}
+        for league_code in archive.leagues():
+            by_id = {}
+            for record in archive.records(league_code):
+                for match in record['payload'].get('matches', []):
+                    by_id[match['id']] = match
+            self.matches[league_code] = sorted(by_id.values(), key=lambda m: m['utcDate'])
+
+    def __call__(self, league_code, date_from, date_to):
+        matches = [m for m in self.matches.get(league_code, [])
+                   if date_from <= m['utcDate'][:10] <= date_to]
+        return {'matches': matches, 'resultSet': {'count': len(matches)}}
+
+class StubServer:
+    """Servidor HTTP em thread própria; use start()/stop() ou como context manager"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, quota=None, archive_dir=None, seed=None):
+        self.latency = latency              # Latência base por requisição (s)
+        self.jitter = jitter                # Variação aleatória somada à latência (s)
+        self.error_rate = error_rate        # Fração de respostas 500/503
+        self.throttle_rate = throttle_rate  # Fração de respostas 429 aleatórias
+        self.quota = quota                  # Requisições por minuto antes de 429 (None = sem limite)
+
+        self.fixtures = RecordedFixtures(archive_dir) if archive_dir else generate_api_matches
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'not_found': 0}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/v4'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _quota_state(self):
+        """Consome uma requisição da cota do minuto; retorna (disponíveis, segundos até zerar)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            reset = max(1, int(60 - (now - self._window_start)))
+            if self.quota is None:
+                return None, reset
+            return self.quota - self._window_count, reset
+
+    def _decide(self):
+        """Sorteia o desfecho da requisição: 'ok', 'error' ou 'throttle'"""
+        with self._lock:
+            roll = self._rng.random()
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        if roll < self.throttle_rate:
+            return 'throttle', delay
+        if roll < self.throttle_rate + self.error_rate:
+            return 'error', delay
+        return 'ok', delay
+
+    def _count(self, key):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[key] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _reply(self, status, payload=None, headers=None):
+                body = json.dumps(payload).encode() if payload is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                if len(parts) != 4 or parts[:2] != ['v4', 'competitions'] or parts[3] != 'matches':
+                    server._count('not_found')
+                    self._reply(404, {'message': 'Resource not found'})
+                    return
+
+                league_code = parts[2]
+                query = parse_qs(url.query)
+                today = time.strftime('%Y-%m-%d')
+                date_from = query.get('dateFrom', [today])[0]
+                date_to = query.get('dateTo', [date_from])[0]
+
+                outcome, delay = server._decide()
+                available, reset = server._quota_state()
+                time.sleep(delay)
+
+                headers = {'X-RequestCounter-Reset': reset}
+                if available is not None:
+                    headers['X-Requests-Available-Minute'] = max(0, available)
+
+                if outcome == 'throttle' or (available is not None and available < 0):
+                    server._count('throttled')
+                    self._reply(429, {'message': 'You reached your request limit.'}, headers)
+                elif outcome == 'error':
+                    server._count('errors')
+                    self._reply(server._rng.choice([500, 503]), {'message': 'Internal error'}, headers)
+                else:
+                    server._count('ok')
+                    self._reply(200, server.fixtures(league_code, date_from, date_to), headers)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local simulando a football-data.org')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.1, help='latência base (s)')
+    parser.add_argument('--jitter', type=float, default=0.05, help='variação aleatória da latência (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 5xx')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fração de respostas 429 aleatórias')
+    parser.add_argument('--quota', type=int, default=None, help='requisições por minuto antes de 429')
+    parser.add_argument('--archive', default=None, help='serve partidas gravadas neste archive/')
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                        args.throttle_rate, args.quota, args.archive)
+    print(f"Servidor simulado em {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nEstatísticas: {server.stats}")
+
+if __name__ == "__main__":
+    main()
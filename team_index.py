@@ -0,0 +1,161 @@
+import threading
+
+import numpy as np
+
+from db_pool import get_pool
+from migrations import DB_PATH
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_team_index(db_path=None):
+    """Retorna o índice compartilhado pelo processo para o banco informado"""
+    db_path = db_path or DB_PATH
+    with _indexes_lock:
+        if db_path not in _indexes:
+            _indexes[db_path] = TeamHistoryIndex(db_path)
+        return _indexes[db_path]
+
+class TeamHistoryIndex:
+    """Histórico de partidas encerradas em memória, por time
+
+    Para cada time guarda arrays ordenados por data: adversário, data, gols
+    pró/contra e mando. A carga inicial lê games inteira uma vez; depois só
+    as linhas com change_seq novo.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DB_PATH
+        self._conn = None  # Conexão somente leitura própria (data_version é por conexão)
+        self._lock = threading.Lock()
+
+        self.team_ids = {}       # nome -> id numérico
+        self.team_names = []     # id -> nome
+        self._matches = {}       # id da partida -> (mandante, visitante, data, gols casa, gols fora)
+        self._team_matches = {}  # id do time -> ids das partidas
+        self._teams = {}         # id do time -> arrays do histórico
+
+        self._last_seq = -1
+        self._data_version = None
+
+    def _team_id(self, name):
+        if name not in self.team_ids:
+            self.team_ids[name] = len(self.team_names)
+            self.team_names.append(name)
+        return self.team_ids[name]
+
+    def refresh(self):
+        """Aplica as alterações de games desde a última leitura; retorna quantas linhas leu"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = get_pool(self.db_path).open_reader()
+
+            # data_version só muda quando outra conexão grava no banco
+            version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version == self._data_version:
+                return 0
+
+            rows = self._conn.execute('''
+                SELECT id, home_team, away_team, date, home_goals, away_goals, IFNULL(change_seq, 0)
+                FROM games WHERE IFNULL(change_seq, 0) > ?
+                ORDER BY change_seq
+            ''', (self._last_seq,)).fetchall()
+            self._data_version = version
+            if not rows:
+                return 0
+
+            touched_teams = set()
+            for match_id, home, away, date, home_goals, away_goals, seq in rows:
+                self._last_seq = max(self._last_seq, seq)
+
+                # Versão anterior da partida sai do índice (placar corrigido, times trocados...)
+                old = self._matches.pop(match_id, None)
+                if old:
+                    touched_teams.update(old[:2])
+                    for team_id in old[:2]:
+                        self._team_matches[team_id].discard(match_id)
+
+                if home_goals is None or away_goals is None:
+                    continue
+
+                home_id, away_id = self._team_id(home), self._team_id(away)
+                self._matches[match_id] = (home_id, away_id, date, home_goals, away_goals)
+                for team_id in (home_id, away_id):
+                    self._team_matches.setdefault(team_id, set()).add(match_id)
+                touched_teams.update((home_id, away_id))
+
+            self._rebuild(touched_teams)
+            return len(rows)
+
+    def close(self):
+        """Fecha a conexão própria, mantendo o índice (ex.: antes do fork dos workers)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            # data_version é por conexão; a próxima leitura confere change_seq de novo
+            self._data_version = None
+
+    def _rebuild(self, team_ids):
+        """Recria os arrays dos times afetados"""
+        for team_id in team_ids:
+            ids = sorted(self._team_matches.get(team_id, ()),
+                         key=lambda match_id: (self._matches[match_id][2], match_id))
+            matches = [self._matches[match_id] for match_id in ids]
+
+            is_home = np.array([m[0] == team_id for m in matches], dtype=bool)
+            home_goals = np.array([m[3] for m in matches], dtype=np.int16)
+            away_goals = np.array([m[4] for m in matches], dtype=np.int16)
+
+            self._teams[team_id] = {
+                'match_id': np.array(ids, dtype=np.int64),
+                'opponent': np.array([m[1] if m[0] == team_id else m[0] for m in matches], dtype=np.int32),
+                'date': np.array([m[2] for m in matches], dtype=str),
+                'goals_for': np.where(is_home, home_goals, away_goals),
+                'goals_against': np.where(is_home, away_goals, home_goals),
+                'is_home': is_home
+            }
+
+    def team_history(self, team_name):
+        """Arrays do histórico do time (ordenados por data) ou None"""
+        self.refresh()
+        team_id = self.team_ids.get(team_name)
+        return self._teams.get(team_id) if team_id is not None else None
+
+    def get_team_form(self, team_name, last_n_games=5, before=None):
+        """Forma nas últimas partidas (opcionalmente antes de uma data)"""
+        history = self.team_history(team_name)
+        end = 0 if history is None else len(history['date'])
+        if history is not None and before is not None:
+            end = int(np.searchsorted(history['date'], before, side='left'))
+
+        if end == 0:
+            return {'points': 0, 'goals_for': 0, 'goals_against': 0}
+
+        start = max(0, end - last_n_games)
+        gf = history['goals_for'][start:end]
+        ga = history['goals_against'][start:end]
+        points = int(3 * np.count_nonzero(gf > ga) + np.count_nonzero(gf == ga))
+        goals_for, goals_against = int(gf.sum()), int(ga.sum())
+
+        return {
+            'points': points,
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'avg_goals_for': goals_for / len(gf),
+            'avg_goals_against': goals_against / len(gf)
+        }
+
+    def h2h_results(self, team1, team2, last_n=5):
+        """Lista (gols team1, gols team2) dos confrontos mais recentes, do mais novo ao mais antigo
+
+        Para além dos H2H_LAST_N guardados na tabela h2h; filtra o histórico de team1.
+        """
+        history = self.team_history(team1)
+        team2_id = self.team_ids.get(team2)
+        if history is None or team2_id is None:
+            return []
+        mask = history['opponent'] == team2_id
+        gf = history['goals_for'][mask][-last_n:][::-1]
+        ga = history['goals_against'][mask][-last_n:][::-1]
+        return list(zip(gf.tolist(), ga.tolist()))
@@ -0,0 +1,97 @@
+"""
+Testes do backfill: marca d'água com janelas concluídas fora de ordem
+
+Uso: python -m pytest test_backfill.py
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('FOOTBALL_ARCHIVE', '0')
+
+import pytest
+
+from backfill import Backfill, date_chunks
+from data_collector import DataCollector
+
+def _matches(league_code, date_from, date_to, pending_from=None):
+    """Uma partida por dia; a partir de pending_from ainda agendadas"""
+    day = datetime.strptime(date_from, '%Y-%m-%d')
+    end = datetime.strptime(date_to, '%Y-%m-%d')
+    matches = []
+    while day <= end:
+        date = day.strftime('%Y-%m-%d')
+        finished = pending_from is None or date < pending_from
+        matches.append({
+            'id': int(day.strftime('%Y%m%d')),
+            'homeTeam': {'name': f'{league_code} Casa'},
+            'awayTeam': {'name': f'{league_code} Fora'},
+            'utcDate': f'{date}T15:00:00Z',
+            'status': 'FINISHED' if finished else 'SCHEDULED',
+            'score': {'fullTime': {'home': 1 if finished else None, 'away': 0 if finished else None}},
+        })
+        day += timedelta(days=1)
+    return matches
+
+@pytest.fixture
+def backfill(tmp_path, monkeypatch):
+    collector = DataCollector()
+    collector.db_path = str(tmp_path / 'football.db')
+    monkeypatch.setattr(collector, 'refresh_features', lambda: None)
+    return Backfill(collector=collector, chunk_days=10, workers=4)
+
+def _mark(backfill, league_code='PL'):
+    return backfill.collector.get_sync_state(league_code)[0]
+
+def test_out_of_order_chunks_advance_to_the_end(backfill, monkeypatch):
+    date_from, date_to = '2025-10-01', '2025-12-31'
+    last_chunk = date_chunks(date_from, date_to, 10)[-1]
+
+    def fetch(league_code, chunk_from, chunk_to, **kwargs):
+        # Janelas mais recentes terminam primeiro
+        time.sleep(0.02 if (chunk_from, chunk_to) == last_chunk else 0.1)
+        return _matches(league_code, chunk_from, chunk_to)
+
+    monkeypatch.setattr(backfill.collector, '_fetch_matches', fetch)
+    done, failed = backfill.run(date_from, date_to, ['PL'])
+
+    assert (done, failed) == (len(date_chunks(date_from, date_to, 10)), 0)
+    assert _mark(backfill) == date_to
+
+def test_failed_chunk_stops_the_mark(backfill, monkeypatch):
+    date_from, date_to = '2025-10-01', '2025-12-31'
+
+    def fetch(league_code, chunk_from, chunk_to, **kwargs):
+        if chunk_from == '2025-11-10':
+            raise RuntimeError('falha simulada')
+        return _matches(league_code, chunk_from, chunk_to)
+
+    monkeypatch.setattr(backfill.collector, '_fetch_matches', fetch)
+    backfill.run(date_from, date_to, ['PL'])
+    assert _mark(backfill) == '2025-11-09'
+
+    # Retomada: só a janela com erro é refeita e a marca vai até o fim
+    monkeypatch.setattr(backfill.collector, '_fetch_matches',
+                        lambda league_code, chunk_from, chunk_to, **kwargs: _matches(league_code, chunk_from, chunk_to))
+    assert backfill.run(date_from, date_to, ['PL']) == (1, 0)
+    assert _mark(backfill) == date_to
+
+def test_pending_match_holds_the_mark(backfill, monkeypatch):
+    today = datetime.now()
+    day = lambda offset: (today + timedelta(days=offset)).strftime('%Y-%m-%d')
+    monkeypatch.setattr(backfill.collector, '_fetch_matches',
+                        lambda league_code, chunk_from, chunk_to, **kwargs:
+                            _matches(league_code, chunk_from, chunk_to, pending_from=day(0)))
+    backfill.run(day(-20), day(9), ['PL'])
+    assert _mark(backfill) == day(-1)
+
+def test_mark_never_moves_backwards(backfill, monkeypatch):
+    with backfill.pool.writer() as conn:
+        with conn:
+            backfill.collector._update_sync_state(conn, 'PL', '2025-09-01', '2026-01-31', '2026-01-31', None)
+
+    monkeypatch.setattr(backfill.collector, '_fetch_matches',
+                        lambda league_code, chunk_from, chunk_to, **kwargs: _matches(league_code, chunk_from, chunk_to))
+    backfill.run('2025-10-01', '2025-10-30', ['PL'])
+    assert _mark(backfill) == '2026-01-31'
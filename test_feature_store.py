@@ -0,0 +1,89 @@
+"""
+Testes do feature store: geração em banco novo, um store por banco e forma de team_form
+
+Uso: python -m pytest test_feature_store.py
+"""
+
+import os
+
+os.environ.setdefault('FOOTBALL_ARCHIVE', '0')
+
+import numpy as np
+import pytest
+
+import feature_store
+from data_collector import DataCollector
+from db_pool import get_pool
+from feature_store import FORM_WINDOW, TEAM_FEATURES, get_feature_store
+from form_table import FORM_VERSION, form_as_of
+from migrations import migrate
+from sample_data import generate_api_matches
+from warmup import warm_up
+
+def _fresh_db(path, date_from='2025-08-01', date_to='2025-12-31', seed=1):
+    """Banco novo, migrado, com partidas encerradas de uma liga"""
+    db_path = str(path / 'football.db')
+    collector = DataCollector()
+    collector.db_path = db_path
+    matches = generate_api_matches('PL', date_from, date_to, seed=seed)['matches']
+    with get_pool(db_path).writer() as conn:
+        migrate(conn)
+        collector._ingest_matches(conn, 'Premier League', 'PL', date_from, date_to, matches)
+    return db_path, collector
+
+@pytest.fixture(autouse=True)
+def no_store_override(monkeypatch):
+    monkeypatch.setattr(feature_store, 'FEATURE_STORE', None)
+
+def test_warm_up_builds_store_on_fresh_db(tmp_path):
+    db_path, _ = _fresh_db(tmp_path)
+    store = get_feature_store(db_path)
+    assert store.path == str(tmp_path / 'feature_store')
+    assert not store.available()
+
+    report = warm_up(db_path, before_fork=False)
+
+    assert report['steps']['feature_store']['result'] > 0
+    manifest = store.manifest
+    assert manifest['rows'] > 0
+    assert manifest['source_db'] == os.path.abspath(db_path)
+    assert manifest['form_version'] == FORM_VERSION
+
+def test_one_store_per_database(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    db_a, _ = _fresh_db(tmp_path / 'a', seed=1)
+    db_b, _ = _fresh_db(tmp_path / 'b', date_to='2025-09-30', seed=2)
+    store_a, store_b = get_feature_store(db_a), get_feature_store(db_b)
+    assert store_a is get_feature_store(db_a)
+    assert store_a.path != store_b.path
+
+    rows_a = store_a.refresh()['rows']
+    rows_b = store_b.refresh()['rows']
+    assert rows_a > rows_b > 0
+
+def test_refresh_follows_new_matches(tmp_path):
+    db_path, collector = _fresh_db(tmp_path, date_to='2025-09-30')
+    store = get_feature_store(db_path)
+    first = store.refresh()
+    assert store.refresh()['version'] == first['version']
+
+    matches = generate_api_matches('PL', '2025-10-01', '2025-10-31', seed=3)['matches']
+    with get_pool(db_path).writer() as conn:
+        collector._ingest_matches(conn, 'Premier League', 'PL', '2025-10-01', '2025-10-31', matches)
+
+    second = store.refresh()
+    assert second['version'] != first['version']
+    assert second['rows'] > first['rows']
+
+def test_form_comes_from_team_form(tmp_path):
+    db_path, _ = _fresh_db(tmp_path)
+    store = get_feature_store(db_path)
+    manifest = store.refresh()
+    state = store.column('team_state')
+    columns = [TEAM_FEATURES.index(name) for name in ('form_points', 'form_goals_for', 'form_goals_against')]
+
+    with get_pool(db_path).reader() as conn:
+        for team, i in manifest['team_index'].items():
+            points, goals_for, goals_against, _ = form_as_of(conn, team, FORM_WINDOW)
+            assert np.array_equal(state[i, columns], [points, goals_for, goals_against])
@@ -0,0 +1,77 @@
+"""
+Testes do calendário da temporada e da simulação
+
+Uso: python -m pytest test_season_simulator.py
+"""
+
+import os
+from datetime import date
+
+os.environ.setdefault('FOOTBALL_ARCHIVE', '0')
+
+import pytest
+
+from data_collector import DataCollector
+from db_pool import get_pool
+from migrations import migrate
+from season_calendar import season_end, season_start
+from season_simulator import load_season, simulate_league
+
+TODAY = date(2026, 10, 18)
+
+def _match(match_id, home, away, day, status, score=(None, None)):
+    return {
+        'id': match_id,
+        'homeTeam': {'name': home},
+        'awayTeam': {'name': away},
+        'utcDate': f'{day}T15:00:00Z',
+        'status': status,
+        'score': {'fullTime': {'home': score[0], 'away': score[1]}},
+    }
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    collector = DataCollector()
+    collector.db_path = str(tmp_path / 'football.db')
+    collector.leagues = {'Premier League': 'PL'}
+    monkeypatch.setattr(collector, 'refresh_features', lambda: None)
+    with get_pool(collector.db_path).writer() as conn:
+        migrate(conn)
+    return collector
+
+def test_season_bounds_per_league():
+    assert (season_start('PL', TODAY), season_end('PL', TODAY)) == ('2026-07-01', '2027-06-30')
+    assert season_start('PL', date(2027, 3, 1)) == '2026-07-01'
+    # Brasileirão: ano civil
+    assert (season_start('BSA', TODAY), season_end('BSA', TODAY)) == ('2026-01-01', '2026-12-31')
+
+def test_sync_fixtures_fills_remaining_matches(collector, monkeypatch):
+    requested = []
+
+    def fetch(league_code, date_from, date_to, **kwargs):
+        requested.append((league_code, date_from, date_to))
+        return [_match(2, 'B', 'A', '2026-12-01', 'TIMED'), _match(3, 'A', 'C', '2027-05-20', 'SCHEDULED')]
+
+    monkeypatch.setattr(collector, '_fetch_matches', fetch)
+    with get_pool(collector.db_path).writer() as conn:
+        collector._ingest_matches(conn, 'Premier League', 'PL', '2026-08-01', '2026-08-31',
+                                  [_match(1, 'A', 'B', '2026-08-20', 'FINISHED', (2, 1))])
+
+    collector.sync_fixtures(TODAY)
+
+    assert requested == [('PL', '2026-10-18', '2027-06-30')]
+    teams, table, remaining = load_season('PL', db_path=collector.db_path, today=TODAY)
+    assert teams == ['A', 'B', 'C']
+    assert table['A'] == (3, 1)
+    assert remaining == [('B', 'A'), ('A', 'C')]
+    # Calendário não mexe na marca d'água dos resultados
+    assert collector.get_sync_state('PL')[0] == '2026-08-31'
+
+def test_simulation_without_remaining_fixtures_fails(collector):
+    with get_pool(collector.db_path).writer() as conn:
+        collector._ingest_matches(conn, 'Premier League', 'PL', '2026-08-01', '2026-08-31',
+                                  [_match(1, 'A', 'B', '2026-08-20', 'FINISHED', (2, 1))])
+
+    with pytest.raises(ValueError):
+        simulate_league('PL', 10, since='2026-07-01', db_path=collector.db_path, workers=1)
+    assert simulate_league('SA', 10, since='2026-07-01', db_path=collector.db_path, workers=1) == {}
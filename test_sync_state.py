@@ -0,0 +1,68 @@
+"""
+Testes da marca d'água de sincronização (sync_state)
+
+Uso: python -m pytest test_sync_state.py
+"""
+
+import os
+import sqlite3
+from datetime import date
+
+os.environ.setdefault('FOOTBALL_ARCHIVE', '0')
+
+import pytest
+
+from data_collector import DataCollector
+from migrations import migrate
+
+TODAY = date(2026, 10, 18)
+
+def _match(day, status):
+    return {'utcDate': f'{day}T15:00:00Z', 'status': status}
+
+@pytest.fixture
+def collector():
+    return DataCollector()
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    migrate(conn)
+    yield conn
+    conn.close()
+
+def _mark(conn, league_code='PL'):
+    row = conn.execute('SELECT last_synced_date FROM sync_state WHERE league_code = ?', (league_code,)).fetchone()
+    return row[0] if row else None
+
+def test_suspended_is_final(collector):
+    matches = [_match('2026-10-10', 'FINISHED'), _match('2026-10-12', 'SUSPENDED')]
+    assert collector._synced_through(matches, '2026-10-17', TODAY) == '2026-10-17'
+
+def test_pending_holds_mark(collector):
+    matches = [_match('2026-10-10', 'FINISHED'), _match('2026-10-15', 'SCHEDULED')]
+    assert collector._synced_through(matches, '2026-10-17', TODAY) == '2026-10-14'
+
+def test_future_fixtures_hold_mark(collector):
+    # Intervalo até o fim da temporada: as agendadas seguram a marca em ontem
+    matches = [_match('2026-10-18', 'TIMED'), _match('2027-05-20', 'SCHEDULED')]
+    assert collector._synced_through(matches, '2027-06-30', TODAY) == '2026-10-17'
+
+def test_old_pending_is_ignored(collector):
+    # Jogo pendente há meses (adiado sem status final) não prende a marca
+    matches = [_match('2026-06-01', 'SCHEDULED'), _match('2026-10-10', 'FINISHED')]
+    assert collector._synced_through(matches, '2026-10-17', TODAY) == '2026-10-17'
+
+def test_mark_never_moves_backwards(collector, conn):
+    collector._update_sync_state(conn, 'PL', '2026-09-01', '2026-10-10', '2026-10-10', None)
+    # Sobreposição com partida pendente antes da marca atual
+    collector._update_sync_state(conn, 'PL', '2026-10-07', '2026-10-17', '2026-10-08', None)
+    assert _mark(conn) == '2026-10-10'
+
+    collector._update_sync_state(conn, 'PL', '2026-10-07', '2026-10-20', '2026-10-15', None)
+    assert _mark(conn) == '2026-10-15'
+
+def test_gap_keeps_mark(collector, conn):
+    collector._update_sync_state(conn, 'PL', '2026-09-01', '2026-09-30', '2026-09-30', None)
+    collector._update_sync_state(conn, 'PL', '2026-10-05', '2026-10-17', '2026-10-17', None)
+    assert _mark(conn) == '2026-09-30'
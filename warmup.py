@@ -0,0 +1,129 @@
+import gc
+import os
+import threading
+import time
+
+import numpy as np
+
+from db_pool import get_pool
+from feature_store import get_feature_store
+from model_registry import get_registry
+from team_index import get_team_index
+
+_ready = threading.Event()
+_report = {}
+
+def memory_usage(pid='self'):
+    """RSS, PSS e USS (memória só deste processo) em MB, de /proc/<pid>/smaps_rollup (Linux)"""
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        return None
+    return {
+        'rss_mb': round(fields.get('Rss', 0), 1),
+        'pss_mb': round(fields.get('Pss', 0), 1),
+        'uss_mb': round(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), 1),
+        'shared_mb': round(fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0), 1),
+    }
+
+def _warm_models():
+    """Modelos no registro do processo; os ainda não treinados ficam de fora"""
+    from ml_predictor import MODEL_PATHS
+    from neural_predictor import NeuralPredictor
+    loaded = []
+    try:
+        get_registry().load('random_forest', MODEL_PATHS)
+        loaded.append('random_forest')
+    except FileNotFoundError:
+        pass
+    if NeuralPredictor().load_models():
+        loaded.append('neural')
+    return loaded
+
+def _warm_feature_store(db_path):
+    """Gera a versão se faltar ou estiver defasada, mapeia e lê cada página uma vez (cache do sistema)"""
+    store = get_feature_store(db_path)
+    try:
+        store.refresh()  # Instalação nova ou dados de exemplo: o store ainda não existe
+    except Exception as e:
+        print(f"Erro ao atualizar o feature store: {e}")
+    if not store.available():
+        return 0
+    total = 0
+    for array in store.arrays().values():
+        if array.size:
+            array.view(np.uint8).max()
+        total += array.nbytes
+    return total
+
+def _warm_analyzer(db_path):
+    """Primeira previsão: importa o caminho estatístico e preenche caches"""
+    from stats_analyzer import StatsAnalyzer
+    teams = get_team_index(db_path).team_names[:2]
+    if len(teams) == 2:
+        StatsAnalyzer(db_path).calculate_match_probabilities_batch([tuple(teams)])
+
+def warm_up(db_path=None, before_fork=True):
+    """Carrega índice, feature store, modelos e o analisador antes de atender requisições
+
+    No modo preload do gunicorn roda no processo mestre antes do fork (e antes
+    de o socket abrir): os workers herdam tudo pronto e compartilham as
+    páginas por copy-on-write. Com before_fork as conexões SQLite são fechadas
+    no fim, pois não podem atravessar o fork, e o GC congela o que foi carregado.
+    """
+    start = time.perf_counter()
+    steps = {}
+    for name, step in (
+        ('team_index', lambda: get_team_index(db_path).refresh()),
+        ('feature_store', lambda: _warm_feature_store(db_path)),
+        ('models', _warm_models),
+        ('stats_analyzer', lambda: _warm_analyzer(db_path)),
+    ):
+        step_start = time.perf_counter()
+        try:
+            result = step()
+            steps[name] = {'ms': round((time.perf_counter() - step_start) * 1000, 1), 'result': result}
+        except Exception as e:
+            steps[name] = {'error': str(e)}
+
+    if before_fork:
+        get_team_index(db_path).close()
+        get_pool(db_path).close()
+
+        # Objetos do aquecimento saem das varreduras do GC, que sujariam as páginas compartilhadas
+        gc.collect()
+        gc.freeze()
+
+    _report.update(
+        pid=os.getpid(),
+        warmup_ms=round((time.perf_counter() - start) * 1000, 1),
+        steps=steps,
+        memory=memory_usage(),
+    )
+    _ready.set()
+    print(f"Aquecimento concluído em {_report['warmup_ms']:.0f} ms")
+    return _report
+
+def warm_up_in_background(db_path=None):
+    """Aquece em outra thread enquanto o servidor já aceita conexões; /ready responde 503 até o fim"""
+    thread = threading.Thread(target=warm_up, args=(db_path, False), name='warmup', daemon=True)
+    thread.start()
+    return thread
+
+def start_warm_up(db_path=None):
+    """Aquecimento conforme WARMUP_MODE: 'preload' (síncrono, antes do fork) ou 'background'"""
+    if os.environ.get('WARMUP_MODE', 'background') == 'preload':
+        return warm_up(db_path)
+    return warm_up_in_background(db_path)
+
+def is_ready():
+    return _ready.is_set()
+
+def readiness():
+    """Estado do aquecimento para a rota /ready"""
+    return dict(_report, ready=is_ready())
@@ -5,17 +5,19 @@ import os
 init_db()
 
 # Cria dados se não existirem
-import sqlite3
-conn = sqlite3.connect('football.db')
-cursor = conn.cursor()
-cursor.execute('SELECT COUNT(*) FROM games')
-game_count = cursor.fetchone()[0]
-conn.close()
+from db_pool import get_pool
+with get_pool().reader() as conn:
+    game_count = conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
 
 if game_count == 0:
     from sample_data import create_sample_data
     create_sample_data()
 
+# Com preload_app (gunicorn.conf.py) roda uma vez no mestre, antes do fork dos workers;
+# sem preload, em segundo plano em cada worker, com /ready em 503 até terminar
+from warmup import start_warm_up
+start_warm_up()
+
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
     print(f"Starting server on 0.0.0.0:{port}")